@@ -1,6 +1,6 @@
 import os
 import logging
-from sqlmodel import SQLModel, create_engine, Session
+from sqlmodel import SQLModel, create_engine, Session, select
 from typing import Generator
 
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./test.db")
@@ -24,12 +24,14 @@ def init_db():
 
     logger.info("Creating or ensuring database tables exist")
 
-    max_retries = 10
-    retry_interval = 3
+    max_retries = int(os.getenv("DB_INIT_RETRIES", "10"))
+    retry_interval = float(os.getenv("DB_INIT_RETRY_INTERVAL", "3"))
 
     for i in range(max_retries):
         try:
             SQLModel.metadata.create_all(engine)
+            _upgrade_schema()
+            _seed_catalog_version()
             logger.info("Database tables created successfully.")
             return
         except OperationalError as e:
@@ -47,6 +49,122 @@ def init_db():
                 raise e
 
 
+def _column_default_sql(column) -> str:
+    default = column.default
+    if default is None or not default.is_scalar or default.arg is None:
+        return ""
+    value = default.arg
+    if isinstance(value, bool):
+        value = int(value)
+    if isinstance(value, (int, float)):
+        return f" DEFAULT {value}"
+    return " DEFAULT '{}'".format(str(getattr(value, "value", value)).replace("'", "''"))
+
+
+def _upgrade_schema():
+    """Add columns and indexes introduced after a table was first created.
+
+    ``create_all`` only creates missing tables, so new fields on existing
+    models are added here with a plain ``ALTER TABLE ... ADD COLUMN``.
+    Integer columns that became floats are widened as well.
+    """
+    from sqlalchemy import Float, Integer, inspect, text
+    from sqlalchemy.exc import IntegrityError
+
+    inspector = inspect(engine)
+    quote = engine.dialect.identifier_preparer.quote
+    unique_indexes = []
+    with engine.begin() as conn:
+        for table in SQLModel.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = {c["name"]: c["type"] for c in inspector.get_columns(table.name)}
+            for column in table.columns:
+                column_type = column.type.compile(dialect=engine.dialect)
+                if column.name in existing:
+                    if isinstance(column.type, Float) and isinstance(
+                        existing[column.name], Integer
+                    ):
+                        _widen_column(conn, table.name, column, column_type)
+                    continue
+                logger.info("Adding column %s.%s", table.name, column.name)
+                conn.execute(
+                    text(
+                        f"ALTER TABLE {quote(table.name)} ADD COLUMN "
+                        f"{quote(column.name)} {column_type}"
+                        f"{_column_default_sql(column)}"
+                    )
+                )
+            for index in table.indexes:
+                if index.unique:
+                    unique_indexes.append(index)
+                else:
+                    index.create(conn, checkfirst=True)
+
+    # Each in its own transaction: existing duplicate rows make one fail, and
+    # that must not keep the app from starting
+    for index in unique_indexes:
+        try:
+            with engine.begin() as conn:
+                index.create(conn, checkfirst=True)
+        except IntegrityError as e:
+            logger.error(
+                "Could not create unique index %s on %s, the table has duplicate "
+                "rows; remove them and restart: %s",
+                index.name,
+                index.table.name,
+                e.orig,
+            )
+
+
+def _widen_column(conn, table_name: str, column, column_type: str):
+    from sqlalchemy import text
+
+    quote = engine.dialect.identifier_preparer.quote
+    dialect = engine.dialect.name
+    if dialect == "mysql":
+        statement = (
+            f"ALTER TABLE {quote(table_name)} MODIFY COLUMN {quote(column.name)} "
+            f"{column_type}{'' if column.nullable else ' NOT NULL'}"
+            f"{_column_default_sql(column)}"
+        )
+    elif dialect == "postgresql":
+        statement = (
+            f"ALTER TABLE {quote(table_name)} ALTER COLUMN {quote(column.name)} "
+            f"TYPE {column_type}"
+        )
+    else:
+        # SQLite stores floats in an INTEGER column as they are
+        return
+    logger.info("Widening column %s.%s to %s", table_name, column.name, column_type)
+    conn.execute(text(statement))
+
+
+def _seed_catalog_version():
+    """Create the single catalog version row so writers only ever UPDATE it."""
+    from sqlalchemy.exc import IntegrityError
+    from app.models import CatalogVersion
+
+    with Session(engine) as session:
+        if session.get(CatalogVersion, 1) is None:
+            session.add(CatalogVersion(id=1, version=0))
+            try:
+                session.commit()
+            except IntegrityError:
+                # Another worker seeded it first
+                session.rollback()
+
+
+def warm_up():
+    """Configure ORM mappers and prime the connection pool."""
+    from app.models import CurrencyRate
+    from sqlalchemy.orm import configure_mappers
+
+    configure_mappers()
+    with Session(engine) as session:
+        session.exec(select(CurrencyRate)).all()
+
+
 def get_session() -> Generator[Session, None, None]:
     with Session(engine) as session:
         yield session
@@ -0,0 +1,126 @@
+"""Conditional GET and content negotiation for the public catalog endpoints.
+
+Responses are tagged with a weak ETag derived from the catalog data version
+(see ``app.services.catalog``; the popularity epoch too for listings that
+show or order by popularity) plus the request path, normalized query and
+negotiated media type (JSON or MessagePack, from ``Accept``), so a repeat
+request whose ``If-None-Match`` still matches is answered with 304 before
+any route handler runs or a DB session is opened. ``Cache-Control`` lets
+nginx and browsers keep the body and revalidate it cheaply; ``Vary: Accept``
+keeps the two encodings apart in shared caches. The ETag is weak because
+the same version may go out compressed or not (compression would weaken a
+strong one), so 200s and 304s always carry the same validator.
+"""
+
+import hashlib
+import os
+from typing import Optional
+from urllib.parse import parse_qsl, urlencode
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+from app import responses
+from app.services import catalog, popularity
+
+CACHE_MAX_AGE = int(os.getenv("CATALOG_CACHE_MAX_AGE", "30"))
+CACHE_CONTROL = (
+    f"public, max-age={CACHE_MAX_AGE}, stale-while-revalidate={CACHE_MAX_AGE * 2}"
+)
+
+CACHEABLE_PATHS = {
+    "/api/prices/highlights",
+    "/api/prices/compare",
+    "/api/prices/models",
+    "/api/models",
+    "/api/config/rates",
+    "/api/config/providers",
+    "/api/settings/currencies",
+    "/api/history/prices",
+}
+CACHEABLE_PREFIXES = ("/api/prices/compare/",)
+# Show or order by popularity scores, which move without a catalog version bump
+POPULARITY_PATHS = {"/api/prices/highlights", "/api/prices/models", "/api/models"}
+
+
+def is_cacheable(path: str) -> bool:
+    return path in CACHEABLE_PATHS or path.startswith(CACHEABLE_PREFIXES)
+
+
+def make_etag(
+    version: int,
+    path: str,
+    query_string: bytes,
+    media_type: str = responses.JSON_MEDIA_TYPE,
+    popularity_epoch: Optional[int] = None,
+) -> str:
+    query = urlencode(sorted(parse_qsl(query_string.decode("latin-1"), True)))
+    key = f"{version}|{path}?{query}|{media_type}"
+    if popularity_epoch is not None:
+        key += f"|{popularity_epoch}"
+    digest = hashlib.sha1(key.encode()).hexdigest()
+    return f'W/"{digest[:24]}"'
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    # Weak comparison is allowed for If-None-Match
+    opaque = etag.removeprefix("W/")
+    return "*" in candidates or any(
+        tag.removeprefix("W/") == opaque for tag in candidates
+    )
+
+
+class CatalogCacheMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or scope["method"] not in ("GET", "HEAD")
+            or not is_cacheable(scope["path"])
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        request_headers = Headers(scope=scope)
+        media_type = responses.negotiate(request_headers.get("accept"))
+        version = catalog.cached_version()
+        if version is None:
+            # Re-reading the version is a DB query; keep it off the event loop
+            version = await run_in_threadpool(catalog.current_version)
+        etag = make_etag(
+            version,
+            scope["path"],
+            scope.get("query_string", b""),
+            media_type,
+            popularity.epoch() if scope["path"] in POPULARITY_PATHS else None,
+        )
+        if_none_match = request_headers.get("if-none-match")
+        if if_none_match and etag_matches(if_none_match, etag):
+            await send(
+                {
+                    "type": "http.response.start",
+                    "status": 304,
+                    "headers": [
+                        (b"etag", etag.encode()),
+                        (b"cache-control", CACHE_CONTROL.encode()),
+                        (b"vary", b"Accept"),
+                    ],
+                }
+            )
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        async def send_with_etag(message):
+            if message["type"] == "http.response.start" and message["status"] == 200:
+                headers = MutableHeaders(scope=message)
+                headers["ETag"] = etag
+                headers["Cache-Control"] = CACHE_CONTROL
+                headers.add_vary_header("Accept")
+            await send(message)
+
+        token = responses.use_media_type(media_type)
+        try:
+            await self.app(scope, receive, send_with_etag)
+        finally:
+            responses.reset_media_type(token)
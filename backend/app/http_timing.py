@@ -0,0 +1,96 @@
+"""Per-route request timing, with body serialization measured separately.
+
+Every API request is timed up to the start of its response and answered
+with a ``Server-Timing`` header: ``app`` for the whole handler, ``serialize``
+for rendering the body (reported by ``app.responses``). Totals per route
+are kept in memory and served by ``/metrics``.
+"""
+
+import threading
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Optional
+from starlette.datastructures import MutableHeaders
+
+# Seconds spent serializing in the current request, as a one-item list
+_serialization: ContextVar[Optional[list]] = ContextVar("serialization", default=None)
+
+
+def record_serialization(seconds: float):
+    holder = _serialization.get()
+    if holder is not None:
+        holder[0] += seconds
+
+
+@dataclass
+class RouteTimings:
+    requests: int = 0
+    total_seconds: float = 0.0
+    serialize_seconds: float = 0.0
+    max_seconds: float = 0.0
+
+
+_lock = threading.Lock()
+_routes: dict[str, RouteTimings] = {}
+
+
+def _record(route: str, seconds: float, serialize_seconds: float):
+    with _lock:
+        timings = _routes.get(route)
+        if timings is None:
+            timings = _routes[route] = RouteTimings()
+        timings.requests += 1
+        timings.total_seconds += seconds
+        timings.serialize_seconds += serialize_seconds
+        timings.max_seconds = max(timings.max_seconds, seconds)
+
+
+def snapshot() -> dict:
+    """Timings per route (``METHOD /path/{param}``), in milliseconds."""
+    with _lock:
+        items = sorted(_routes.items())
+    return {
+        route: {
+            "requests": t.requests,
+            "avg_ms": round(t.total_seconds / t.requests * 1000, 3),
+            "max_ms": round(t.max_seconds * 1000, 3),
+            "serialize_avg_ms": round(t.serialize_seconds / t.requests * 1000, 3),
+            "serialize_total_ms": round(t.serialize_seconds * 1000, 3),
+        }
+        for route, t in items
+    }
+
+
+class TimingMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        serialization = [0.0]
+        token = _serialization.set(serialization)
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                elapsed = time.perf_counter() - started
+                headers = MutableHeaders(scope=message)
+                headers.append(
+                    "Server-Timing",
+                    f"app;dur={elapsed * 1000:.2f}, "
+                    f"serialize;dur={serialization[0] * 1000:.2f}",
+                )
+                # Set by the router; absent for static files and 404s
+                route = scope.get("route")
+                if route is not None and hasattr(route, "methods"):
+                    _record(f"{scope['method']} {route.path}", elapsed, serialization[0])
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _serialization.reset(token)
@@ -1,19 +1,53 @@
+import time
+
+_IMPORT_STARTED = time.perf_counter()
+
 from fastapi import FastAPI
-from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
-from app.database import init_db
+from app.database import init_db, warm_up
+from app.http_cache import CatalogCacheMiddleware
+from app.http_compression import CompressionMiddleware, PrecompressedStaticFiles
+from app.http_timing import TimingMiddleware
+from app.responses import NegotiatedResponse
+from app.services import readiness
 from app.routers import (
     admin,
     auth,
+    changes,
     config,
+    estimate,
+    export,
+    health,
+    history,
+    live,
     models,
     prices,
+    reviews,
+    routing,
     settings,
     user_keys,
+    watches,
+    webhooks,
     account,
 )
 
-app = FastAPI(title="LLM Price Hub", version="0.0.1")
+readiness.mark_import_started(_IMPORT_STARTED)
+
+app = FastAPI(
+    title="LLM Price Hub",
+    version="0.0.1",
+    default_response_class=NegotiatedResponse,
+)
+
+# Server-Timing and per-route timings, innermost so serialization is seen
+app.add_middleware(TimingMiddleware)
+
+# ETag / 304 handling for the public catalog endpoints (inside CORS so 304s
+# still carry the CORS headers)
+app.add_middleware(CatalogCacheMiddleware)
+
+# brotli/gzip for larger bodies; wraps the ETag middleware to weaken its tags
+app.add_middleware(CompressionMiddleware)
 
 # CORS
 app.add_middleware(
@@ -24,8 +58,8 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Static Files (for uploads)
-app.mount("/static", StaticFiles(directory="static"), name="static")
+# Static Files (uploads, and the pre-compressed home page snapshots)
+app.mount("/static", PrecompressedStaticFiles(directory="static"), name="static")
 
 # Routers
 app.include_router(prices.router)
@@ -36,27 +70,72 @@ app.include_router(auth.router)
 app.include_router(user_keys.router)
 app.include_router(settings.router)
 app.include_router(account.router)
+app.include_router(reviews.router)
+app.include_router(export.router)
+app.include_router(history.router)
+app.include_router(estimate.router)
+app.include_router(routing.router)
+app.include_router(changes.router)
+app.include_router(live.router)
+app.include_router(webhooks.router)
+app.include_router(watches.router)
+app.include_router(health.router)
+
+
+def _sync_exchange_rates():
+    from app.services.scheduler import update_exchange_rates
+
+    # The updater logs and swallows its errors; fail the warmup step instead
+    if not update_exchange_rates():
+        raise RuntimeError("exchange rate sync failed")
+
+
+def _backfill_usd_prices():
+    from app.services.pricing import backfill_usd_prices
+
+    backfill_usd_prices()
+
+
+def _refresh_price_table():
+    # Importing the derived indexes registers their refresh listeners, so
+    # they are built together with the table instead of on first request
+    from app.services import basket, routing  # noqa: F401
+    from app.services.price_table import refresh
+
+    refresh()
+
+
+def _repair_provider_ratings():
+    from app.services.scheduler import repair_provider_ratings
+
+    repair_provider_ratings()
 
 
 @app.on_event("startup")
 def on_startup():
     init_db()
-    from app.services.scheduler import scheduler, update_exchange_rates
+    from app.services.scheduler import start_scheduler
 
-    # Kick off an immediate currency sync so rates are available right after boot
-    try:
-        update_exchange_rates()
-    except Exception:
-        pass
+    start_scheduler()
 
-    scheduler.start()
+    # Rate sync and cache warmup run in the background; until they finish the
+    # last known CurrencyRate rows are served and /readyz reports not ready.
+    # A failed rate sync is reported but not blocking: stored rates still serve.
+    readiness.register_warmup("database", warm_up)
+    readiness.register_warmup("exchange_rates", _sync_exchange_rates, required=False)
+    readiness.register_warmup("usd_prices", _backfill_usd_prices)
+    readiness.register_warmup("provider_ratings", _repair_provider_ratings)
+    readiness.register_warmup("price_table", _refresh_price_table)
+    readiness.start_background_warmup()
 
 
 @app.on_event("shutdown")
 def on_shutdown():
-    from app.services.scheduler import scheduler
+    from app.services.scheduler import flush_popularity, scheduler
 
     scheduler.shutdown()
+    # Persist any model views still buffered in memory
+    flush_popularity()
 
 
 @app.get("/")
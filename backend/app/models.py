@@ -1,5 +1,6 @@
 from datetime import datetime
 from typing import Optional
+from sqlalchemy import Index
 from sqlmodel import Field, SQLModel, Relationship
 from enum import Enum
 
@@ -33,7 +34,7 @@ class Provider(SQLModel, table=True):
     is_official: bool = Field(default=False)
     owner_id: Optional[int] = Field(default=None, foreign_key="users.id")
 
-    status: ProviderStatus = Field(default=ProviderStatus.private)
+    status: ProviderStatus = Field(default=ProviderStatus.private, index=True)
 
     openai_base_url: Optional[str] = Field(default=None, max_length=500)
     gemini_base_url: Optional[str] = Field(default=None, max_length=500)
@@ -43,6 +44,14 @@ class Provider(SQLModel, table=True):
     proof_content: Optional[str] = Field(default=None, max_length=2000)
 
     avg_score: float = Field(default=0.0)
+    # Running review aggregates kept in sync by app.services.ratings
+    rating_sum: int = Field(default=0)
+    rating_count: int = Field(default=0)
+    rating_hist_1: int = Field(default=0)
+    rating_hist_2: int = Field(default=0)
+    rating_hist_3: int = Field(default=0)
+    rating_hist_4: int = Field(default=0)
+    rating_hist_5: int = Field(default=0)
     uptime_rate: float = Field(default=100.0)
     created_at: datetime = Field(default_factory=datetime.utcnow)
 
@@ -54,8 +63,8 @@ class Provider(SQLModel, table=True):
 class StandardModel(SQLModel, table=True):
     __tablename__ = "standard_models"
     id: Optional[int] = Field(default=None, primary_key=True)
-    name: str = Field(max_length=50)
-    vendor: Optional[str] = Field(default=None, max_length=50)
+    name: str = Field(max_length=50, index=True)
+    vendor: Optional[str] = Field(default=None, max_length=50, index=True)
 
     official_currency: str = Field(default="USD", max_length=10)
     official_input_price: Optional[float] = Field(default=None)
@@ -64,7 +73,8 @@ class StandardModel(SQLModel, table=True):
     is_featured: bool = Field(default=False)
     rank_hint: Optional[int] = Field(default=None, index=True)
 
-    popularity_score: int = Field(default=0, index=True)
+    # Decayed view count; fractional so small scores decay smoothly too
+    popularity_score: float = Field(default=0.0, index=True)
 
     prices: list["ModelPrice"] = Relationship(back_populates="standard_model")
 
@@ -130,6 +140,34 @@ class UserActionToken(SQLModel, table=True):
     created_at: datetime = Field(default_factory=datetime.utcnow)
 
 
+class CatalogVersion(SQLModel, table=True):
+    """Single-row counter bumped by every write to the public catalog."""
+
+    __tablename__ = "catalog_version"
+    id: int = Field(default=1, primary_key=True)
+    version: int = Field(default=0)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    # Highest change-log id dropped by compaction; older cursors must re-bootstrap
+    changes_compacted_to: int = Field(default=0)
+
+
+class CatalogChange(SQLModel, table=True):
+    """Change log of public catalog entities, the cursor source of /api/changes.
+
+    Rows only name what changed; readers resolve the entity's current state.
+    """
+
+    __tablename__ = "catalog_changes"
+    __table_args__ = (
+        Index("ix_catalog_changes_entity_key", "entity", "entity_key", "id"),
+        Index("ix_catalog_changes_ts", "ts"),
+    )
+    id: Optional[int] = Field(default=None, primary_key=True)
+    entity: str = Field(max_length=20)  # price | model | provider | rate
+    entity_key: str = Field(max_length=64)
+    ts: datetime = Field(default_factory=datetime.utcnow)
+
+
 class SystemSetting(SQLModel, table=True):
     __tablename__ = "system_settings"
     key: str = Field(primary_key=True, max_length=50)
@@ -139,6 +177,27 @@ class SystemSetting(SQLModel, table=True):
 
 class ModelPrice(SQLModel, table=True):
     __tablename__ = "model_prices"
+    __table_args__ = (
+        # "Cheapest N for model X" is a range scan over these
+        Index(
+            "ix_model_prices_model_status_in_usd",
+            "standard_model_id",
+            "status",
+            "input_price_usd",
+            "id",
+        ),
+        Index(
+            "ix_model_prices_model_status_out_usd",
+            "standard_model_id",
+            "status",
+            "output_price_usd",
+            "id",
+        ),
+        Index("ix_model_prices_status_created", "status", "created_at", "id"),
+        Index("ix_model_prices_submitter", "submitter_id"),
+        # Billing lookups by the provider's own model string
+        Index("ix_model_prices_provider_model_name", "provider_id", "provider_model_name"),
+    )
     id: Optional[int] = Field(default=None, primary_key=True)
 
     provider_id: int = Field(foreign_key="providers.id")
@@ -155,6 +214,13 @@ class ModelPrice(SQLModel, table=True):
     cache_hit_input_price: Optional[float] = Field(default=None)
     cache_hit_output_price: Optional[float] = Field(default=None)
 
+    # USD-normalized copies of the prices above, kept in sync on write and
+    # when exchange rates change; NULL when the currency has no known rate
+    input_price_usd: Optional[float] = Field(default=None)
+    output_price_usd: Optional[float] = Field(default=None)
+    cache_hit_input_price_usd: Optional[float] = Field(default=None)
+    cache_hit_output_price_usd: Optional[float] = Field(default=None)
+
     proof_type: Optional[str] = Field(
         default=None, max_length=20
     )
@@ -172,8 +238,38 @@ class ModelPrice(SQLModel, table=True):
     submitter: Optional[User] = Relationship(back_populates="prices")
 
 
+class PriceHistory(SQLModel, table=True):
+    """Append-only log of a price's values at each approve, update and expiry."""
+
+    __tablename__ = "price_history"
+    __table_args__ = (
+        Index("ix_price_history_model_provider_ts", "standard_model_id", "provider_id", "ts"),
+        Index("ix_price_history_provider_ts", "provider_id", "ts"),
+        Index("ix_price_history_price_ts", "price_id", "ts"),
+    )
+    id: Optional[int] = Field(default=None, primary_key=True)
+    price_id: int = Field(foreign_key="model_prices.id")
+    standard_model_id: int = Field(foreign_key="standard_models.id")
+    provider_id: int = Field(foreign_key="providers.id")
+
+    event: str = Field(max_length=20)  # approved | updated | expired
+    currency: str = Field(max_length=10)
+    input_price: float
+    output_price: float
+    input_price_usd: Optional[float] = Field(default=None)
+    output_price_usd: Optional[float] = Field(default=None)
+    ts: datetime = Field(default_factory=datetime.utcnow)
+
+
 class Review(SQLModel, table=True):
     __tablename__ = "reviews"
+    __table_args__ = (
+        # Keyset pagination of a provider's reviews, newest first
+        Index("ix_reviews_provider_created", "provider_id", "created_at", "id"),
+        # One review per user and provider. A unique index rather than a
+        # constraint so _upgrade_schema adds it to existing tables too.
+        Index("ux_reviews_provider_user", "provider_id", "user_id", unique=True),
+    )
     id: Optional[int] = Field(default=None, primary_key=True)
     provider_id: int = Field(foreign_key="providers.id")
     user_id: Optional[int] = Field(default=None, foreign_key="users.id")
@@ -216,3 +312,66 @@ class UserAPIKey(SQLModel, table=True):
 
     user: Optional[User] = Relationship(back_populates="api_keys")
     provider: Optional[Provider] = Relationship()
+
+
+class WebhookSubscription(SQLModel, table=True):
+    """Endpoint notified of price events, with its circuit-breaker state."""
+
+    __tablename__ = "webhook_subscriptions"
+    id: Optional[int] = Field(default=None, primary_key=True)
+    owner_id: int = Field(foreign_key="users.id")
+    url: str = Field(max_length=500)
+    secret: str = Field(max_length=128)
+    # JSON lists of ids; NULL matches everything
+    model_ids: Optional[str] = Field(default=None, max_length=2000)
+    provider_ids: Optional[str] = Field(default=None, max_length=2000)
+    is_active: bool = Field(default=True)
+
+    consecutive_failures: int = Field(default=0)
+    circuit_open_until: Optional[datetime] = Field(default=None)
+    last_success_at: Optional[datetime] = Field(default=None)
+    last_error: Optional[str] = Field(default=None, max_length=255)
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+class WebhookOutbox(SQLModel, table=True):
+    """Pending webhook deliveries, written in the transaction of the change."""
+
+    __tablename__ = "webhook_outbox"
+    __table_args__ = (
+        Index("ix_webhook_outbox_due", "status", "next_attempt_at", "id"),
+        Index("ix_webhook_outbox_subscription", "subscription_id", "status"),
+    )
+    id: Optional[int] = Field(default=None, primary_key=True)
+    subscription_id: int = Field(foreign_key="webhook_subscriptions.id")
+    event: str = Field(max_length=30)
+    payload: str = Field(max_length=4000)  # JSON
+    status: str = Field(default="pending", max_length=20)  # pending | delivered | dead
+    attempts: int = Field(default=0)
+    next_attempt_at: datetime = Field(default_factory=datetime.utcnow)
+    lease_owner: Optional[str] = Field(default=None, max_length=64)
+    lease_until: Optional[datetime] = Field(default=None)
+    delivered_at: Optional[datetime] = Field(default=None)
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+class PriceWatch(SQLModel, table=True):
+    """Alert a user when a provider's price for a model drops below a threshold."""
+
+    __tablename__ = "price_watches"
+    __table_args__ = (Index("ix_price_watches_user", "user_id"),)
+    id: Optional[int] = Field(default=None, primary_key=True)
+    user_id: int = Field(foreign_key="users.id")
+    standard_model_id: int = Field(foreign_key="standard_models.id")
+    metric: str = Field(default="input", max_length=10)  # input | output
+    # Per 1M tokens, in ``currency`` (the user's default currency when created)
+    threshold: float
+    currency: str = Field(default="USD", max_length=10)
+    is_active: bool = Field(default=True)
+
+    # Last alert, so an unchanged price is not reported twice
+    last_price_id: Optional[int] = Field(default=None)
+    last_price: Optional[float] = Field(default=None)
+    last_notified_at: Optional[datetime] = Field(default=None)
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
@@ -0,0 +1,164 @@
+"""Shared keyset (cursor) pagination for list endpoints.
+
+Endpoints declare the sort keys they allow; ``order_by`` picks one (prefix
+``-`` for descending) and the primary key is appended as a tie-breaker so
+every ordering is total. Cursors are opaque base64 tokens holding the sort
+values of the last row served plus the ordering they belong to, so each page
+is a single indexed range scan rather than an OFFSET.
+"""
+
+import base64
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from enum import Enum
+from typing import Any, Callable, Optional, Sequence
+from fastapi import HTTPException
+from sqlalchemy import and_, func, or_, select, text
+from sqlmodel import Session
+from app.services.cache import TTLCache
+
+MAX_PAGE_SIZE = 500
+
+# Totals are refreshed at most once a minute per filter combination
+_total_cache = TTLCache(ttl=60, maxsize=2048)
+
+
+@dataclass(frozen=True)
+class Ordering:
+    name: str
+    columns: tuple  # ((expression, descending), ...)
+
+    def order_clauses(self) -> list:
+        return [expr.desc() if desc else expr.asc() for expr, desc in self.columns]
+
+
+def parse_order_by(
+    order_by: Optional[str], allowed: dict[str, Any], tiebreaker, default: str
+) -> Ordering:
+    """Resolve ``order_by`` such as ``name`` or ``-created_at`` to an Ordering."""
+    name = order_by or default
+    descending = name.startswith("-")
+    key = name.lstrip("-")
+    if key not in allowed:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid order_by; allowed: {', '.join(sorted(allowed))}",
+        )
+    return Ordering(
+        name=name, columns=((allowed[key], descending), (tiebreaker, descending))
+    )
+
+
+def _encode_value(value):
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, Enum):
+        return value.value
+    return value
+
+
+def _decode_value(value):
+    if isinstance(value, dict) and "dt" in value:
+        return datetime.fromisoformat(value["dt"])
+    return value
+
+
+def encode_cursor(ordering: Ordering, values: Sequence) -> str:
+    raw = json.dumps({"o": ordering.name, "v": [_encode_value(v) for v in values]})
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(ordering: Ordering, cursor: str) -> list:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded))
+        values = [_decode_value(v) for v in data["v"]]
+    except (ValueError, TypeError, KeyError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if data.get("o") != ordering.name or len(values) != len(ordering.columns):
+        raise HTTPException(status_code=400, detail="Cursor does not match order_by")
+    return values
+
+
+def keyset_condition(ordering: Ordering, values: Sequence):
+    """Rows strictly after ``values`` in ``ordering`` (mixed directions allowed)."""
+    clauses = []
+    for i, (expr, desc) in enumerate(ordering.columns):
+        equal_prefix = [ordering.columns[j][0] == values[j] for j in range(i)]
+        step = expr < values[i] if desc else expr > values[i]
+        clauses.append(and_(*equal_prefix, step))
+    return or_(*clauses)
+
+
+def paginate(
+    session: Session,
+    statement,
+    ordering: Ordering,
+    limit: int,
+    cursor: Optional[str],
+    key_of: Optional[Callable[[Any], Sequence]] = None,
+) -> tuple[list, Optional[str]]:
+    """Fetch one page and the cursor for the next one (None on the last page).
+
+    ``key_of`` extracts the ordering values from a result row, in the same
+    order as ``ordering.columns``. It defaults to reading the ordering
+    columns' attributes, which suits single-entity selects.
+    """
+    if cursor:
+        statement = statement.where(
+            keyset_condition(ordering, decode_cursor(ordering, cursor))
+        )
+    statement = statement.order_by(*ordering.order_clauses()).limit(limit + 1)
+    rows = session.exec(statement).all()
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    if key_of is None:
+        values = [getattr(rows[-1], expr.key) for expr, _ in ordering.columns]
+    else:
+        values = key_of(rows[-1])
+    return rows, encode_cursor(ordering, values)
+
+
+def estimate_total(session: Session, statement, cache_key) -> int:
+    """Approximate row count for ``statement`` without counting every page.
+
+    Unfiltered single-table listings on MySQL use the table statistics;
+    anything else runs one COUNT(*) whose result is cached for a minute.
+    """
+    cached = _total_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    bind = session.get_bind()
+    froms = statement.get_final_froms()
+    if (
+        bind.dialect.name == "mysql"
+        and statement.whereclause is None
+        and len(froms) == 1
+        and hasattr(froms[0], "name")
+    ):
+        total = session.exec(
+            text(
+                "SELECT TABLE_ROWS FROM information_schema.TABLES "
+                "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :name"
+            ),
+            params={"name": froms[0].name},
+        ).scalar()
+    else:
+        total = session.exec(
+            select(func.count()).select_from(statement.order_by(None).subquery())
+        ).scalar()
+
+    total = int(total or 0)
+    _total_cache.set(cache_key, total)
+    return total
+
+
+def page_response(items: list, next_cursor: Optional[str], total: Optional[int] = None):
+    page = {"items": items, "next_cursor": next_cursor}
+    if total is not None:
+        page["total"] = total
+        page["total_is_estimate"] = True
+    return page
@@ -0,0 +1,116 @@
+"""Field projection and the columnar response format for list endpoints.
+
+``fields=a,b`` narrows a listing to the named fields. The projection is part
+of the SQL ``SELECT``, so unrequested columns (long proof texts, say) are
+never loaded. ``format=columnar`` returns one array per field instead of
+one object per row. Low-cardinality fields such as provider and currency
+are dictionary-encoded: the column holds small integer codes and
+``dictionaries`` holds each distinct value once.
+"""
+
+from enum import Enum
+from typing import Callable, Iterable, Optional
+from fastapi import HTTPException
+from sqlalchemy import select
+
+
+class ResponseFormat(str, Enum):
+    rows = "rows"
+    columnar = "columnar"
+
+
+def parse_fields(fields: Optional[str], allowed: dict) -> list[str]:
+    """Resolve ``fields=a,b`` to field names in request order; all when unset."""
+    if fields is None:
+        return list(allowed)
+    names = list(dict.fromkeys(part.strip() for part in fields.split(",") if part.strip()))
+    unknown = [name for name in names if name not in allowed]
+    if unknown or not names:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid fields; allowed: {', '.join(allowed)}",
+        )
+    return names
+
+
+def projected_select(allowed: dict, names: list[str], extra: Iterable = ()):
+    """SELECT of the named fields, each labelled with its name, plus ``extra``.
+
+    ``extra`` holds columns the query needs beyond the response (ordering or
+    cursor keys); they are skipped when they already are a requested field.
+    """
+    columns = [allowed[name].label(name) for name in names]
+    for column in extra:
+        if not any(column is allowed[name] for name in names):
+            columns.append(column)
+    return select(*columns)
+
+
+def project_rows(
+    rows: Iterable, names: list[str], converters: Optional[dict[str, Callable]] = None
+) -> list[tuple]:
+    """Values of the named fields of each row, passed through ``converters``."""
+    getters = [(name, (converters or {}).get(name)) for name in names]
+    projected = []
+    for row in rows:
+        mapping = row._mapping
+        projected.append(
+            tuple(
+                convert(mapping[name]) if convert else mapping[name]
+                for name, convert in getters
+            )
+        )
+    return projected
+
+
+def to_columnar(
+    names: list[str], rows: list[tuple], dictionaries: Optional[dict] = None
+) -> dict:
+    """Parallel arrays per field, dictionary-encoding the given field groups.
+
+    ``dictionaries`` maps a group name to the fields it covers (e.g. a
+    provider's id, name and score). The requested fields of a group are
+    replaced by one column of codes, and ``dictionaries[group]`` holds the
+    distinct combinations as parallel arrays indexed by code.
+    """
+    values = {name: [row[i] for row in rows] for i, name in enumerate(names)}
+    encoded = {}
+    for group, group_fields in (dictionaries or {}).items():
+        present = [name for name in group_fields if name in values]
+        if not present:
+            continue
+        codes, distinct = [], {}
+        for key in zip(*(values[name] for name in present)):
+            code = distinct.get(key)
+            if code is None:
+                code = distinct[key] = len(distinct)
+            codes.append(code)
+        # The code column takes the place of the group's first field
+        columns = {}
+        for name, column in values.items():
+            if name == present[0]:
+                columns[group] = codes
+            elif name not in present:
+                columns[name] = column
+        values = columns
+        encoded[group] = {
+            name: [key[j] for key in distinct] for j, name in enumerate(present)
+        }
+    return {
+        "format": ResponseFormat.columnar.value,
+        "length": len(rows),
+        "columns": values,
+        "dictionaries": encoded,
+    }
+
+
+def render_rows(
+    names: list[str],
+    rows: list[tuple],
+    response_format: ResponseFormat,
+    dictionaries: Optional[dict] = None,
+):
+    """Projected rows as a list of objects or as a columnar document."""
+    if response_format == ResponseFormat.columnar:
+        return to_columnar(names, rows, dictionaries)
+    return [dict(zip(names, row)) for row in rows]
@@ -0,0 +1,122 @@
+"""Response classes shared by the routers.
+
+``FastJSONResponse`` renders with orjson (the standard library when orjson
+is not installed) and reports the time spent rendering to
+``app.http_timing``. ``NegotiatedResponse``, the app's default response
+class, renders the same content as MessagePack instead when the request
+negotiated ``application/msgpack`` (see ``negotiate``), so both encodings
+always carry the same fields. Hot read endpoints build plain dicts shaped by
+an explicit response schema and return it directly, which skips
+``jsonable_encoder`` and response validation.
+"""
+
+import json
+import time
+from contextvars import ContextVar
+from datetime import date, datetime
+from enum import Enum
+from typing import Optional
+from fastapi.responses import JSONResponse
+from app import http_timing
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - JSON only
+    msgpack = None
+
+JSON_MEDIA_TYPE = "application/json"
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+_MSGPACK_ALIASES = {MSGPACK_MEDIA_TYPE, "application/x-msgpack", "application/vnd.msgpack"}
+
+# Media type negotiated for the current request; set around the public
+# catalog endpoints by app.http_cache
+_negotiated: ContextVar[str] = ContextVar("negotiated_media_type", default=JSON_MEDIA_TYPE)
+
+
+def _default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    if hasattr(value, "tolist"):  # NumPy scalars and arrays
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content) -> bytes:
+    """Compact JSON bytes; datetimes as ISO 8601, enums as their values."""
+    if orjson is not None:
+        return orjson.dumps(
+            content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        )
+    return json.dumps(
+        content, default=_default, ensure_ascii=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content) -> bytes:
+        started = time.perf_counter()
+        body = dumps(content)
+        http_timing.record_serialization(time.perf_counter() - started)
+        return body
+
+
+def negotiate(accept: Optional[str]) -> str:
+    """MessagePack when the client lists it above (or without) JSON, else JSON.
+
+    Wildcards never select MessagePack, so browsers always get JSON.
+    """
+    if msgpack is None or not accept:
+        return JSON_MEDIA_TYPE
+    msgpack_q = json_q = 0.0
+    for part in accept.split(","):
+        media_type, _, params = part.partition(";")
+        media_type = media_type.strip().lower()
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if media_type in _MSGPACK_ALIASES:
+            msgpack_q = max(msgpack_q, quality)
+        elif media_type == JSON_MEDIA_TYPE:
+            json_q = max(json_q, quality)
+    return MSGPACK_MEDIA_TYPE if msgpack_q > 0 and msgpack_q >= json_q else JSON_MEDIA_TYPE
+
+
+def use_media_type(media_type: str):
+    """Set the negotiated media type for this request; returns a reset token."""
+    return _negotiated.set(media_type)
+
+
+def reset_media_type(token):
+    _negotiated.reset(token)
+
+
+def wants_msgpack() -> bool:
+    return _negotiated.get() == MSGPACK_MEDIA_TYPE
+
+
+def packb(content) -> bytes:
+    """MessagePack bytes; the same value mapping as ``dumps``."""
+    return msgpack.packb(content, default=_default, use_bin_type=True)
+
+
+class NegotiatedResponse(FastJSONResponse):
+    def render(self, content) -> bytes:
+        if not wants_msgpack():
+            return super().render(content)
+        self.media_type = MSGPACK_MEDIA_TYPE
+        started = time.perf_counter()
+        body = packb(content)
+        http_timing.record_serialization(time.perf_counter() - started)
+        return body
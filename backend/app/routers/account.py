@@ -4,7 +4,6 @@ import uuid
 from datetime import datetime, timedelta
 from typing import Optional
 
-import pyotp
 from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel, EmailStr
 from sqlmodel import Session, select
@@ -52,6 +51,8 @@ def _verify_totp_or_backup(user: User, code: str, session: Session) -> bool:
     if not settings or not settings.totp_enabled or not settings.totp_secret:
         return False
 
+    import pyotp
+
     totp = pyotp.TOTP(settings.totp_secret)
     if totp.verify(code, valid_window=1):
         return True
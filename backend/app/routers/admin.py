@@ -1,5 +1,5 @@
 from datetime import datetime
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlmodel import Session, select
 from sqlalchemy import func
 from pydantic import BaseModel
@@ -17,6 +17,21 @@ from app.models import (
     Review,
 )
 from app.auth import get_current_admin, get_current_super_admin
+from app.pagination import (
+    MAX_PAGE_SIZE,
+    estimate_total,
+    page_response,
+    paginate,
+    parse_order_by,
+)
+from app.services.catalog import bump_version
+from app.services.price_history import record_price_event
+from app.services.webhooks import enqueue_price_events
+from app.services.ratings import (
+    invalidate_rating_summary,
+    rebuild_provider_ratings,
+    record_reviews_removed,
+)
 
 router = APIRouter(prefix="/api/admin", tags=["admin"])
 
@@ -72,21 +87,6 @@ def _ensure_can_manage_user(target: User, actor: User):
         )
 
 
-def _recompute_provider_score(session: Session, provider_id: int):
-    """Recalculate provider average rating after moderation actions."""
-    rating_rows = session.exec(
-        select(Review.rating).where(Review.provider_id == provider_id)
-    ).all()
-    ratings = [
-        r[0] if isinstance(r, tuple) else r  # SQLAlchemy can return either shape
-        for r in rating_rows
-    ]
-    provider = session.get(Provider, provider_id)
-    if provider:
-        provider.avg_score = sum(ratings) / len(ratings) if ratings else 0.0
-        session.add(provider)
-
-
 def _normalize_standard_model_payload(model_in: StandardModelIn) -> dict:
     """Sanitize and coerce model fields for creation/update flows."""
 
@@ -115,8 +115,19 @@ def _normalize_standard_model_payload(model_in: StandardModelIn) -> dict:
     }
 
 
+PENDING_ORDERINGS = {"created_at": ModelPrice.created_at, "id": ModelPrice.id}
+USER_ORDERINGS = {"id": User.id, "email": User.email, "created_at": User.created_at}
+
+
 @router.get("/pending")
 async def get_pending_prices(
+    provider_id: Optional[int] = None,
+    standard_model_id: Optional[int] = None,
+    currency: Optional[str] = None,
+    order_by: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    include_total: bool = False,
     session: Session = Depends(get_session),
     current_user: User = Depends(get_current_admin),
 ):
@@ -127,9 +138,28 @@ async def get_pending_prices(
         .join(StandardModel, ModelPrice.standard_model_id == StandardModel.id)
         .where(ModelPrice.status == PriceStatus.pending)
     )
+    if provider_id is not None:
+        statement = statement.where(ModelPrice.provider_id == provider_id)
+    if standard_model_id is not None:
+        statement = statement.where(ModelPrice.standard_model_id == standard_model_id)
+    if currency:
+        statement = statement.where(ModelPrice.currency == currency)
+
+    ordering = parse_order_by(order_by, PENDING_ORDERINGS, ModelPrice.id, "created_at")
+    paged = limit is not None or cursor is not None
+    if paged:
+        results, next_cursor = paginate(
+            session,
+            statement,
+            ordering,
+            limit or MAX_PAGE_SIZE,
+            cursor,
+            lambda row: (getattr(row[0], ordering.name.lstrip("-")), row[0].id),
+        )
+    else:
+        results = session.exec(statement.order_by(*ordering.order_clauses())).all()
 
-    results = session.exec(statement).all()
-    return [
+    items = [
         {
             "id": price.id,
             "provider_name": provider.name,
@@ -145,6 +175,15 @@ async def get_pending_prices(
         }
         for price, provider, model in results
     ]
+    if not paged:
+        return items
+
+    total = None
+    if include_total:
+        total = estimate_total(
+            session, statement, ("pending", provider_id, standard_model_id, currency)
+        )
+    return page_response(items, next_cursor, total)
 
 
 @router.post("/approve/{price_id}")
@@ -159,6 +198,9 @@ async def approve_price(
 
     price.status = PriceStatus.active
     price.verified_at = datetime.utcnow()
+    record_price_event(session, price, "approved", price.verified_at)
+    enqueue_price_events(session, [price], "approved")
+    bump_version(session)
     session.commit()
     return {"message": "Price approved"}
 
@@ -174,6 +216,7 @@ async def reject_price(
         raise HTTPException(status_code=404, detail="Price not found")
 
     price.status = PriceStatus.rejected
+    bump_version(session)
     session.commit()
     return {"message": "Price rejected"}
 
@@ -203,6 +246,7 @@ async def admin_create_model(
 
     model = StandardModel(**payload)
     session.add(model)
+    bump_version(session)
     session.commit()
     session.refresh(model)
     return model
@@ -228,6 +272,7 @@ async def admin_update_model(
         setattr(model, k, v)
 
     session.add(model)
+    bump_version(session)
     session.commit()
     session.refresh(model)
     return model
@@ -262,6 +307,7 @@ async def admin_bulk_upsert_models(
             session.add(model)
             stats["created"] += 1
 
+    bump_version(session)
     session.commit()
     stats["total"] = len(bulk.items)
     return stats
@@ -283,6 +329,7 @@ async def admin_delete_model(
     for price in prices:
         session.delete(price)
     session.delete(model)
+    bump_version(session)
     session.commit()
     return {"message": "Model deleted"}
 
@@ -311,6 +358,8 @@ async def admin_bulk_delete_models(
         session.delete(model)
         deleted += 1
 
+    if deleted:
+        bump_version(session)
     session.commit()
     return {"deleted": deleted, "skipped": skipped, "total": len(payload.ids)}
 
@@ -354,6 +403,7 @@ async def approve_model_request(
         session.add(model)
 
     session.add(req)
+    bump_version(session)
     session.commit()
     session.refresh(model)
     return {"message": "Request approved", "model_id": model.id}
@@ -422,6 +472,7 @@ async def approve_provider(
         raise HTTPException(status_code=400, detail="Provider is not pending")
 
     provider.status = ProviderStatus.approved
+    bump_version(session)
     session.commit()
     return {"message": "Provider approved"}
 
@@ -443,6 +494,17 @@ async def reject_provider(
     return {"message": "Provider rejected"}
 
 
+@router.post("/providers/ratings/rebuild")
+async def rebuild_ratings(
+    session: Session = Depends(get_session),
+    current_user: User = Depends(get_current_super_admin),
+):
+    """Repair provider rating aggregates from the reviews table."""
+    corrected = rebuild_provider_ratings(session)
+    session.commit()
+    return {"message": "Provider ratings rebuilt", "corrected": corrected}
+
+
 # ============ Model Request Review ============
 
 
@@ -493,6 +555,7 @@ async def approve_model_request(
     session.add(new_model)
 
     request.status = "approved"
+    bump_version(session)
     session.commit()
     session.refresh(new_model)
 
@@ -521,21 +584,43 @@ async def reject_model_request(
 
 @router.get("/users")
 async def get_users(
+    role: Optional[str] = None,
+    is_active: Optional[bool] = None,
+    order_by: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    include_total: bool = False,
     session: Session = Depends(get_session),
     current_user: User = Depends(get_current_admin),
 ):
     query = select(User)
     if current_user.role == "admin":
         query = query.where(User.role == "user")
+    if role:
+        query = query.where(User.role == role)
+    if is_active is not None:
+        query = query.where(User.is_active == is_active)
+
+    ordering = parse_order_by(order_by, USER_ORDERINGS, User.id, "id")
+    paged = limit is not None or cursor is not None
+    if paged:
+        users, next_cursor = paginate(
+            session, query, ordering, limit or MAX_PAGE_SIZE, cursor
+        )
+    else:
+        users = session.exec(query.order_by(*ordering.order_clauses())).all()
 
-    users = session.exec(query).all()
-
-    # Aggregate contributions for quick insight
+    # Aggregate contributions for quick insight; a page only counts its own users
+    user_ids = [u.id for u in users]
     price_counts = {
         user_id: count
         for user_id, count in session.exec(
             select(ModelPrice.submitter_id, func.count(ModelPrice.id))
-            .where(ModelPrice.submitter_id.is_not(None))
+            .where(
+                ModelPrice.submitter_id.in_(user_ids)
+                if paged
+                else ModelPrice.submitter_id.is_not(None)
+            )
             .group_by(ModelPrice.submitter_id)
         )
     }
@@ -543,12 +628,12 @@ async def get_users(
         user_id: count
         for user_id, count in session.exec(
             select(Review.user_id, func.count(Review.id))
-            .where(Review.user_id.is_not(None))
+            .where(Review.user_id.in_(user_ids) if paged else Review.user_id.is_not(None))
             .group_by(Review.user_id)
         )
     }
 
-    return [
+    items = [
         {
             "id": u.id,
             "email": u.email,
@@ -565,6 +650,15 @@ async def get_users(
         }
         for u in users
     ]
+    if not paged:
+        return items
+
+    total = None
+    if include_total:
+        total = estimate_total(
+            session, query, ("users", current_user.role, role, is_active)
+        )
+    return page_response(items, next_cursor, total)
 
 
 @router.put("/users/{user_id}/role")
@@ -654,22 +748,24 @@ async def delete_user(
 
     _ensure_can_manage_user(user, current_user)
 
-    affected_provider_ids = set()
+    removed_ratings: dict[int, list[int]] = {}
     removed_reviews = 0
     if payload.purge_reviews:
         reviews = session.exec(select(Review).where(Review.user_id == user_id)).all()
         for review in reviews:
             if review.provider_id:
-                affected_provider_ids.add(review.provider_id)
+                removed_ratings.setdefault(review.provider_id, []).append(review.rating)
             session.delete(review)
             removed_reviews += 1
 
+    for pid, ratings in removed_ratings.items():
+        record_reviews_removed(session, pid, ratings)
+
     session.delete(user)
     session.commit()
 
-    for pid in affected_provider_ids:
-        _recompute_provider_score(session, pid)
-    session.commit()
+    for pid in removed_ratings:
+        invalidate_rating_summary(pid)
 
     return {
         "message": "User deleted",
@@ -728,12 +824,13 @@ async def delete_user_review(
         raise HTTPException(status_code=404, detail="Review not found")
 
     provider_id = review.provider_id
+    if provider_id:
+        record_reviews_removed(session, provider_id, [review.rating])
     session.delete(review)
     session.commit()
 
     if provider_id:
-        _recompute_provider_score(session, provider_id)
-        session.commit()
+        invalidate_rating_summary(provider_id)
 
     return {"message": "Review deleted"}
 
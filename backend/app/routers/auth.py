@@ -6,7 +6,6 @@ from fastapi import APIRouter, Depends, HTTPException, Form, status, Body
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlmodel import Session, select
 from pydantic import BaseModel, EmailStr
-import pyotp
 from app.database import get_session
 from app.models import User, SystemSetting, EmailVerificationToken, UserSettings
 from app.auth import (
@@ -141,6 +140,8 @@ async def login_for_access_token(
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN, detail="TOTP_REQUIRED"
             )
+        import pyotp
+
         totp = pyotp.TOTP(user.settings.totp_secret)
         if not totp.verify(totp_code, valid_window=1):
             # Allow use of backup codes once
@@ -232,6 +233,8 @@ async def totp_initiate(
         settings = UserSettings(user_id=current_user.id)
         session.add(settings)
     
+    import pyotp
+
     secret = pyotp.random_base32()
     settings.totp_temp_secret = secret
     session.add(settings)
@@ -255,6 +258,8 @@ async def totp_activate(
     if not settings or not settings.totp_temp_secret:
         raise HTTPException(status_code=400, detail="No pending TOTP setup")
 
+    import pyotp
+
     totp = pyotp.TOTP(settings.totp_temp_secret)
     if not totp.verify(code, valid_window=1):
         raise HTTPException(status_code=400, detail="Invalid TOTP code")
@@ -280,6 +285,8 @@ async def totp_disable(
     if not settings or not settings.totp_enabled or not settings.totp_secret:
         return {"message": "TOTP not enabled"}
 
+    import pyotp
+
     totp = pyotp.TOTP(settings.totp_secret)
     backup_codes = json.loads(settings.totp_backup_codes or "[]")
 
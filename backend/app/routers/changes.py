@@ -0,0 +1,34 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlmodel import Session
+from app.database import get_session
+from app.services.changes import CursorCompacted, changes_since, snapshot
+
+router = APIRouter(prefix="/api/changes", tags=["changes"])
+
+
+@router.get("")
+async def get_changes(
+    since: int = Query(..., ge=0, description="Cursor from a snapshot or previous page"),
+    limit: int = Query(1000, ge=1, le=5000, description="Log entries to read"),
+    session: Session = Depends(get_session),
+):
+    """Catalog changes after ``since``, one upsert or delete per entity.
+
+    Entities are ``model``, ``provider``, ``price`` and ``rate``; upserts
+    carry the entity's current data. Pass ``cursor`` back as ``since`` and
+    keep paging while ``has_more``. A 410 means the cursor predates the
+    compacted log: bootstrap again from ``/api/changes/snapshot``.
+    """
+    try:
+        return changes_since(session, since, limit)
+    except CursorCompacted:
+        raise HTTPException(
+            status_code=410,
+            detail="Cursor is older than the change log; reload /api/changes/snapshot",
+        )
+
+
+@router.get("/snapshot")
+async def get_snapshot(session: Session = Depends(get_session)):
+    """The whole public catalog and the cursor to follow changes from."""
+    return snapshot(session)
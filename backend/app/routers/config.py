@@ -1,24 +1,145 @@
-from fastapi import APIRouter, Depends
+from datetime import datetime
+from fastapi import APIRouter, Depends, Query
+from pydantic import BaseModel
 from sqlmodel import Session, select, or_
 from app.database import get_session
 from app.models import CurrencyRate, Provider, User, ProviderStatus, SystemSetting
-from typing import Optional
+from app.pagination import (
+    MAX_PAGE_SIZE,
+    estimate_total,
+    page_response,
+    paginate,
+    parse_order_by,
+)
+from app.projection import (
+    ResponseFormat,
+    parse_fields,
+    project_rows,
+    projected_select,
+    render_rows,
+)
+from app.responses import NegotiatedResponse
+from typing import List, Optional
 
 router = APIRouter(prefix="/api/config", tags=["config"])
 
 
-@router.get("/rates")
+class RateOut(BaseModel):
+    code: str
+    rate_to_usd: float
+    updated_at: datetime
+
+
+RATE_FIELDS = {name: getattr(CurrencyRate, name) for name in RateOut.model_fields}
+
+
+@router.get("/rates", response_model=List[RateOut])
 async def get_rates(session: Session = Depends(get_session)):
-    rates = session.exec(select(CurrencyRate)).all()
-    return rates
+    rates = session.exec(projected_select(RATE_FIELDS, list(RATE_FIELDS))).all()
+    return NegotiatedResponse([dict(row._mapping) for row in rates])
+
+
+PROVIDER_ORDERINGS = {
+    "id": Provider.id,
+    "name": Provider.name,
+    "avg_score": Provider.avg_score,
+    "uptime_rate": Provider.uptime_rate,
+}
+
+
+class ProviderOut(BaseModel):
+    """A public provider, read straight from the selected columns."""
+
+    id: int
+    name: str
+    website: Optional[str] = None
+    is_official: bool
+    owner_id: Optional[int] = None
+    status: ProviderStatus
+    openai_base_url: Optional[str] = None
+    gemini_base_url: Optional[str] = None
+    claude_base_url: Optional[str] = None
+    proof_type: Optional[str] = None
+    proof_content: Optional[str] = None
+    avg_score: float
+    rating_sum: int
+    rating_count: int
+    rating_hist_1: int
+    rating_hist_2: int
+    rating_hist_3: int
+    rating_hist_4: int
+    rating_hist_5: int
+    uptime_rate: float
+    created_at: datetime
+
+
+PROVIDER_FIELDS = {name: getattr(Provider, name) for name in ProviderOut.model_fields}
+
+
+def list_public_providers(
+    session: Session,
+    is_official: Optional[bool] = None,
+    order_by: Optional[str] = None,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    include_total: bool = False,
+    fields: Optional[str] = None,
+    response_format: ResponseFormat = ResponseFormat.rows,
+):
+    """Approved providers, SQL-ordered; paginated when limit or cursor is set."""
+    ordering = parse_order_by(order_by, PROVIDER_ORDERINGS, Provider.id, "id")
+    names = parse_fields(fields, PROVIDER_FIELDS)
+    statement = projected_select(
+        PROVIDER_FIELDS, names, [expr for expr, _ in ordering.columns]
+    ).where(Provider.status == ProviderStatus.approved)
+    if is_official is not None:
+        statement = statement.where(Provider.is_official == is_official)
+
+    if limit is None and cursor is None:
+        providers = session.exec(statement.order_by(*ordering.order_clauses())).all()
+        return render_rows(names, project_rows(providers, names), response_format)
+
+    providers, next_cursor = paginate(
+        session, statement, ordering, limit or MAX_PAGE_SIZE, cursor
+    )
+    providers = render_rows(names, project_rows(providers, names), response_format)
+    total = None
+    if include_total:
+        total = estimate_total(session, statement, ("providers", is_official))
+    return page_response(providers, next_cursor, total)
+
 
+@router.get("/providers", response_model=List[ProviderOut])
+async def get_providers(
+    is_official: Optional[bool] = None,
+    order_by: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    include_total: bool = False,
+    fields: Optional[str] = Query(
+        None, description="Comma-separated fields to return; only these are loaded"
+    ),
+    response_format: ResponseFormat = Query(
+        ResponseFormat.rows, alias="format", description="columnar: parallel arrays"
+    ),
+    session: Session = Depends(get_session),
+):
+    """Get all public (approved) providers.
 
-@router.get("/providers")
-async def get_providers(session: Session = Depends(get_session)):
-    """Get all public (approved) providers."""
-    statement = select(Provider).where(Provider.status == ProviderStatus.approved)
-    providers = session.exec(statement).all()
-    return providers
+    The schema is that of the default, unpaginated rows.
+    """
+    return NegotiatedResponse(
+        list_public_providers(
+            session,
+            is_official,
+            order_by,
+            limit,
+            cursor,
+            include_total,
+            fields,
+            response_format,
+        )
+    )
 
 
 @router.get("/public-settings")
@@ -0,0 +1,289 @@
+from typing import List, Optional
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field as PydanticField
+from app.http_compression import uncompressed
+from app.responses import dumps
+
+router = APIRouter(prefix="/api/estimate", tags=["estimate"])
+
+
+class ModelShare(BaseModel):
+    standard_model_id: int
+    share: float = PydanticField(gt=0)
+
+
+class WorkloadIn(BaseModel):
+    input_tokens: float = PydanticField(ge=0, description="Input tokens per month")
+    output_tokens: float = PydanticField(ge=0, description="Output tokens per month")
+    cache_hit_ratio: float = PydanticField(0.0, ge=0, le=1)
+    output_cache_hit_ratio: float = PydanticField(0.0, ge=0, le=1)
+    # With a mix, providers are ranked on serving every model in it
+    models: Optional[List[ModelShare]] = None
+    standard_model_ids: Optional[List[int]] = None
+    uptime_weight: float = PydanticField(0.0, ge=0, le=1)
+    score_weight: float = PydanticField(0.0, ge=0, le=1)
+    min_uptime: Optional[float] = PydanticField(None, ge=0, le=100)
+    target_currency: str = "USD"
+    limit: int = PydanticField(20, ge=1, le=200)
+
+
+@router.post("/workload")
+async def estimate_workload(workload_in: WorkloadIn):
+    """Monthly cost of a workload at every provider, cheapest first.
+
+    Served entirely from the in-memory price table; ``rank_score`` is the
+    cost after the optional uptime/rating weighting and decides the order.
+    """
+    from app.services.price_table import get_price_table
+    from app.services.workload import (
+        Workload,
+        rank_combinations,
+        rank_providers_for_mix,
+        row_costs,
+    )
+
+    table = get_price_table()
+    rate = table.rate_map.get(workload_in.target_currency)
+    if rate is None:
+        raise HTTPException(status_code=400, detail="Target currency not supported")
+
+    workload = Workload(
+        input_tokens=workload_in.input_tokens,
+        output_tokens=workload_in.output_tokens,
+        cache_hit_ratio=workload_in.cache_hit_ratio,
+        output_cache_hit_ratio=workload_in.output_cache_hit_ratio,
+    )
+    options = {
+        "uptime_weight": workload_in.uptime_weight,
+        "score_weight": workload_in.score_weight,
+        "min_uptime": workload_in.min_uptime,
+        "limit": workload_in.limit,
+    }
+
+    def line(i: int, cost: float) -> dict:
+        model_id = int(table.model_id[i])
+        return {
+            "price_id": int(table.price_id[i]),
+            "standard_model_id": model_id,
+            "model_name": table.model_names.get(model_id),
+            "provider_model_name": table.provider_model_name[i],
+            "monthly_cost": cost * rate,
+        }
+
+    if workload_in.models:
+        mix: dict[int, float] = {}
+        for item in workload_in.models:
+            mix[item.standard_model_id] = mix.get(item.standard_model_id, 0) + item.share
+        costs = row_costs(table, workload)["total"]
+        total_share = sum(mix.values())
+        results = []
+        for provider_id, total, key, rows in rank_providers_for_mix(
+            table, workload, mix, **options
+        ):
+            results.append(
+                {
+                    "provider_id": provider_id,
+                    "provider_name": table.provider_names.get(provider_id),
+                    "monthly_cost": total * rate,
+                    "rank_score": key * rate,
+                    "uptime": float(table.uptime[rows[0]]),
+                    "provider_score": float(table.score[rows[0]]),
+                    "models": [
+                        line(i, costs[i] * mix[int(table.model_id[i])] / total_share)
+                        for i in rows
+                    ],
+                }
+            )
+    else:
+        indices, costs, keys = rank_combinations(
+            table, workload, model_ids=workload_in.standard_model_ids, **options
+        )
+        results = []
+        for i in indices:
+            provider_id = int(table.provider_id[i])
+            results.append(
+                {
+                    "provider_id": provider_id,
+                    "provider_name": table.provider_names.get(provider_id),
+                    **line(i, float(costs["total"][i])),
+                    "rank_score": float(keys[i]) * rate,
+                    "uptime": float(table.uptime[i]),
+                    "provider_score": float(table.score[i]),
+                    "breakdown": {
+                        part: float(costs[part][i]) * rate
+                        for part in ("input", "cached_input", "output")
+                    },
+                }
+            )
+
+    return {
+        "currency": workload_in.target_currency,
+        "catalog_version": table.version,
+        "results": results,
+    }
+
+
+class BasketItemIn(BaseModel):
+    standard_model_id: int
+    input_tokens: float = PydanticField(ge=0)
+    output_tokens: float = PydanticField(ge=0)
+    cache_hit_ratio: float = PydanticField(0.0, ge=0, le=1)
+
+
+class BasketIn(BaseModel):
+    models: List[BasketItemIn] = PydanticField(min_length=1, max_length=200)
+    max_providers: int = PydanticField(ge=1, le=50)
+    min_uptime: Optional[float] = PydanticField(None, ge=0, le=100)
+    target_currency: str = "USD"
+
+
+@router.post("/basket")
+async def optimize_basket(basket_in: BasketIn):
+    """Cheapest assignment of the models to at most ``max_providers`` providers.
+
+    ``optimal`` is true when every provider subset was scored; larger
+    searches use a time-bounded heuristic.
+    """
+    from app.services.basket import BasketItem, get_matrices, optimize
+    from app.services.price_table import get_price_table
+
+    table = get_price_table()
+    rate = table.rate_map.get(basket_in.target_currency)
+    if rate is None:
+        raise HTTPException(status_code=400, detail="Target currency not supported")
+
+    matrices = get_matrices(table)
+    items = [
+        BasketItem(
+            standard_model_id=item.standard_model_id,
+            input_tokens=item.input_tokens,
+            output_tokens=item.output_tokens,
+            cache_hit_ratio=item.cache_hit_ratio,
+        )
+        for item in basket_in.models
+    ]
+    result = optimize(matrices, items, basket_in.max_providers, basket_in.min_uptime)
+
+    def provider(row: int) -> dict:
+        provider_id = int(matrices.provider_ids[row])
+        return {
+            "provider_id": provider_id,
+            "provider_name": table.provider_names.get(provider_id),
+        }
+
+    assignments = []
+    for pos, item in enumerate(result.items):
+        entry = {
+            "standard_model_id": item.standard_model_id,
+            "model_name": table.model_names.get(item.standard_model_id),
+        }
+        row = result.assignment.get(pos)
+        if row is not None:
+            price_row = int(matrices.price_row[row, result.columns[pos]])
+            entry.update(provider(row))
+            entry["price_id"] = int(table.price_id[price_row])
+            entry["provider_model_name"] = table.provider_model_name[price_row]
+        assignments.append(entry)
+
+    return {
+        "currency": basket_in.target_currency,
+        "total_cost": result.total_usd * rate,
+        "method": result.method,
+        "optimal": result.optimal,
+        "providers": [provider(row) for row in result.provider_rows],
+        "assignments": assignments,
+        "uncovered_models": [
+            result.items[pos].standard_model_id for pos in result.uncovered
+        ],
+        "unavailable_models": result.unavailable,
+    }
+
+
+class _DuplexStreamingResponse(StreamingResponse):
+    """Streaming response whose body iterator reads the request body.
+
+    Starlette's default, on ASGI servers older than spec 2.4, listens for a
+    disconnect by calling ``receive`` alongside the body iterator, which
+    would swallow request body messages. Here the iterator is the only
+    reader; a disconnect surfaces through ``request.stream()`` instead.
+    """
+
+    async def __call__(self, scope, receive, send):
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
+
+
+@router.post("/usage")
+@uncompressed
+async def cost_usage(
+    request: Request,
+    currency: str = Query("USD", description="Currency of the running aggregates"),
+    at_event_time: bool = Query(
+        False, description="Price each event as of its ts, from the price history"
+    ),
+):
+    """Cost a streamed NDJSON body of usage events, streaming NDJSON back.
+
+    Each event becomes one ``cost`` line (in the event's own ``currency``,
+    with the running total in ``currency``) or an ``error`` line; a final
+    ``summary`` line holds the totals per price. Events are matched on
+    ``provider_id`` and ``model`` (the provider's model name) and priced in
+    chunks against the in-memory price table.
+    """
+    from app.database import engine
+    from app.services.price_lookup import get_index
+    from app.services.price_table import get_price_table
+    from app.services.usage_costs import (
+        MAX_CHUNK_EVENTS,
+        HistoricalPrices,
+        UsageTotals,
+        cost_lines,
+        parse_chunk,
+        price_chunk,
+    )
+    from sqlmodel import Session
+
+    table = get_price_table()
+    rate = table.rate_map.get(currency)
+    if rate is None:
+        raise HTTPException(status_code=400, detail="Target currency not supported")
+    index_rows = get_index(table).rows
+    history = HistoricalPrices(lambda: Session(engine)) if at_event_time else None
+
+    async def body():
+        totals = UsageTotals(table)
+        seq, running, buffer = 0, 0.0, b""
+
+        def process(lines):
+            nonlocal seq, running
+            chunk = parse_chunk(lines, index_rows, currency, table.rate_map, at_event_time)
+            cost_usd = price_chunk(table, chunk, history)
+            totals.add(chunk, cost_usd)
+            out, running = cost_lines(table, chunk, cost_usd, rate, seq, running)
+            seq += len(lines)
+            return "\n".join(out) + "\n"
+
+        async for data in request.stream():
+            buffer += data
+            *complete, buffer = buffer.split(b"\n")
+            complete = [line for line in complete if line.strip()]
+            for start in range(0, len(complete), MAX_CHUNK_EVENTS):
+                yield process(complete[start : start + MAX_CHUNK_EVENTS])
+        if buffer.strip():
+            yield process([buffer])
+
+        summary = {
+            "type": "summary",
+            "currency": currency,
+            "catalog_version": table.version,
+            "events": totals.events,
+            "priced": totals.events - totals.unmatched,
+            "unmatched": totals.unmatched,
+            "total": totals.cost_usd * rate,
+            "by_price": totals.by_price(rate),
+        }
+        yield dumps(summary).decode() + "\n"
+
+    return _DuplexStreamingResponse(body(), media_type="application/x-ndjson")
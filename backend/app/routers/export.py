@@ -0,0 +1,213 @@
+"""Bulk export of the public price catalog.
+
+Rows are read through a server-side cursor in fixed-size batches and encoded
+batch by batch, so memory stays flat however large the catalog grows.
+Parquet output needs ``pyarrow`` (in requirements.txt); installs without it
+answer ``format=parquet`` with 400.
+"""
+
+import csv
+import io
+import zlib
+from datetime import datetime
+from enum import Enum
+from typing import Iterator, Optional
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy import types as sqltypes
+from sqlmodel import Session, or_, select
+from app.database import engine
+from app.models import ModelPrice, PriceStatus, Provider, ProviderStatus, StandardModel
+from app.responses import dumps
+
+router = APIRouter(prefix="/api/export", tags=["export"])
+
+BATCH_SIZE = 2000
+
+EXPORT_COLUMNS = (
+    ("price_id", ModelPrice.id),
+    ("standard_model_id", ModelPrice.standard_model_id),
+    ("model_name", StandardModel.name),
+    ("vendor", StandardModel.vendor),
+    ("provider_id", ModelPrice.provider_id),
+    ("provider_name", Provider.name),
+    ("provider_model_name", ModelPrice.provider_model_name),
+    ("currency", ModelPrice.currency),
+    ("input_price", ModelPrice.input_price),
+    ("output_price", ModelPrice.output_price),
+    ("cache_hit_input_price", ModelPrice.cache_hit_input_price),
+    ("cache_hit_output_price", ModelPrice.cache_hit_output_price),
+    ("input_price_usd", ModelPrice.input_price_usd),
+    ("output_price_usd", ModelPrice.output_price_usd),
+    ("cache_hit_input_price_usd", ModelPrice.cache_hit_input_price_usd),
+    ("cache_hit_output_price_usd", ModelPrice.cache_hit_output_price_usd),
+    ("verified_at", ModelPrice.verified_at),
+    ("created_at", ModelPrice.created_at),
+)
+FIELD_NAMES = [name for name, _ in EXPORT_COLUMNS]
+
+
+class ExportFormat(str, Enum):
+    ndjson = "ndjson"
+    csv = "csv"
+    parquet = "parquet"
+
+
+MEDIA_TYPES = {
+    ExportFormat.ndjson: "application/x-ndjson",
+    ExportFormat.csv: "text/csv",
+    ExportFormat.parquet: "application/vnd.apache.parquet",
+}
+
+
+def _export_statement(since: Optional[datetime]):
+    statement = (
+        select(*(column for _, column in EXPORT_COLUMNS))
+        .join(Provider, ModelPrice.provider_id == Provider.id)
+        .join(StandardModel, ModelPrice.standard_model_id == StandardModel.id)
+        .where(
+            ModelPrice.status == PriceStatus.active,
+            or_(
+                Provider.status == ProviderStatus.approved, Provider.is_official == True
+            ),
+        )
+        .order_by(ModelPrice.id)
+    )
+    if since is not None:
+        statement = statement.where(
+            or_(ModelPrice.verified_at >= since, ModelPrice.created_at >= since)
+        )
+    return statement
+
+
+def _batches(since: Optional[datetime]) -> Iterator[list]:
+    # Runs inside the streaming response, after the request has returned
+    with Session(engine) as session:
+        result = session.exec(
+            _export_statement(since).execution_options(yield_per=BATCH_SIZE)
+        )
+        for batch in result.partitions(BATCH_SIZE):
+            yield batch
+
+
+def _json_value(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def _ndjson_chunks(batches) -> Iterator[bytes]:
+    for batch in batches:
+        # Same encoder (and datetime format) as the JSON API responses
+        yield b"".join(dumps(dict(zip(FIELD_NAMES, row))) + b"\n" for row in batch)
+
+
+def _csv_chunks(batches) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(FIELD_NAMES)
+    for batch in batches:
+        writer.writerows([_json_value(v) for v in row] for row in batch)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+class _DrainableSink(io.RawIOBase):
+    """Write-only file object whose contents are handed out as they arrive."""
+
+    def __init__(self):
+        self._chunks: list[bytes] = []
+        self._position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        chunk = bytes(data)
+        self._chunks.append(chunk)
+        self._position += len(chunk)
+        return len(chunk)
+
+    def tell(self):
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _parquet_chunks(batches) -> Iterator[bytes]:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    def arrow_type(sql_type):
+        if isinstance(sql_type, sqltypes.Integer):
+            return pa.int64()
+        if isinstance(sql_type, sqltypes.Float):
+            return pa.float64()
+        if isinstance(sql_type, sqltypes.DateTime):
+            return pa.timestamp("us")
+        return pa.string()
+
+    schema = pa.schema(
+        [(name, arrow_type(column.type)) for name, column in EXPORT_COLUMNS]
+    )
+    sink = _DrainableSink()
+    with pq.ParquetWriter(sink, schema) as writer:
+        for batch in batches:
+            # One row group per batch
+            columns = [
+                pa.array(values, type=field.type)
+                for values, field in zip(zip(*batch), schema)
+            ]
+            writer.write_table(pa.Table.from_arrays(columns, schema=schema))
+            yield sink.drain()
+    yield sink.drain()
+
+
+def _gzipped(chunks: Iterator[bytes]) -> Iterator[bytes]:
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+@router.get("/prices")
+async def export_prices(
+    format: ExportFormat = ExportFormat.ndjson,
+    since: Optional[datetime] = Query(
+        None, description="Only prices verified or created at or after this time"
+    ),
+    gzip: bool = False,
+):
+    """Stream every active public price joined with its provider and model."""
+    encoders = {
+        ExportFormat.ndjson: _ndjson_chunks,
+        ExportFormat.csv: _csv_chunks,
+        ExportFormat.parquet: _parquet_chunks,
+    }
+    if format == ExportFormat.parquet:
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            raise HTTPException(
+                status_code=400, detail="Parquet export is not available on this server"
+            )
+
+    chunks = encoders[format](_batches(since))
+    filename = f"prices.{format.value}"
+    media_type = MEDIA_TYPES[format]
+    if gzip:
+        chunks = _gzipped(chunks)
+        filename += ".gz"
+        media_type = "application/gzip"
+
+    return StreamingResponse(
+        chunks,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
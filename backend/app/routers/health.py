@@ -0,0 +1,35 @@
+from fastapi import APIRouter, Depends
+from fastapi.responses import JSONResponse
+from app import http_timing
+from app.auth import get_current_admin
+from app.services import readiness
+
+router = APIRouter(tags=["health"])
+
+
+@router.get("/healthz")
+def healthz():
+    """Liveness: the process is up. Always 200, with the current report."""
+    return {"status": "ok", **readiness.report()}
+
+
+@router.get("/readyz")
+def readyz():
+    """Readiness: DB reachable, warmup finished without required failures and scheduler running."""
+    report = readiness.report()
+    ready = (
+        report["database"]
+        and report["cache_warm"]
+        and not report["blocking_warmups"]
+        and report["scheduler"] == "running"
+    )
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={"status": "ready" if ready else "not_ready", **report},
+    )
+
+
+@router.get("/metrics", dependencies=[Depends(get_current_admin)])
+def metrics():
+    """Request timings per route since start, serialization time separately (admins only)."""
+    return {"routes": http_timing.snapshot()}
@@ -0,0 +1,106 @@
+from datetime import datetime
+from enum import Enum
+from itertools import groupby
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlmodel import Session, or_, select
+from app.database import get_session
+from app.models import PriceHistory, Provider, ProviderStatus
+from app.services.price_history import lttb_indices, minmax_indices
+from app.services.pricing import from_usd, load_rate_map
+
+router = APIRouter(prefix="/api/history", tags=["history"])
+
+MAX_POINTS = 2000
+
+
+class Downsample(str, Enum):
+    lttb = "lttb"
+    minmax = "minmax"
+    none = "none"
+
+
+@router.get("/prices")
+async def price_history(
+    standard_model_id: Optional[int] = None,
+    provider_id: Optional[int] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    points: int = Query(500, ge=3, le=MAX_POINTS, description="Points per series"),
+    method: Downsample = Downsample.lttb,
+    metric: str = Query("input", pattern="^(input|output)$"),
+    target_currency: str = Query("USD"),
+    session: Session = Depends(get_session),
+):
+    """Price series per (model, provider) pair, downsampled to ``points``.
+
+    ``metric`` selects which price drives the downsampling; both prices are
+    returned for every kept point.
+    """
+    if standard_model_id is None and provider_id is None:
+        raise HTTPException(
+            status_code=400, detail="standard_model_id or provider_id is required"
+        )
+    rate_map = load_rate_map(session)
+    if target_currency not in rate_map:
+        raise HTTPException(status_code=400, detail="Target currency not supported")
+
+    statement = (
+        select(
+            PriceHistory.standard_model_id,
+            PriceHistory.provider_id,
+            PriceHistory.ts,
+            PriceHistory.event,
+            PriceHistory.input_price_usd,
+            PriceHistory.output_price_usd,
+        )
+        .join(Provider, PriceHistory.provider_id == Provider.id)
+        .where(
+            PriceHistory.input_price_usd.is_not(None),
+            or_(
+                Provider.status == ProviderStatus.approved, Provider.is_official == True
+            ),
+        )
+        .order_by(
+            PriceHistory.standard_model_id, PriceHistory.provider_id, PriceHistory.ts
+        )
+    )
+    if standard_model_id is not None:
+        statement = statement.where(PriceHistory.standard_model_id == standard_model_id)
+    if provider_id is not None:
+        statement = statement.where(PriceHistory.provider_id == provider_id)
+    if start is not None:
+        statement = statement.where(PriceHistory.ts >= start)
+    if end is not None:
+        statement = statement.where(PriceHistory.ts <= end)
+
+    series = []
+    rows = session.exec(statement).all()
+    for (model_id, pid), group in groupby(rows, key=lambda row: (row[0], row[1])):
+        group = list(group)
+        ys = [row[4] if metric == "input" else row[5] for row in group]
+        if method == Downsample.lttb:
+            kept = lttb_indices([row[2].timestamp() for row in group], ys, points)
+        elif method == Downsample.minmax:
+            kept = minmax_indices(ys, points)
+        else:
+            kept = range(len(group))
+
+        series.append(
+            {
+                "standard_model_id": model_id,
+                "provider_id": pid,
+                "total_points": len(group),
+                "points": [
+                    {
+                        "ts": group[i][2].isoformat(),
+                        "event": group[i][3],
+                        "price_in": from_usd(group[i][4], target_currency, rate_map),
+                        "price_out": from_usd(group[i][5], target_currency, rate_map),
+                    }
+                    for i in kept
+                ],
+            }
+        )
+
+    return {"currency": target_currency, "series": series}
@@ -0,0 +1,47 @@
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from app.services import live
+from app.http_compression import uncompressed
+
+router = APIRouter(prefix="/api/live", tags=["live"])
+
+MAX_FILTER_ITEMS = 200
+
+
+def _parse_filter(raw: Optional[str], convert) -> Optional[frozenset]:
+    if not raw:
+        return None
+    try:
+        values = frozenset(convert(part.strip()) for part in raw.split(",") if part.strip())
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid filter value")
+    if len(values) > MAX_FILTER_ITEMS:
+        raise HTTPException(
+            status_code=400, detail=f"At most {MAX_FILTER_ITEMS} values per filter"
+        )
+    return values or None
+
+
+@router.get("/prices")
+@uncompressed
+async def live_prices(
+    model_ids: Optional[str] = Query(None, description="Comma-separated model ids"),
+    currencies: Optional[str] = Query(None, description="Comma-separated currency codes"),
+):
+    """Server-Sent Events stream of catalog changes.
+
+    Each ``changes`` event carries a JSON list of upserts and deletes in the
+    ``/api/changes`` format, its ``id`` being the change-log cursor. Filters
+    narrow price, model and rate changes; provider changes are always sent.
+    An ``evicted`` event means the client fell behind and should reload.
+    """
+    subscriber = live.hub.subscribe(
+        _parse_filter(model_ids, int), _parse_filter(currencies, str.upper)
+    )
+    live.ensure_poller()
+    return StreamingResponse(
+        live.stream(subscriber),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
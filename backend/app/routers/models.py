@@ -1,16 +1,139 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlmodel import Session, select
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from pydantic import BaseModel
+from sqlmodel import Session
 from app.database import get_session
 from app.models import StandardModel, User
 from app.auth import get_current_admin
+from app.services.catalog import bump_version
+from app.pagination import (
+    MAX_PAGE_SIZE,
+    estimate_total,
+    page_response,
+    paginate,
+    parse_order_by,
+)
+from app.projection import (
+    ResponseFormat,
+    parse_fields,
+    project_rows,
+    projected_select,
+    render_rows,
+)
+from app.responses import NegotiatedResponse
 
 router = APIRouter(prefix="/api/models", tags=["models"])
 
+MODEL_ORDERINGS = {
+    "id": StandardModel.id,
+    "name": StandardModel.name,
+    "popularity_score": StandardModel.popularity_score,
+}
 
-@router.get("")
-async def get_models(session: Session = Depends(get_session)):
-    models = session.exec(select(StandardModel)).all()
-    return models
+
+class ModelOut(BaseModel):
+    """A row of the model listing, read straight from the selected columns."""
+
+    id: int
+    name: str
+    vendor: Optional[str] = None
+    official_currency: str
+    official_input_price: Optional[float] = None
+    official_output_price: Optional[float] = None
+    is_featured: bool
+    rank_hint: Optional[int] = None
+    # Stored as a decayed float; listed as a whole number
+    popularity_score: int
+
+
+MODEL_FIELDS = {name: getattr(StandardModel, name) for name in ModelOut.model_fields}
+MODEL_CONVERTERS = {"popularity_score": round}
+
+# Dictionary-encoded field groups of the columnar listing
+MODEL_DICTIONARIES = {
+    "vendor": ("vendor",),
+    "currency": ("official_currency",),
+}
+
+
+def list_standard_models(
+    session: Session,
+    vendor: Optional[str] = None,
+    is_featured: Optional[bool] = None,
+    order_by: Optional[str] = None,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    include_total: bool = False,
+    fields: Optional[str] = None,
+    response_format: ResponseFormat = ResponseFormat.rows,
+):
+    """Filtered, SQL-ordered model listing; paginated when limit or cursor is set.
+
+    Only the ``ModelOut`` columns (or the requested ``fields``) are selected,
+    and rows are returned as plain dicts or a columnar document.
+    """
+    ordering = parse_order_by(order_by, MODEL_ORDERINGS, StandardModel.id, "id")
+    names = parse_fields(fields, MODEL_FIELDS)
+    statement = projected_select(
+        MODEL_FIELDS, names, [expr for expr, _ in ordering.columns]
+    )
+    if vendor is not None:
+        statement = statement.where(StandardModel.vendor == vendor)
+    if is_featured is not None:
+        statement = statement.where(StandardModel.is_featured == is_featured)
+
+    if limit is None and cursor is None:
+        models = session.exec(statement.order_by(*ordering.order_clauses())).all()
+        return render_rows(
+            names, project_rows(models, names, MODEL_CONVERTERS), response_format, MODEL_DICTIONARIES
+        )
+
+    models, next_cursor = paginate(
+        session, statement, ordering, limit or MAX_PAGE_SIZE, cursor
+    )
+    models = render_rows(
+        names, project_rows(models, names, MODEL_CONVERTERS), response_format, MODEL_DICTIONARIES
+    )
+    total = None
+    if include_total:
+        total = estimate_total(session, statement, ("models", vendor, is_featured))
+    return page_response(models, next_cursor, total)
+
+
+@router.get("", response_model=List[ModelOut])
+async def get_models(
+    vendor: Optional[str] = None,
+    is_featured: Optional[bool] = None,
+    order_by: Optional[str] = Query(
+        None, description="id, name or popularity_score; prefix - for descending"
+    ),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    include_total: bool = False,
+    fields: Optional[str] = Query(
+        None, description="Comma-separated fields to return; only these are loaded"
+    ),
+    response_format: ResponseFormat = Query(
+        ResponseFormat.rows,
+        alias="format",
+        description="columnar: parallel arrays, vendor and currency dictionary-encoded",
+    ),
+    session: Session = Depends(get_session),
+):
+    """Standard models; the schema is that of the default, unpaginated rows."""
+    return NegotiatedResponse(
+        list_standard_models(
+            session,
+            vendor,
+            is_featured,
+            order_by,
+            limit,
+            cursor,
+            include_total,
+            fields,
+            response_format,
+        )
+    )
 
 
 @router.post("")
@@ -20,6 +143,7 @@ async def create_model(
     current_user: User = Depends(get_current_admin),
 ):
     session.add(model)
+    bump_version(session)
     session.commit()
     session.refresh(model)
     return model
@@ -39,5 +163,6 @@ async def update_model(
     existing.name = model_data.name
     existing.vendor = model_data.vendor
     session.add(existing)
+    bump_version(session)
     session.commit()
     return existing
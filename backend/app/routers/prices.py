@@ -1,10 +1,10 @@
 import shutil
 import os
+from itertools import groupby
 from app.auth import get_current_user
 from app.models import (
     ModelPrice,
     Provider,
-    CurrencyRate,
     StandardModel,
     PriceStatus,
     User,
@@ -13,29 +13,40 @@ from app.models import (
 )
 from typing import Optional, List
 from fastapi import APIRouter, Depends, UploadFile, File, Form, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from sqlmodel import Session, select, desc, or_
-from app.database import get_session
+from app.database import engine, get_session
+from app.pagination import (
+    MAX_PAGE_SIZE,
+    estimate_total,
+    page_response,
+    paginate,
+    parse_order_by,
+)
+from app.projection import (
+    ResponseFormat,
+    parse_fields,
+    project_rows,
+    projected_select,
+    render_rows,
+)
+from app.responses import NegotiatedResponse, dumps, wants_msgpack
+from app.routers.models import ModelOut, list_standard_models
+from app.services import popularity
+from app.services.catalog import bump_version
+from app.services.price_history import record_price_event
+from app.services.pricing import apply_usd_prices, convert, from_usd, load_rate_map
+from app.services.webhooks import enqueue_price_events
 from datetime import datetime
 from pydantic import BaseModel, Field as PydanticField
 
-# Helpers
-def _rate_map(session: Session) -> dict[str, float]:
-    rates = session.exec(select(CurrencyRate)).all()
-    rate_map = {r.code: r.rate_to_usd for r in rates}
-    rate_map["USD"] = 1.0
-    return rate_map
-
-
-def _convert(amount: Optional[float], src: str, target: str, rate_map: dict[str, float]) -> Optional[float]:
-    if amount is None:
-        return None
-    if src not in rate_map or target not in rate_map:
-        return None
-    usd = amount / rate_map[src]
-    return usd * rate_map[target]
-
 router = APIRouter(prefix="/api/prices", tags=["prices"])
 
+# Multi-model compares over more models than this are streamed
+COMPARE_STREAM_THRESHOLD = 50
+MAX_COMPARE_MODELS = 500
+MAX_LOOKUP_ITEMS = 10000
+
 UPLOAD_DIR = "static/uploads"
 os.makedirs(UPLOAD_DIR, exist_ok=True)
 
@@ -219,6 +230,7 @@ async def submit_price(
         proof_img_path=proof_img_path,
         status=PriceStatus.pending,
     )
+    apply_usd_prices(price_record, load_rate_map(session))
 
     session.add(price_record)
     session.commit()
@@ -275,6 +287,7 @@ async def submit_price_batch(
         raise HTTPException(status_code=400, detail="Provider ID or name required")
 
     created_prices: list[int] = []
+    rate_map = load_rate_map(session)
 
     for entry in payload.prices:
         # Resolve model
@@ -295,6 +308,7 @@ async def submit_price_batch(
                     vendor=entry.new_model_vendor,
                 )
                 session.add(model)
+                bump_version(session)
                 session.commit()
                 session.refresh(model)
         else:
@@ -316,6 +330,7 @@ async def submit_price_batch(
             proof_content=entry.proof_content,
             status=PriceStatus.pending,
         )
+        apply_usd_prices(price_record, rate_map)
         session.add(price_record)
         session.commit()
         session.refresh(price_record)
@@ -329,62 +344,296 @@ async def submit_price_batch(
     }
 
 
-@router.get("/compare/{standard_model_id}")
-async def compare_prices(
-    standard_model_id: int,
-    target_currency: str = Query("USD"),
-    session: Session = Depends(get_session),
-):
-    """Compare prices across providers for a model."""
-    rate_map = _rate_map(session)
-
+def _check_target_currency(target_currency: str, rate_map: dict[str, float]):
     if target_currency not in rate_map:
         raise HTTPException(status_code=400, detail="Target currency not supported")
 
-    # Only show approved providers
+
+def _comparable_prices(currency: Optional[str] = None, query=None):
+    """Active prices from public providers that have a known USD value.
+
+    Prices quoted in a currency without an exchange rate cannot be compared
+    and are left out. ``query`` replaces the default ``(ModelPrice,
+    Provider)`` select, e.g. with a column projection.
+    """
+    if query is None:
+        query = select(ModelPrice, Provider)
     query = (
-        select(ModelPrice, Provider)
-        .join(Provider)
+        query.select_from(ModelPrice)
+        .join(Provider, ModelPrice.provider_id == Provider.id)
         .where(
-            ModelPrice.standard_model_id == standard_model_id,
             ModelPrice.status == PriceStatus.active,
+            ModelPrice.input_price_usd.is_not(None),
             or_(
                 Provider.status == ProviderStatus.approved, Provider.is_official == True
             ),
         )
     )
-    results = session.exec(query).all()
+    if currency:
+        query = query.where(ModelPrice.currency == currency)
+    return query
 
-    response = []
-    for price, provider in results:
-        final_in = _convert(price.input_price, price.currency, target_currency, rate_map)
-        final_out = _convert(price.output_price, price.currency, target_currency, rate_map)
-        final_cache_in = _convert(price.cache_hit_input_price, price.currency, target_currency, rate_map)
-        final_cache_out = _convert(price.cache_hit_output_price, price.currency, target_currency, rate_map)
 
-        response.append(
-            {
-                "provider_id": provider.id,
-                "provider_name": provider.name,
-                "provider_model_name": price.provider_model_name,
-                "provider_score": provider.avg_score,
-                "uptime": provider.uptime_rate,
-                "original_currency": price.currency,
-                "price_in": final_in,
-                "price_out": final_out,
-                "cache_hit_input_price": final_cache_in,
-                "cache_hit_output_price": final_cache_out,
-                "verified_at": (
-                    price.verified_at.isoformat() if price.verified_at else None
-                ),
-                "proof_type": price.proof_type,
-                "proof_content": price.proof_content,
-                "proof": price.proof_img_path,
-            }
+def _comparison_row(
+    price: ModelPrice, provider: Provider, target_currency: str, rate_map: dict[str, float]
+) -> dict:
+    return {
+        "provider_id": provider.id,
+        "provider_name": provider.name,
+        "provider_model_name": price.provider_model_name,
+        "provider_score": provider.avg_score,
+        "uptime": provider.uptime_rate,
+        "original_currency": price.currency,
+        "price_in": from_usd(price.input_price_usd, target_currency, rate_map),
+        "price_out": from_usd(price.output_price_usd, target_currency, rate_map),
+        "cache_hit_input_price": from_usd(
+            price.cache_hit_input_price_usd, target_currency, rate_map
+        ),
+        "cache_hit_output_price": from_usd(
+            price.cache_hit_output_price_usd, target_currency, rate_map
+        ),
+        "verified_at": price.verified_at.isoformat() if price.verified_at else None,
+        "proof_type": price.proof_type,
+        "proof_content": price.proof_content,
+        "proof": price.proof_img_path,
+    }
+
+
+class ComparisonOut(BaseModel):
+    """A row of a single-model comparison; prices are in the target currency."""
+
+    provider_id: int
+    provider_name: str
+    provider_model_name: Optional[str] = None
+    provider_score: float
+    uptime: float
+    original_currency: str
+    price_in: Optional[float] = None
+    price_out: Optional[float] = None
+    cache_hit_input_price: Optional[float] = None
+    cache_hit_output_price: Optional[float] = None
+    verified_at: Optional[str] = None
+    proof_type: Optional[str] = None
+    proof_content: Optional[str] = None
+    proof: Optional[str] = None
+
+
+# ComparisonOut fields, as the columns they are selected from
+COMPARE_FIELDS = {
+    "provider_id": Provider.id,
+    "provider_name": Provider.name,
+    "provider_model_name": ModelPrice.provider_model_name,
+    "provider_score": Provider.avg_score,
+    "uptime": Provider.uptime_rate,
+    "original_currency": ModelPrice.currency,
+    "price_in": ModelPrice.input_price_usd,
+    "price_out": ModelPrice.output_price_usd,
+    "cache_hit_input_price": ModelPrice.cache_hit_input_price_usd,
+    "cache_hit_output_price": ModelPrice.cache_hit_output_price_usd,
+    "verified_at": ModelPrice.verified_at,
+    "proof_type": ModelPrice.proof_type,
+    "proof_content": ModelPrice.proof_content,
+    "proof": ModelPrice.proof_img_path,
+}
+
+# Dictionary-encoded field groups of the columnar comparison
+COMPARE_DICTIONARIES = {
+    "provider": ("provider_id", "provider_name", "provider_score", "uptime"),
+    "currency": ("original_currency",),
+}
+
+
+def _comparison_converters(target_currency: str, rate_map: dict[str, float]) -> dict:
+    def price(value):
+        return from_usd(value, target_currency, rate_map)
+
+    return {
+        "price_in": price,
+        "price_out": price,
+        "cache_hit_input_price": price,
+        "cache_hit_output_price": price,
+        "verified_at": lambda value: value.isoformat() if value else None,
+    }
+
+
+# Sort keys for compare_prices. Prices are compared through their stored USD
+# columns, which the (model, status, price_usd) indexes serve directly.
+COMPARE_ORDERINGS = {
+    "price_in": ModelPrice.input_price_usd,
+    "price_out": ModelPrice.output_price_usd,
+    "uptime": Provider.uptime_rate,
+    "score": Provider.avg_score,
+}
+
+
+@router.get("/compare/{standard_model_id}", response_model=List[ComparisonOut])
+async def compare_prices(
+    standard_model_id: int,
+    target_currency: str = Query("USD"),
+    currency: Optional[str] = Query(
+        None, description="Only prices quoted in this currency"
+    ),
+    provider_id: Optional[int] = None,
+    min_price_in: Optional[float] = Query(None, description="In target_currency"),
+    max_price_in: Optional[float] = Query(None, description="In target_currency"),
+    order_by: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    include_total: bool = False,
+    fields: Optional[str] = Query(
+        None, description="Comma-separated fields to return; only these are loaded"
+    ),
+    response_format: ResponseFormat = Query(
+        ResponseFormat.rows,
+        alias="format",
+        description="columnar: parallel arrays, provider and currency dictionary-encoded",
+    ),
+    session: Session = Depends(get_session),
+):
+    """Compare prices across providers for a model.
+
+    The schema is that of the default, unpaginated rows; ``fields`` narrows
+    them and ``format=columnar`` returns them as parallel arrays.
+    """
+    popularity.record_view(standard_model_id)
+    rate_map = load_rate_map(session)
+    _check_target_currency(target_currency, rate_map)
+
+    ordering = parse_order_by(order_by, COMPARE_ORDERINGS, ModelPrice.id, "price_in")
+    names = parse_fields(fields, COMPARE_FIELDS)
+    # The id and sort key are selected too, for building the next cursor
+    base = projected_select(COMPARE_FIELDS, names).add_columns(
+        ModelPrice.id.label("_id"), ordering.columns[0][0].label("_sort")
+    )
+
+    query = _comparable_prices(currency, base).where(
+        ModelPrice.standard_model_id == standard_model_id
+    )
+    if provider_id is not None:
+        query = query.where(ModelPrice.provider_id == provider_id)
+    if min_price_in is not None:
+        query = query.where(
+            ModelPrice.input_price_usd >= min_price_in / rate_map[target_currency]
+        )
+    if max_price_in is not None:
+        query = query.where(
+            ModelPrice.input_price_usd <= max_price_in / rate_map[target_currency]
         )
 
-    response.sort(key=lambda x: x["price_in"])
-    return response
+    if limit is None and cursor is None:
+        results = session.exec(query.order_by(*ordering.order_clauses())).all()
+        next_cursor = None
+    else:
+        results, next_cursor = paginate(
+            session,
+            query,
+            ordering,
+            limit or MAX_PAGE_SIZE,
+            cursor,
+            lambda row: (row._sort, row._id),
+        )
+
+    response = render_rows(
+        names,
+        project_rows(results, names, _comparison_converters(target_currency, rate_map)),
+        response_format,
+        COMPARE_DICTIONARIES,
+    )
+    if limit is None and cursor is None:
+        return NegotiatedResponse(response)
+    total = None
+    if include_total:
+        total = estimate_total(
+            session,
+            query,
+            (
+                "compare",
+                standard_model_id,
+                currency,
+                provider_id,
+                target_currency,
+                min_price_in,
+                max_price_in,
+            ),
+        )
+    return NegotiatedResponse(page_response(response, next_cursor, total))
+
+
+def _parse_model_ids(model_ids: str) -> Optional[list[int]]:
+    """``all`` -> None, otherwise a de-duplicated list of ids."""
+    if model_ids.strip().lower() == "all":
+        return None
+    try:
+        ids = sorted({int(part) for part in model_ids.split(",") if part.strip()})
+    except ValueError:
+        raise HTTPException(status_code=400, detail="model_ids must be integers or 'all'")
+    if not ids:
+        raise HTTPException(status_code=400, detail="model_ids is required")
+    if len(ids) > MAX_COMPARE_MODELS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {MAX_COMPARE_MODELS} model ids; use model_ids=all",
+        )
+    return ids
+
+
+def _grouped_comparisons(rows, target_currency: str, rate_map: dict[str, float]):
+    for model_id, group in groupby(rows, key=lambda row: row[0].standard_model_id):
+        yield {
+            "standard_model_id": model_id,
+            "prices": [
+                _comparison_row(price, provider, target_currency, rate_map)
+                for price, provider in group
+            ],
+        }
+
+
+def _stream_comparisons(statement, target_currency: str, rate_map: dict[str, float]):
+    # Runs after the request-scoped session is gone, so it opens its own
+    with Session(engine) as session:
+        rows = session.exec(statement.execution_options(yield_per=500))
+        yield b"["
+        # Same encoder as the non-streamed response, so both are byte-identical
+        for i, group in enumerate(_grouped_comparisons(rows, target_currency, rate_map)):
+            yield (b"," if i else b"") + dumps(group)
+        yield b"]"
+
+
+@router.get("/compare")
+async def compare_many(
+    model_ids: str = Query(..., description="Comma-separated model ids, or 'all'"),
+    target_currency: str = Query("USD"),
+    currency: Optional[str] = Query(
+        None, description="Only prices quoted in this currency"
+    ),
+    session: Session = Depends(get_session),
+):
+    """Compare prices for several models in one query.
+
+    Returns one ``{standard_model_id, prices}`` group per model that has
+    comparable prices, each sorted by input price like ``/compare/{id}``.
+    Large JSON requests (and ``model_ids=all``) are streamed.
+    """
+    ids = _parse_model_ids(model_ids)
+    rate_map = load_rate_map(session)
+    _check_target_currency(target_currency, rate_map)
+
+    statement = _comparable_prices(currency).order_by(
+        ModelPrice.standard_model_id, ModelPrice.input_price_usd, ModelPrice.id
+    )
+    if ids is not None:
+        statement = statement.where(ModelPrice.standard_model_id.in_(ids))
+        for model_id in ids:
+            popularity.record_view(model_id)
+
+    # MessagePack needs the array length up front, so it is never streamed
+    if (ids is None or len(ids) > COMPARE_STREAM_THRESHOLD) and not wants_msgpack():
+        return StreamingResponse(
+            _stream_comparisons(statement, target_currency, rate_map),
+            media_type="application/json",
+        )
+    rows = session.exec(statement).all()
+    return list(_grouped_comparisons(rows, target_currency, rate_map))
 
 
 @router.get("/highlights")
@@ -395,7 +644,7 @@ async def price_highlights(
 ):
     """Return top N featured/default models with official, platform avg, and lowest provider info."""
 
-    rate_map = _rate_map(session)
+    rate_map = load_rate_map(session)
     if target_currency not in rate_map:
         raise HTTPException(status_code=400, detail="Target currency not supported")
 
@@ -415,8 +664,8 @@ async def price_highlights(
     payload = []
     for model in models:
         # Official price from model fields
-        official_in = _convert(model.official_input_price, model.official_currency, target_currency, rate_map)
-        official_out = _convert(model.official_output_price, model.official_currency, target_currency, rate_map)
+        official_in = convert(model.official_input_price, model.official_currency, target_currency, rate_map)
+        official_out = convert(model.official_output_price, model.official_currency, target_currency, rate_map)
 
         # Prices from providers
         price_stmt = (
@@ -436,8 +685,8 @@ async def price_highlights(
         platform_prices: list[dict] = []
         lowest = None
         for price, provider in price_rows:
-            pin = _convert(price.input_price, price.currency, target_currency, rate_map)
-            pout = _convert(price.output_price, price.currency, target_currency, rate_map)
+            pin = from_usd(price.input_price_usd, target_currency, rate_map)
+            pout = from_usd(price.output_price_usd, target_currency, rate_map)
             if pin is None or pout is None:
                 continue
             platform_prices.append({"in": pin, "out": pout})
@@ -470,11 +719,22 @@ async def price_highlights(
     return payload
 
 
-@router.get("/models")
-async def list_models(session: Session = Depends(get_session)):
-    """List all standard models."""
-    models = session.exec(select(StandardModel)).all()
-    return models
+@router.get("/models", response_model=List[ModelOut])
+async def list_models(
+    vendor: Optional[str] = None,
+    is_featured: Optional[bool] = None,
+    order_by: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    include_total: bool = False,
+    session: Session = Depends(get_session),
+):
+    """List standard models (same filters and paging as /api/models)."""
+    return NegotiatedResponse(
+        list_standard_models(
+            session, vendor, is_featured, order_by, limit, cursor, include_total
+        )
+    )
 
 
 @router.post("/models/request")
@@ -512,6 +772,53 @@ async def request_new_model(
     return {"message": "Model request submitted", "request_id": request.id}
 
 
+class PriceLookupItem(BaseModel):
+    provider_id: int
+    provider_model_name: str
+
+
+class PriceLookupRequest(BaseModel):
+    items: List[PriceLookupItem] = PydanticField(max_length=MAX_LOOKUP_ITEMS)
+    target_currency: str = "USD"
+
+
+@router.post("/lookup")
+async def lookup_prices(
+    lookup_in: PriceLookupRequest, session: Session = Depends(get_session)
+):
+    """Current price for each (provider_id, provider_model_name) pair.
+
+    Results are in request order; pairs without an active comparable price
+    come back with ``price: null``. Served from the in-memory snapshot, or
+    from the database before the snapshot has been built.
+    """
+    from app.services import price_lookup
+    from app.services.price_table import peek_price_table
+
+    pairs = [(item.provider_id, item.provider_model_name) for item in lookup_in.items]
+    table = peek_price_table()
+    if table is not None:
+        rate_map = table.rate_map
+        _check_target_currency(lookup_in.target_currency, rate_map)
+        found = price_lookup.lookup_in_table(table, pairs)
+    else:
+        rate_map = load_rate_map(session)
+        _check_target_currency(lookup_in.target_currency, rate_map)
+        found = price_lookup.lookup_in_database(session, pairs)
+
+    rate = rate_map[lookup_in.target_currency]
+    results = []
+    for (provider_id, name), price in zip(pairs, found):
+        if price is not None:
+            for field in price_lookup.PRICE_FIELDS:
+                if price[field] is not None:
+                    price[field] *= rate
+        results.append(
+            {"provider_id": provider_id, "provider_model_name": name, "price": price}
+        )
+    return {"currency": lookup_in.target_currency, "results": results}
+
+
 @router.put("/{price_id}")
 async def update_price(
     price_id: int,
@@ -536,5 +843,10 @@ async def update_price(
     if "currency" in price_data:
         price.currency = price_data["currency"]
 
+    apply_usd_prices(price, load_rate_map(session))
+    if price.status == PriceStatus.active:
+        record_price_event(session, price, "updated")
+        enqueue_price_events(session, [price], "updated")
+    bump_version(session)
     session.commit()
     return {"message": "Price updated"}
@@ -0,0 +1,106 @@
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from pydantic import BaseModel, Field as PydanticField
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session, select
+from app.auth import get_current_active_user
+from app.database import get_session
+from app.models import Provider, ProviderStatus, Review, User
+from app.pagination import page_response, paginate, parse_order_by
+from app.services.ratings import (
+    get_rating_summary,
+    invalidate_rating_summary,
+    record_review_added,
+)
+
+router = APIRouter(prefix="/api/providers", tags=["reviews"])
+
+ALREADY_REVIEWED = "You have already reviewed this provider"
+
+
+class ReviewIn(BaseModel):
+    rating: int = PydanticField(ge=1, le=5)
+    comment: Optional[str] = PydanticField(default=None, max_length=2000)
+
+
+def _public_provider(session: Session, provider_id: int) -> Provider:
+    provider = session.get(Provider, provider_id)
+    if not provider or not (
+        provider.status == ProviderStatus.approved or provider.is_official
+    ):
+        raise HTTPException(status_code=404, detail="Provider not found")
+    return provider
+
+
+@router.get("/{provider_id}/reviews")
+async def list_reviews(
+    provider_id: int,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    session: Session = Depends(get_session),
+):
+    """List a provider's reviews, newest first, with keyset pagination."""
+    _public_provider(session, provider_id)
+
+    statement = select(Review).where(Review.provider_id == provider_id)
+    ordering = parse_order_by(
+        None, {"created_at": Review.created_at}, Review.id, "-created_at"
+    )
+    reviews, next_cursor = paginate(session, statement, ordering, limit, cursor)
+    return page_response(
+        [
+            {
+                "id": review.id,
+                "rating": review.rating,
+                "comment": review.comment,
+                "created_at": review.created_at.isoformat(),
+            }
+            for review in reviews
+        ],
+        next_cursor,
+    )
+
+
+@router.get("/{provider_id}/reviews/summary")
+async def review_summary(provider_id: int, session: Session = Depends(get_session)):
+    """Rating histogram, average and count from the precomputed aggregates."""
+    _public_provider(session, provider_id)
+    return get_rating_summary(session, provider_id)
+
+
+@router.post("/{provider_id}/reviews")
+async def create_review(
+    provider_id: int,
+    review_in: ReviewIn,
+    current_user: User = Depends(get_current_active_user),
+    session: Session = Depends(get_session),
+):
+    """Post a review for a public provider (one per user)."""
+    _public_provider(session, provider_id)
+
+    existing = session.exec(
+        select(Review.id).where(
+            Review.provider_id == provider_id, Review.user_id == current_user.id
+        )
+    ).first()
+    if existing:
+        raise HTTPException(status_code=409, detail=ALREADY_REVIEWED)
+
+    review = Review(
+        provider_id=provider_id,
+        user_id=current_user.id,
+        rating=review_in.rating,
+        comment=review_in.comment,
+    )
+    try:
+        session.add(review)
+        record_review_added(session, provider_id, review.rating)
+        session.commit()
+    except IntegrityError:
+        # A concurrent post won the race past the check above
+        session.rollback()
+        raise HTTPException(status_code=409, detail=ALREADY_REVIEWED)
+    session.refresh(review)
+    invalidate_rating_summary(provider_id)
+
+    return {"message": "Review submitted", "id": review.id}
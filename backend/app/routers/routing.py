@@ -0,0 +1,45 @@
+from enum import Enum
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Query
+
+router = APIRouter(prefix="/api/route", tags=["routing"])
+
+
+class ApiKind(str, Enum):
+    openai = "openai"
+    gemini = "gemini"
+    claude = "claude"
+
+
+@router.get("/{standard_model_id}")
+async def route_model(
+    standard_model_id: int,
+    max_price_in: Optional[float] = Query(None, ge=0, description="USD per 1M tokens"),
+    max_price_out: Optional[float] = Query(None, ge=0, description="USD per 1M tokens"),
+    min_uptime: Optional[float] = Query(None, ge=0, le=100),
+    api: Optional[ApiKind] = None,
+    limit: int = Query(3, ge=1, le=50),
+):
+    """Cheapest provider endpoints for a model, for LLM gateways.
+
+    Answered from the in-memory routing index, never the database. Prices
+    are USD per 1M tokens; ``api`` keeps only providers exposing that API.
+    """
+    from app.services.routing import get_index
+
+    index = get_index()
+    candidates = index.route(
+        standard_model_id,
+        max_price_in=max_price_in,
+        max_price_out=max_price_out,
+        min_uptime=min_uptime,
+        api=api.value if api else None,
+        limit=limit,
+    )
+    if candidates is None:
+        raise HTTPException(status_code=404, detail="No prices for this model")
+    return {
+        "standard_model_id": standard_model_id,
+        "catalog_version": index.version,
+        "candidates": candidates,
+    }
@@ -5,6 +5,7 @@ from typing import Optional, List
 from app.database import get_session
 from app.models import User, UserSettings, UserAPIKey, Provider, ProviderStatus
 from app.auth import get_current_active_user
+from app.services.catalog import bump_version
 
 router = APIRouter(prefix="/api/user", tags=["user"])
 
@@ -305,6 +306,8 @@ async def update_provider(
     if request.claude_base_url is not None:
         provider.claude_base_url = request.claude_base_url
 
+    if provider.status == ProviderStatus.approved:
+        bump_version(session)
     session.commit()
     return {"message": "Provider updated successfully"}
 
@@ -357,6 +360,8 @@ async def delete_provider(
             detail="Cannot delete provider with existing API keys. Delete the keys first.",
         )
 
+    if provider.status == ProviderStatus.approved:
+        bump_version(session)
     session.delete(provider)
     session.commit()
     return {"message": "Provider deleted successfully"}
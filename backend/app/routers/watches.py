@@ -0,0 +1,99 @@
+from datetime import datetime
+from typing import Literal
+from fastapi import APIRouter, Depends, HTTPException
+from pydantic import BaseModel, Field as PydanticField
+from sqlalchemy import func
+from sqlmodel import Session, select
+from app.auth import get_current_active_user
+from app.database import get_session
+from app.models import PriceWatch, StandardModel, User, UserSettings
+
+router = APIRouter(prefix="/api/watches", tags=["watches"])
+
+MAX_WATCHES_PER_USER = 100
+
+
+class PriceWatchIn(BaseModel):
+    standard_model_id: int
+    threshold: float = PydanticField(gt=0, description="Per 1M tokens, default currency")
+    metric: Literal["input", "output"] = "input"
+
+
+@router.get("")
+async def list_watches(
+    current_user: User = Depends(get_current_active_user),
+    session: Session = Depends(get_session),
+):
+    return session.exec(
+        select(PriceWatch)
+        .where(PriceWatch.user_id == current_user.id)
+        .order_by(PriceWatch.id)
+    ).all()
+
+
+@router.post("")
+async def create_watch(
+    watch_in: PriceWatchIn,
+    current_user: User = Depends(get_current_active_user),
+    session: Session = Depends(get_session),
+):
+    """Watch a model; alerts go out when a price drops below ``threshold``.
+
+    The threshold is in the user's default currency at creation time.
+    """
+    if not session.get(StandardModel, watch_in.standard_model_id):
+        raise HTTPException(status_code=404, detail="Model not found")
+    count = session.exec(
+        select(func.count(PriceWatch.id)).where(PriceWatch.user_id == current_user.id)
+    ).one()
+    if count >= MAX_WATCHES_PER_USER:
+        raise HTTPException(status_code=400, detail="Too many watches")
+
+    settings = session.get(UserSettings, current_user.id)
+    watch = PriceWatch(
+        user_id=current_user.id,
+        standard_model_id=watch_in.standard_model_id,
+        metric=watch_in.metric,
+        threshold=watch_in.threshold,
+        currency=settings.default_currency if settings else "USD",
+    )
+    session.add(watch)
+    session.commit()
+    session.refresh(watch)
+    return watch
+
+
+@router.put("/{watch_id}")
+async def update_watch(
+    watch_id: int,
+    watch_in: PriceWatchIn,
+    current_user: User = Depends(get_current_active_user),
+    session: Session = Depends(get_session),
+):
+    watch = session.get(PriceWatch, watch_id)
+    if not watch or watch.user_id != current_user.id:
+        raise HTTPException(status_code=404, detail="Watch not found")
+    watch.standard_model_id = watch_in.standard_model_id
+    watch.metric = watch_in.metric
+    watch.threshold = watch_in.threshold
+    watch.last_price_id = None
+    watch.last_price = None
+    watch.updated_at = datetime.utcnow()
+    session.add(watch)
+    session.commit()
+    session.refresh(watch)
+    return watch
+
+
+@router.delete("/{watch_id}")
+async def delete_watch(
+    watch_id: int,
+    current_user: User = Depends(get_current_active_user),
+    session: Session = Depends(get_session),
+):
+    watch = session.get(PriceWatch, watch_id)
+    if not watch or watch.user_id != current_user.id:
+        raise HTTPException(status_code=404, detail="Watch not found")
+    session.delete(watch)
+    session.commit()
+    return {"message": "Watch deleted"}
@@ -0,0 +1,118 @@
+import json
+import secrets
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException
+from pydantic import BaseModel, Field as PydanticField
+from sqlalchemy import delete, func
+from sqlmodel import Session, select
+from app.auth import get_current_admin
+from app.database import get_session
+from app.models import User, WebhookOutbox, WebhookSubscription
+
+router = APIRouter(prefix="/api/webhooks", tags=["webhooks"])
+
+
+class WebhookIn(BaseModel):
+    url: str = PydanticField(max_length=500)
+    secret: Optional[str] = PydanticField(None, min_length=16, max_length=128)
+    model_ids: Optional[List[int]] = PydanticField(None, max_length=200)
+    provider_ids: Optional[List[int]] = PydanticField(None, max_length=200)
+
+
+def _serialize(subscription: WebhookSubscription, counts: dict) -> dict:
+    data = subscription.model_dump(exclude={"secret", "model_ids", "provider_ids"})
+    data["model_ids"] = json.loads(subscription.model_ids) if subscription.model_ids else None
+    data["provider_ids"] = (
+        json.loads(subscription.provider_ids) if subscription.provider_ids else None
+    )
+    data["outbox"] = counts.get(subscription.id, {})
+    return data
+
+
+@router.post("")
+async def create_webhook(
+    webhook_in: WebhookIn,
+    session: Session = Depends(get_session),
+    current_user: User = Depends(get_current_admin),
+):
+    """Subscribe a URL to price approve/update/expire events.
+
+    Payloads are signed with HMAC-SHA256 over ``"<timestamp>." + body``; the
+    secret is only returned here.
+    """
+    if not webhook_in.url.startswith(("http://", "https://")):
+        raise HTTPException(status_code=400, detail="URL must be http(s)")
+    subscription = WebhookSubscription(
+        owner_id=current_user.id,
+        url=webhook_in.url,
+        secret=webhook_in.secret or secrets.token_hex(32),
+        model_ids=json.dumps(sorted(set(webhook_in.model_ids)))
+        if webhook_in.model_ids
+        else None,
+        provider_ids=json.dumps(sorted(set(webhook_in.provider_ids)))
+        if webhook_in.provider_ids
+        else None,
+    )
+    session.add(subscription)
+    session.commit()
+    session.refresh(subscription)
+    return {**_serialize(subscription, {}), "secret": subscription.secret}
+
+
+@router.get("")
+async def list_webhooks(
+    session: Session = Depends(get_session),
+    current_user: User = Depends(get_current_admin),
+):
+    """Subscriptions with breaker state and outbox counts by status."""
+    counts: dict = {}
+    for subscription_id, status, n in session.exec(
+        select(WebhookOutbox.subscription_id, WebhookOutbox.status, func.count())
+        .group_by(WebhookOutbox.subscription_id, WebhookOutbox.status)
+    ):
+        counts.setdefault(subscription_id, {})[status] = n
+    subscriptions = session.exec(
+        select(WebhookSubscription).order_by(WebhookSubscription.id)
+    ).all()
+    return [_serialize(s, counts) for s in subscriptions]
+
+
+@router.post("/{webhook_id}/reset")
+async def reset_webhook(
+    webhook_id: int,
+    session: Session = Depends(get_session),
+    current_user: User = Depends(get_current_admin),
+):
+    """Close the circuit breaker and re-queue dead events."""
+    subscription = session.get(WebhookSubscription, webhook_id)
+    if not subscription:
+        raise HTTPException(status_code=404, detail="Webhook not found")
+    subscription.is_active = True
+    subscription.consecutive_failures = 0
+    subscription.circuit_open_until = None
+    session.add(subscription)
+    for row in session.exec(
+        select(WebhookOutbox).where(
+            WebhookOutbox.subscription_id == webhook_id, WebhookOutbox.status == "dead"
+        )
+    ):
+        row.status = "pending"
+        row.attempts = 0
+        session.add(row)
+    session.commit()
+    return {"message": "Webhook reset"}
+
+
+@router.delete("/{webhook_id}")
+async def delete_webhook(
+    webhook_id: int,
+    session: Session = Depends(get_session),
+    current_user: User = Depends(get_current_admin),
+):
+    subscription = session.get(WebhookSubscription, webhook_id)
+    if not subscription:
+        raise HTTPException(status_code=404, detail="Webhook not found")
+    session.exec(delete(WebhookOutbox).where(WebhookOutbox.subscription_id == webhook_id))
+    session.delete(subscription)
+    session.commit()
+    return {"message": "Webhook deleted"}
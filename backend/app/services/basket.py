@@ -0,0 +1,293 @@
+"""Cheapest set of at most K providers for a multi-model workload.
+
+Every provider/model pair of the price table is precompiled into dense
+provider x model matrices (one cell per pair, holding that provider's
+cheapest price for the model), rebuilt whenever the price table is. A
+query then only slices the columns of its models, computes a cost matrix
+and searches provider subsets on it:
+
+* exact enumeration of all subsets when there are few enough of them;
+* otherwise greedy construction followed by swap-based local search, both
+  bounded by a time budget.
+"""
+
+import itertools
+import math
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
+import numpy as np
+from app.services import price_table
+from app.services.price_table import PriceTable
+from app.services.workload import TOKENS_PER_UNIT
+
+# Subsets scored by exact search before falling back to the heuristic
+EXACT_SEARCH_LIMIT = 200_000
+HEURISTIC_BUDGET_SECONDS = 0.05
+HEURISTIC_MAX_RESTARTS = 200
+# Scoring a chunk of subsets gathers a (subsets, k, models) float array
+EXACT_CHUNK_BYTES = 8 * 1024 * 1024
+
+
+@dataclass(frozen=True)
+class BasketMatrices:
+    version: int
+    provider_ids: np.ndarray  # (P,)
+    model_ids: np.ndarray  # (M,) sorted
+    uptime: np.ndarray  # (P,)
+    input_usd: np.ndarray  # (P, M), NaN where not offered
+    output_usd: np.ndarray
+    cache_input_usd: np.ndarray
+    price_row: np.ndarray  # (P, M) index into the price table, -1 if none
+
+
+@dataclass(frozen=True)
+class BasketItem:
+    standard_model_id: int
+    input_tokens: float
+    output_tokens: float
+    cache_hit_ratio: float = 0.0
+
+
+@dataclass
+class BasketResult:
+    items: list  # requested items that some provider offers
+    columns: list  # matrix column of each item
+    provider_rows: list  # chosen providers, as rows of the matrices
+    assignment: dict  # item position -> provider row
+    total_usd: float
+    method: str
+    optimal: bool
+    uncovered: list  # item positions no chosen provider serves
+    unavailable: list  # requested model ids nobody offers
+
+
+def compile_matrices(table: PriceTable) -> BasketMatrices:
+    providers, p_idx = np.unique(table.provider_id, return_inverse=True)
+    models, m_idx = np.unique(table.model_id, return_inverse=True)
+
+    # Several prices for one pair: keep the cheapest by list price
+    order = np.lexsort((table.input_usd + table.output_usd, m_idx, p_idx))
+    _, first = np.unique(p_idx[order] * len(models) + m_idx[order], return_index=True)
+    rows = order[first]
+
+    shape = (len(providers), len(models))
+    matrices = {}
+    for name, column in (
+        ("input_usd", table.input_usd),
+        ("output_usd", table.output_usd),
+        ("cache_input_usd", table.cache_input_usd),
+    ):
+        matrix = np.full(shape, np.nan)
+        matrix[p_idx[rows], m_idx[rows]] = column[rows]
+        matrices[name] = matrix
+    price_row = np.full(shape, -1, dtype=np.int64)
+    price_row[p_idx[rows], m_idx[rows]] = rows
+
+    uptime = np.zeros(len(providers))
+    uptime[p_idx] = table.uptime
+
+    return BasketMatrices(
+        version=table.version,
+        provider_ids=providers,
+        model_ids=models,
+        uptime=uptime,
+        price_row=price_row,
+        **matrices,
+    )
+
+
+_lock = threading.Lock()
+_matrices: Optional[BasketMatrices] = None
+
+
+def _on_price_table_refresh(table: PriceTable):
+    global _matrices
+    compiled = compile_matrices(table)
+    with _lock:
+        _matrices = compiled
+
+
+def get_matrices(table: PriceTable) -> BasketMatrices:
+    matrices = _matrices
+    if matrices is None or matrices.version != table.version:
+        _on_price_table_refresh(table)
+        matrices = _matrices
+    return matrices
+
+
+price_table.add_refresh_listener(_on_price_table_refresh)
+
+
+def cost_matrix(matrices: BasketMatrices, items: list[BasketItem], columns: np.ndarray):
+    """USD cost of each item at each provider; inf where not offered."""
+    input_tokens = np.array([i.input_tokens for i in items])
+    output_tokens = np.array([i.output_tokens for i in items])
+    hit = np.array([i.cache_hit_ratio for i in items])
+
+    price_in = matrices.input_usd[:, columns]
+    cache_in = matrices.cache_input_usd[:, columns]
+    cache_in = np.where(np.isnan(cache_in), price_in, cache_in)
+    cost = (
+        input_tokens * (1 - hit) * price_in
+        + input_tokens * hit * cache_in
+        + output_tokens * matrices.output_usd[:, columns]
+    ) / TOKENS_PER_UNIT
+    return np.where(np.isnan(cost), np.inf, cost)
+
+
+def _with_penalty(cost: np.ndarray) -> np.ndarray:
+    """Replace inf with a penalty larger than any complete basket.
+
+    Subsets that leave fewer models uncovered then always win, and among
+    those the cheaper one does.
+    """
+    finite = cost[np.isfinite(cost)]
+    penalty = (finite.max() if len(finite) else 1.0) * cost.shape[1] * 10 + 1
+    return np.where(np.isfinite(cost), cost, penalty)
+
+
+def _subset_costs(cost: np.ndarray, subsets: np.ndarray) -> np.ndarray:
+    """Total cost of each subset (rows of provider indices)."""
+    return cost[subsets].min(axis=1).sum(axis=1)
+
+
+def _exact(cost: np.ndarray, k: int):
+    cost = _with_penalty(cost)
+    best_total, best_subset = np.inf, None
+    combos = itertools.combinations(range(cost.shape[0]), k)
+    chunk_size = max(1, EXACT_CHUNK_BYTES // (k * cost.shape[1] * cost.itemsize))
+    while True:
+        chunk = np.array(list(itertools.islice(combos, chunk_size)), dtype=np.int64)
+        if not len(chunk):
+            break
+        totals = _subset_costs(cost, chunk)
+        i = int(np.argmin(totals))
+        if best_subset is None or totals[i] < best_total:
+            best_total, best_subset = totals[i], chunk[i]
+    return list(best_subset), True
+
+
+def _local_search(cost: np.ndarray, chosen: list[int], deadline: float):
+    """Best-improvement swaps of one chosen provider until none helps."""
+    n, m = cost.shape
+    total = cost[chosen].min(axis=0).sum()
+    improved = True
+    while improved and time.monotonic() < deadline:
+        improved = False
+        outside = np.setdiff1d(np.arange(n), chosen)
+        if not len(outside):
+            break
+        for pos in range(len(chosen)):
+            rest = chosen[:pos] + chosen[pos + 1 :]
+            rest_min = cost[rest].min(axis=0) if rest else np.full(m, np.inf)
+            # Score every replacement for this slot at once
+            totals = np.minimum(cost[outside], rest_min).sum(axis=1)
+            j = int(np.argmin(totals))
+            if totals[j] < total - 1e-12:
+                chosen[pos] = int(outside[j])
+                total = totals[j]
+                improved = True
+    return chosen, total
+
+
+def _heuristic(cost: np.ndarray, k: int, deadline: float, seed: int = 0):
+    """Greedy start, then local search with random restarts until ``deadline``."""
+    cost = _with_penalty(cost)
+    n = cost.shape[0]
+
+    chosen: list[int] = []
+    current = np.full(cost.shape[1], np.inf)
+    for _ in range(k):
+        totals = np.minimum(cost, current).sum(axis=1)
+        totals[chosen] = np.inf
+        best = int(np.argmin(totals))
+        chosen.append(best)
+        current = np.minimum(current, cost[best])
+
+    best, best_total = _local_search(cost, chosen, deadline)
+    rng = np.random.default_rng(seed)
+    for _ in range(HEURISTIC_MAX_RESTARTS if k < n else 0):
+        if time.monotonic() >= deadline:
+            break
+        # Perturb the best solution by swapping out about a third of it
+        candidate = list(best)
+        outside = np.setdiff1d(np.arange(n), candidate)
+        swaps = min(max(1, k // 3), len(outside))
+        for pos, new in zip(
+            rng.choice(k, swaps, replace=False), rng.choice(outside, swaps, replace=False)
+        ):
+            candidate[pos] = int(new)
+        candidate, total = _local_search(cost, candidate, deadline)
+        if total < best_total - 1e-12:
+            best, best_total = candidate, total
+    return best, False
+
+
+def optimize(
+    matrices: BasketMatrices,
+    items: list[BasketItem],
+    max_providers: int,
+    min_uptime: Optional[float] = None,
+    exact_limit: int = EXACT_SEARCH_LIMIT,
+    budget_seconds: float = HEURISTIC_BUDGET_SECONDS,
+) -> BasketResult:
+    """Pick at most ``max_providers`` providers minimizing the basket cost."""
+    wanted = np.array([i.standard_model_id for i in items], dtype=np.int64)
+    columns = np.searchsorted(matrices.model_ids, wanted)
+    columns = np.minimum(columns, max(len(matrices.model_ids) - 1, 0))
+    offered = (
+        matrices.model_ids[columns] == wanted
+        if len(matrices.model_ids)
+        else np.zeros(len(wanted), dtype=bool)
+    )
+    unavailable = wanted[~offered].tolist()
+    items = [item for item, ok in zip(items, offered) if ok]
+    columns = columns[offered]
+
+    result = BasketResult(
+        items=items,
+        columns=columns.tolist(),
+        provider_rows=[],
+        assignment={},
+        total_usd=0.0,
+        method="none",
+        optimal=True,
+        uncovered=[],
+        unavailable=unavailable,
+    )
+    if not items:
+        return result
+
+    cost = cost_matrix(matrices, items, columns)
+    candidates = np.flatnonzero(np.isfinite(cost).any(axis=1))
+    if min_uptime is not None:
+        candidates = candidates[matrices.uptime[candidates] >= min_uptime]
+    cost = cost[candidates]
+
+    k = min(max_providers, len(candidates))
+    if k == 0:
+        result.uncovered = list(range(len(items)))
+        return result
+
+    if math.comb(len(candidates), k) <= exact_limit:
+        subset, result.optimal = _exact(cost, k)
+        result.method = "exact"
+    else:
+        subset, result.optimal = _heuristic(cost, k, time.monotonic() + budget_seconds)
+        result.method = "greedy+local_search"
+
+    sub_cost = cost[subset]
+    winners = sub_cost.argmin(axis=0)
+    for pos in range(len(items)):
+        value = sub_cost[winners[pos], pos]
+        if np.isfinite(value):
+            result.assignment[pos] = int(candidates[subset[winners[pos]]])
+            result.total_usd += float(value)
+        else:
+            result.uncovered.append(pos)
+
+    # Providers that ended up serving nothing are dropped
+    result.provider_rows = sorted(set(result.assignment.values()))
+    return result
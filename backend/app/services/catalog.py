@@ -0,0 +1,160 @@
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Iterable
+from sqlalchemy import String, cast, event, insert, inspect, literal, update
+from sqlmodel import Session, select
+from app.database import engine
+from app.models import (
+    CatalogChange,
+    CatalogVersion,
+    CurrencyRate,
+    ModelPrice,
+    PriceStatus,
+    Provider,
+    ProviderStatus,
+    StandardModel,
+)
+
+# How long a worker trusts its cached version before re-reading it; bounds how
+# long a write made on another worker can go unnoticed.
+REFRESH_SECONDS = float(os.getenv("CATALOG_VERSION_REFRESH_SECONDS", "2"))
+
+_lock = threading.Lock()
+_version = None
+_checked_at = 0.0
+
+
+def bump_version(session: Session):
+    """Increment the catalog data version inside the caller's transaction.
+
+    Call this from every write that changes what the public catalog endpoints
+    return (prices, providers, models, rates). The increment commits or rolls
+    back together with the write itself.
+    """
+    result = session.exec(
+        update(CatalogVersion)
+        .where(CatalogVersion.id == 1)
+        .values(version=CatalogVersion.version + 1, updated_at=datetime.utcnow())
+    )
+    if result.rowcount == 0:
+        session.add(CatalogVersion(id=1, version=1))
+    session.info["catalog_changed"] = True
+
+
+def cached_version():
+    """The cached version while it is still trusted, else None (no DB access)."""
+    if _version is not None and time.monotonic() - _checked_at < REFRESH_SECONDS:
+        return _version
+    return None
+
+
+def current_version() -> int:
+    """Latest catalog version, re-read from the DB at most every few seconds."""
+    global _version, _checked_at
+    version = cached_version()
+    if version is not None:
+        return version
+
+    with _lock:
+        if _version is None or time.monotonic() - _checked_at >= REFRESH_SECONDS:
+            with Session(engine) as session:
+                version = session.exec(
+                    select(CatalogVersion.version).where(CatalogVersion.id == 1)
+                ).first()
+            _version = version or 0
+            _checked_at = time.monotonic()
+        return _version
+
+
+def _expire_local_version():
+    global _checked_at
+    _checked_at = 0.0
+
+
+@event.listens_for(Session, "after_commit")
+def _after_commit(session):
+    # Writes made by this worker are visible to its next request immediately
+    if session.info.pop("catalog_changed", False):
+        _expire_local_version()
+
+
+@event.listens_for(Session, "after_rollback")
+def _after_rollback(session):
+    session.info.pop("catalog_changed", None)
+
+
+# Change log. ORM writes to catalog entities are captured on flush; code
+# writing them with Core statements calls ``record_changes`` itself.
+
+_change_table = CatalogChange.__table__
+
+
+def _changed(obj, attribute: str) -> bool:
+    return bool(inspect(obj).attrs[attribute].history.deleted)
+
+
+def _change_key(obj):
+    """``(entity, key)`` if ``obj`` is or was visible in the public catalog."""
+    if isinstance(obj, ModelPrice):
+        # Pending submissions stay out of the log until they go live
+        if obj.status == PriceStatus.active or _changed(obj, "status"):
+            return "price", str(obj.id)
+    elif isinstance(obj, Provider):
+        if (
+            obj.status == ProviderStatus.approved
+            or obj.is_official
+            or _changed(obj, "status")
+            or _changed(obj, "is_official")
+        ):
+            return "provider", str(obj.id)
+    elif isinstance(obj, StandardModel):
+        return "model", str(obj.id)
+    elif isinstance(obj, CurrencyRate):
+        return "rate", obj.code
+    return None
+
+
+def record_changes(session: Session, entity: str, keys: Iterable):
+    """Log changes to ``entity`` rows written outside the ORM (caller commits)."""
+    now = datetime.utcnow()
+    rows = [{"entity": entity, "entity_key": str(key), "ts": now} for key in keys]
+    if rows:
+        session.connection().execute(insert(_change_table), rows)
+
+
+def record_price_changes_for_currencies(session: Session, codes: Iterable[str]):
+    """Log every active price quoted in ``codes``, e.g. after a rate update."""
+    codes = list(codes)
+    if not codes:
+        return
+    session.connection().execute(
+        insert(_change_table).from_select(
+            ["entity", "entity_key", "ts"],
+            select(
+                literal("price"), cast(ModelPrice.id, String), literal(datetime.utcnow())
+            ).where(
+                ModelPrice.currency.in_(codes), ModelPrice.status == PriceStatus.active
+            ),
+        )
+    )
+
+
+@event.listens_for(Session, "after_flush")
+def _capture_changes(session, flush_context):
+    keys = set()
+    for obj in session.new:
+        keys.add(_change_key(obj))
+    for obj in session.dirty:
+        if session.is_modified(obj, include_collections=False):
+            keys.add(_change_key(obj))
+    for obj in session.deleted:
+        keys.add(_change_key(obj))
+    keys.discard(None)
+    if keys:
+        now = datetime.utcnow()
+        session.connection().execute(
+            insert(_change_table),
+            [{"entity": e, "entity_key": k, "ts": now} for e, k in sorted(keys)],
+        )
@@ -0,0 +1,267 @@
+"""Delta-sync feed over the catalog change log.
+
+``CatalogChange`` rows only name the entity that changed; the feed resolves
+each to its current public state, so a page holds one ``upsert`` (with the
+entity's data) or ``delete`` per entity, ordered by its latest change.
+Consumers start from a snapshot and its cursor, then follow the feed.
+"""
+
+import logging
+import os
+from datetime import datetime, timedelta
+from sqlalchemy import bindparam, delete, func, update
+from sqlmodel import Session, or_, select
+from app.database import engine
+from app.models import (
+    CatalogChange,
+    CatalogVersion,
+    CurrencyRate,
+    ModelPrice,
+    PriceStatus,
+    Provider,
+    ProviderStatus,
+    StandardModel,
+)
+
+logger = logging.getLogger("llm_price_hub.changes")
+
+# Changes younger than this are held back so a transaction that took its log
+# ids earlier but committed later is not skipped by a cursor that moved on
+SETTLE_SECONDS = float(os.getenv("CATALOG_CHANGES_SETTLE_SECONDS", "2"))
+RETENTION_DAYS = int(os.getenv("CATALOG_CHANGES_RETENTION_DAYS", "7"))
+
+PRICE_FIELDS = (
+    "id",
+    "standard_model_id",
+    "provider_id",
+    "provider_model_name",
+    "currency",
+    "input_price",
+    "output_price",
+    "cache_hit_input_price",
+    "cache_hit_output_price",
+    "input_price_usd",
+    "output_price_usd",
+    "cache_hit_input_price_usd",
+    "cache_hit_output_price_usd",
+    "verified_at",
+)
+PROVIDER_FIELDS = (
+    "id",
+    "name",
+    "website",
+    "is_official",
+    "openai_base_url",
+    "gemini_base_url",
+    "claude_base_url",
+    "avg_score",
+    "rating_count",
+    "uptime_rate",
+)
+MODEL_FIELDS = (
+    "id",
+    "name",
+    "vendor",
+    "official_currency",
+    "official_input_price",
+    "official_output_price",
+    "is_featured",
+    "rank_hint",
+)
+RATE_FIELDS = ("code", "rate_to_usd", "updated_at")
+
+
+class CursorCompacted(Exception):
+    """The requested cursor is older than the compacted part of the log."""
+
+
+def _public_prices():
+    return (
+        select(ModelPrice)
+        .join(Provider, ModelPrice.provider_id == Provider.id)
+        .where(
+            ModelPrice.status == PriceStatus.active,
+            ModelPrice.input_price_usd.is_not(None),
+            or_(
+                Provider.status == ProviderStatus.approved, Provider.is_official == True
+            ),
+        )
+    )
+
+
+def _public_providers():
+    return select(Provider).where(
+        or_(Provider.status == ProviderStatus.approved, Provider.is_official == True)
+    )
+
+
+# entity -> (statement of its public rows, key column, projected fields)
+ENTITIES = {
+    "model": (lambda: select(StandardModel), StandardModel.id, MODEL_FIELDS),
+    "provider": (_public_providers, Provider.id, PROVIDER_FIELDS),
+    "price": (_public_prices, ModelPrice.id, PRICE_FIELDS),
+    "rate": (lambda: select(CurrencyRate), CurrencyRate.code, RATE_FIELDS),
+}
+
+
+def _project(obj, fields) -> dict:
+    return {name: getattr(obj, name) for name in fields}
+
+
+def load_entities(session: Session, entity: str, keys: list[str]) -> dict:
+    """Current public state of ``keys``, by key; absent keys are gone."""
+    statement, key_column, fields = ENTITIES[entity]
+    if entity != "rate":
+        keys = [int(k) for k in keys if k.isdigit()]
+    found = {}
+    for start in range(0, len(keys), 500):
+        chunk = keys[start : start + 500]
+        for obj in session.exec(statement().where(key_column.in_(chunk))):
+            data = _project(obj, fields)
+            found[str(data[fields[0]])] = data
+    return found
+
+
+def compacted_to(session: Session) -> int:
+    value = session.exec(
+        select(CatalogVersion.changes_compacted_to).where(CatalogVersion.id == 1)
+    ).first()
+    return value or 0
+
+
+def settled_changes(session: Session, since: int, limit: int) -> list:
+    """Log rows after ``since`` up to the first one still settling.
+
+    Rows are ``(id, entity, key, ts)`` tuples.
+    """
+    rows = session.exec(
+        select(CatalogChange.id, CatalogChange.entity, CatalogChange.entity_key, CatalogChange.ts)
+        .where(CatalogChange.id > since)
+        .order_by(CatalogChange.id)
+        .limit(limit)
+    ).all()
+    settled = datetime.utcnow() - timedelta(seconds=SETTLE_SECONDS)
+    for n, row in enumerate(rows):
+        if row[3] > settled:
+            return rows[:n]
+    return rows
+
+
+def resolve_changes(session: Session, rows: list) -> list[dict]:
+    """Upserts and deletes for log ``rows``, one per entity, in change order."""
+    latest: dict[tuple, int] = {}
+    for change_id, entity, key, _ in rows:
+        latest.pop((entity, key), None)
+        latest[(entity, key)] = change_id
+
+    by_entity: dict[str, list] = {}
+    for entity, key in latest:
+        by_entity.setdefault(entity, []).append(key)
+    current = {
+        entity: load_entities(session, entity, keys)
+        for entity, keys in by_entity.items()
+        if entity in ENTITIES
+    }
+
+    changes = []
+    for entity, key in latest:
+        data = current.get(entity, {}).get(key)
+        if data is None:
+            changes.append({"op": "delete", "entity": entity, "key": key})
+        else:
+            changes.append({"op": "upsert", "entity": entity, "key": key, "data": data})
+    return changes
+
+
+def changes_since(session: Session, since: int, limit: int) -> dict:
+    """One page of the feed after cursor ``since``."""
+    if since < compacted_to(session):
+        raise CursorCompacted()
+
+    rows = settled_changes(session, since, limit)
+    return {
+        "cursor": rows[-1][0] if rows else since,
+        "has_more": len(rows) == limit,
+        "changes": resolve_changes(session, rows),
+    }
+
+
+def latest_cursor(session: Session) -> int:
+    """Cursor up to which every change has settled."""
+    settled = datetime.utcnow() - timedelta(seconds=SETTLE_SECONDS)
+    first_unsettled = session.exec(
+        select(func.min(CatalogChange.id)).where(CatalogChange.ts > settled)
+    ).first()
+    if first_unsettled is not None:
+        cursor = first_unsettled - 1
+    else:
+        cursor = session.exec(select(func.max(CatalogChange.id))).first() or 0
+    return max(cursor, compacted_to(session))
+
+
+def snapshot(session: Session) -> dict:
+    """Every public entity plus the cursor to follow the feed from.
+
+    The cursor is read first: changes landing while the snapshot is read are
+    replayed by the feed, which is harmless since upserts are idempotent.
+    """
+    result = {"cursor": latest_cursor(session)}
+    for entity, (statement, key_column, fields) in ENTITIES.items():
+        result[f"{entity}s"] = [
+            _project(obj, fields)
+            for obj in session.exec(statement().order_by(key_column))
+        ]
+    return result
+
+
+def compact_changes(retention_days: int = RETENTION_DAYS) -> tuple[int, int]:
+    """Drop superseded log rows, then rows older than the retention window.
+
+    Dropping a superseded row never changes what a consumer receives; the
+    retention cut advances the watermark below which cursors get a 410.
+    Returns ``(superseded, expired)`` row counts.
+    """
+    table = CatalogChange.__table__
+    with Session(engine) as session:
+        latest = session.exec(
+            select(CatalogChange.entity, CatalogChange.entity_key, func.max(CatalogChange.id))
+            .group_by(CatalogChange.entity, CatalogChange.entity_key)
+            .having(func.count() > 1)
+        ).all()
+        superseded = 0
+        if latest:
+            superseded = (
+                session.connection()
+                .execute(
+                    delete(table).where(
+                        table.c.entity == bindparam("b_entity"),
+                        table.c.entity_key == bindparam("b_key"),
+                        table.c.id < bindparam("b_id"),
+                    ),
+                    [{"b_entity": e, "b_key": k, "b_id": i} for e, k, i in latest],
+                )
+                .rowcount
+            )
+
+        cutoff = datetime.utcnow() - timedelta(days=retention_days)
+        watermark = session.exec(
+            select(func.max(CatalogChange.id)).where(CatalogChange.ts < cutoff)
+        ).first()
+        expired = 0
+        if watermark is not None:
+            expired = session.exec(
+                delete(CatalogChange).where(CatalogChange.id <= watermark)
+            ).rowcount
+            session.exec(
+                update(CatalogVersion)
+                .where(
+                    CatalogVersion.id == 1,
+                    CatalogVersion.changes_compacted_to < watermark,
+                )
+                .values(changes_compacted_to=watermark)
+            )
+        session.commit()
+    logger.info(
+        "Compacted catalog change log: %d superseded, %d expired", superseded, expired
+    )
+    return superseded, expired
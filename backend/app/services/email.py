@@ -1,6 +1,4 @@
-import smtplib
 import logging
-from email.message import EmailMessage
 from typing import Dict
 from sqlmodel import Session, select
 from app.models import SystemSetting
@@ -30,6 +28,9 @@ def send_email(to_email: str, subject: str, body: str, session: Session) -> bool
     if not host or not port or not sender:
         return False
 
+    import smtplib
+    from email.message import EmailMessage
+
     msg = EmailMessage()
     msg["From"] = sender
     msg["To"] = to_email
@@ -0,0 +1,183 @@
+"""Broadcast of catalog changes to Server-Sent Events subscribers.
+
+One poller per worker tails the catalog change log and hands each batch of
+resolved changes to the hub, which formats it once per distinct filter and
+appends it to every matching subscriber's bounded buffer. A subscriber whose
+buffer is full is evicted rather than allowed to hold memory or slow the
+others down; it reconnects and refetches.
+"""
+
+import asyncio
+import logging
+import os
+from collections import deque
+from typing import Optional
+from sqlmodel import Session, select
+from app.database import engine
+from app.models import ModelPrice
+from app.responses import dumps
+from app.services import changes
+
+logger = logging.getLogger("llm_price_hub.live")
+
+POLL_SECONDS = float(os.getenv("LIVE_POLL_SECONDS", "1"))
+QUEUE_SIZE = int(os.getenv("LIVE_QUEUE_SIZE", "32"))
+HEARTBEAT_SECONDS = 15.0
+_POLL_BATCH = 1000
+
+
+class Subscriber:
+    __slots__ = ("model_ids", "currencies", "buffer", "wakeup", "evicted")
+
+    def __init__(self, model_ids: Optional[frozenset], currencies: Optional[frozenset]):
+        self.model_ids = model_ids
+        self.currencies = currencies
+        self.buffer: deque = deque()
+        self.wakeup = asyncio.Event()
+        self.evicted = False
+
+    @property
+    def filter_key(self):
+        return self.model_ids, self.currencies
+
+
+def _matches(change: dict, model_ids, currencies) -> bool:
+    """Whether a change concerns the models/currencies a subscriber follows.
+
+    Price deletes of rows that no longer exist carry neither, and go to all.
+    """
+    entity = change["entity"]
+    if entity == "price":
+        data = change.get("data") or change.get("context") or {}
+        model_id, currency = data.get("standard_model_id"), data.get("currency")
+        if model_ids is not None and model_id is not None and model_id not in model_ids:
+            return False
+        if currencies is not None and currency is not None and currency not in currencies:
+            return False
+    elif entity == "model":
+        return model_ids is None or int(change["key"]) in model_ids
+    elif entity == "rate":
+        return currencies is None or change["key"] in currencies
+    return True
+
+
+def format_event(cursor: int, batch: list[dict]) -> str:
+    # Same encoding (ISO 8601 datetimes) as /api/changes
+    return f"id: {cursor}\nevent: changes\ndata: {dumps(batch).decode()}\n\n"
+
+
+class BroadcastHub:
+    def __init__(self, queue_size: int = QUEUE_SIZE):
+        self.queue_size = queue_size
+        self.subscribers: set[Subscriber] = set()
+        self.evictions = 0
+
+    def subscribe(
+        self, model_ids: Optional[frozenset] = None, currencies: Optional[frozenset] = None
+    ) -> Subscriber:
+        subscriber = Subscriber(model_ids, currencies)
+        self.subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber):
+        self.subscribers.discard(subscriber)
+
+    def publish(self, cursor: int, batch: list[dict]):
+        """Queue ``batch`` for every subscriber whose filter it matches."""
+        formatted: dict = {}
+        for subscriber in list(self.subscribers):
+            key = subscriber.filter_key
+            if key not in formatted:
+                model_ids, currencies = key
+                if model_ids is None and currencies is None:
+                    matching = batch
+                else:
+                    matching = [c for c in batch if _matches(c, model_ids, currencies)]
+                formatted[key] = format_event(cursor, matching) if matching else None
+            message = formatted[key]
+            if message is None:
+                continue
+            if len(subscriber.buffer) >= self.queue_size:
+                # Slow consumer: drop it instead of buffering without bound
+                subscriber.evicted = True
+                subscriber.buffer.clear()
+                self.subscribers.discard(subscriber)
+                self.evictions += 1
+            else:
+                subscriber.buffer.append(message)
+            subscriber.wakeup.set()
+
+
+hub = BroadcastHub()
+_poller: Optional[asyncio.Task] = None
+
+
+def _with_price_context(session: Session, batch: list[dict]):
+    """Attach model and currency to price deletes so filters can route them."""
+    ids = [int(c["key"]) for c in batch if c["entity"] == "price" and c["op"] == "delete"]
+    if not ids:
+        return
+    context = {
+        str(price_id): {"standard_model_id": model_id, "currency": currency}
+        for price_id, model_id, currency in session.exec(
+            select(ModelPrice.id, ModelPrice.standard_model_id, ModelPrice.currency).where(
+                ModelPrice.id.in_(ids)
+            )
+        )
+    }
+    for change in batch:
+        if change["entity"] == "price" and change["op"] == "delete":
+            if change["key"] in context:
+                change["context"] = context[change["key"]]
+
+
+def _read_changes(cursor: Optional[int]) -> tuple[int, list]:
+    with Session(engine) as session:
+        if cursor is None:
+            return changes.latest_cursor(session), []
+        rows = changes.settled_changes(session, cursor, _POLL_BATCH)
+        if not rows:
+            return cursor, []
+        batch = changes.resolve_changes(session, rows)
+        _with_price_context(session, batch)
+        return rows[-1][0], batch
+
+
+async def _poll():
+    cursor = None
+    while hub.subscribers:
+        try:
+            cursor, batch = await asyncio.to_thread(_read_changes, cursor)
+            if batch:
+                hub.publish(cursor, batch)
+                continue
+        except Exception as e:
+            logger.error(f"Failed to poll catalog changes: {e}")
+        await asyncio.sleep(POLL_SECONDS)
+
+
+def ensure_poller():
+    """Start the change poller if it is not running; it stops when idle."""
+    global _poller
+    if _poller is None or _poller.done():
+        _poller = asyncio.get_running_loop().create_task(_poll())
+
+
+async def stream(subscriber: Subscriber):
+    """SSE messages for ``subscriber``, with heartbeats while idle."""
+    try:
+        yield "retry: 5000\n\n"
+        while True:
+            try:
+                await asyncio.wait_for(subscriber.wakeup.wait(), HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            subscriber.wakeup.clear()
+            if subscriber.evicted:
+                yield "event: evicted\ndata: {}\n\n"
+                return
+            while subscriber.buffer:
+                yield subscriber.buffer.popleft()
+    finally:
+        hub.unsubscribe(subscriber)
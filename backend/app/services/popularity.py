@@ -0,0 +1,109 @@
+import logging
+import os
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from sqlalchemy import bindparam, update
+from sqlmodel import Session
+from app.database import engine
+from app.models import StandardModel, SystemSetting
+
+logger = logging.getLogger("llm_price_hub.popularity")
+
+# Score halves after this many hours without new views
+HALF_LIFE_HOURS = float(os.getenv("POPULARITY_HALF_LIFE_HOURS", "168"))
+DECAY_SETTING_KEY = "popularity_decayed_at"
+# Scores are kept out of the catalog version: views would otherwise change
+# every ETag and rebuild every derived index. Responses that show or order by
+# them are validated against this epoch instead, so they lag by at most this.
+EPOCH_SECONDS = int(os.getenv("POPULARITY_EPOCH_SECONDS", "300"))
+
+_lock = threading.Lock()
+_pending: Counter = Counter()
+
+_increment_stmt = (
+    update(StandardModel.__table__)
+    .where(StandardModel.__table__.c.id == bindparam("model_id"))
+    .values(popularity_score=StandardModel.__table__.c.popularity_score + bindparam("n"))
+)
+
+
+def epoch() -> int:
+    """Current popularity epoch; advances every ``EPOCH_SECONDS``."""
+    return int(time.time() // EPOCH_SECONDS)
+
+
+def record_view(model_id: int):
+    """Count one view in memory; flushed to the database in batches."""
+    with _lock:
+        _pending[model_id] += 1
+
+
+def flush() -> int:
+    """Write buffered views as additive UPDATEs and return the views flushed.
+
+    Increments are applied as ``popularity_score = popularity_score + :n`` so
+    concurrent flushes from several workers never overwrite each other, and
+    rows are updated in id order to keep lock acquisition consistent. On
+    failure the batch is merged back so the next flush retries it.
+    """
+    with _lock:
+        if not _pending:
+            return 0
+        batch = dict(_pending)
+        _pending.clear()
+
+    params = [{"model_id": model_id, "n": n} for model_id, n in sorted(batch.items())]
+    try:
+        with Session(engine) as session:
+            session.connection().execute(_increment_stmt, params)
+            session.commit()
+    except Exception:
+        with _lock:
+            _pending.update(batch)
+        raise
+    return sum(batch.values())
+
+
+def apply_decay() -> bool:
+    """Decay all scores by the time elapsed since the last decay.
+
+    The last decay time lives in ``system_settings`` and is advanced with a
+    compare-and-set in the same transaction as the decay, so when several
+    workers run this job only one of them applies it.
+    """
+    now = datetime.utcnow()
+    with Session(engine) as session:
+        setting = session.get(SystemSetting, DECAY_SETTING_KEY)
+        if setting is None:
+            session.add(SystemSetting(key=DECAY_SETTING_KEY, value=now.isoformat()))
+            session.commit()
+            return False
+
+        last = datetime.fromisoformat(setting.value)
+        elapsed_hours = (now - last).total_seconds() / 3600
+        if elapsed_hours <= 0:
+            return False
+        factor = 0.5 ** (elapsed_hours / HALF_LIFE_HOURS)
+
+        claimed = session.exec(
+            update(SystemSetting)
+            .where(
+                SystemSetting.key == DECAY_SETTING_KEY,
+                SystemSetting.value == setting.value,
+            )
+            .values(value=now.isoformat(), updated_at=now)
+        ).rowcount
+        if claimed != 1:
+            session.rollback()
+            return False
+
+        session.exec(
+            update(StandardModel)
+            .where(StandardModel.popularity_score > 0)
+            .values(popularity_score=StandardModel.popularity_score * factor)
+        )
+        session.commit()
+    logger.info("Decayed popularity scores by factor %.4f", factor)
+    return True
@@ -0,0 +1,82 @@
+from datetime import datetime
+from typing import Optional, Sequence
+from sqlmodel import Session
+from app.models import ModelPrice, PriceHistory
+
+
+def record_price_event(
+    session: Session, price: ModelPrice, event: str, ts: Optional[datetime] = None
+):
+    """Append the price's current values to its history (caller commits)."""
+    session.add(
+        PriceHistory(
+            price_id=price.id,
+            standard_model_id=price.standard_model_id,
+            provider_id=price.provider_id,
+            event=event,
+            currency=price.currency,
+            input_price=price.input_price,
+            output_price=price.output_price,
+            input_price_usd=price.input_price_usd,
+            output_price_usd=price.output_price_usd,
+            ts=ts or datetime.utcnow(),
+        )
+    )
+
+
+def lttb_indices(xs: Sequence[float], ys: Sequence[float], threshold: int) -> list[int]:
+    """Largest-Triangle-Three-Buckets: indices of ``threshold`` representative points.
+
+    Keeps the first and last point and, for every bucket in between, the
+    point forming the largest triangle with the previously kept point and
+    the average of the next bucket, which preserves the visual shape of the
+    series.
+    """
+    n = len(xs)
+    if threshold >= n or threshold < 3:
+        return list(range(n))
+
+    every = (n - 2) / (threshold - 2)
+    kept = [0]
+    a = 0
+    for i in range(threshold - 2):
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+        next_end = min(int((i + 2) * every) + 1, n)
+
+        span = range(end, next_end) if next_end > end else range(n - 1, n)
+        avg_x = sum(xs[j] for j in span) / len(span)
+        avg_y = sum(ys[j] for j in span) / len(span)
+
+        ax, ay = xs[a], ys[a]
+        best, best_area = start, -1.0
+        for j in range(start, end):
+            area = abs((ax - avg_x) * (ys[j] - ay) - (ax - xs[j]) * (avg_y - ay))
+            if area > best_area:
+                best, best_area = j, area
+        kept.append(best)
+        a = best
+    kept.append(n - 1)
+    return kept
+
+
+def minmax_indices(ys: Sequence[float], threshold: int) -> list[int]:
+    """Per-bucket min and max: indices of at most ``threshold`` points.
+
+    Unlike LTTB this never drops a spike, at the cost of a noisier line.
+    """
+    n = len(ys)
+    buckets = threshold // 2
+    if threshold >= n or buckets < 1:
+        return list(range(n))
+
+    kept = set()
+    size = n / buckets
+    for b in range(buckets):
+        start, end = int(b * size), int((b + 1) * size)
+        if start >= end:
+            continue
+        window = range(start, end)
+        kept.add(min(window, key=ys.__getitem__))
+        kept.add(max(window, key=ys.__getitem__))
+    return sorted(kept)
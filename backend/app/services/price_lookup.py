@@ -0,0 +1,123 @@
+"""Current price by (provider id, provider model name), for billing.
+
+A dict keyed by the pair maps into the rows of the price table snapshot,
+rebuilt with it. Until the snapshot exists (cold start) lookups go to the
+database through ``ix_model_prices_provider_model_name`` instead.
+"""
+
+import threading
+from dataclasses import dataclass
+from typing import Optional
+import numpy as np
+from sqlalchemy import tuple_
+from sqlmodel import Session, or_, select
+from app.models import ModelPrice, PriceStatus, Provider, ProviderStatus
+from app.services import price_table
+from app.services.price_table import PriceTable
+
+PRICE_FIELDS = (
+    "input_price",
+    "output_price",
+    "cache_hit_input_price",
+    "cache_hit_output_price",
+)
+_DB_CHUNK = 500
+
+
+@dataclass(frozen=True)
+class LookupIndex:
+    version: int
+    rows: dict  # (provider_id, provider_model_name) -> price table row
+
+
+def build_index(table: PriceTable) -> LookupIndex:
+    # Rows are ordered by price id, so the newest price of a pair wins
+    keys = zip(table.provider_id.tolist(), table.provider_model_name)
+    return LookupIndex(
+        version=table.version,
+        rows={key: i for i, key in enumerate(keys) if key[1] is not None},
+    )
+
+
+_lock = threading.Lock()
+_index: Optional[LookupIndex] = None
+
+
+def _on_price_table_refresh(table: PriceTable):
+    global _index
+    index = build_index(table)
+    with _lock:
+        _index = index
+
+
+def get_index(table: PriceTable) -> LookupIndex:
+    index = _index
+    if index is None or index.version != table.version:
+        _on_price_table_refresh(table)
+        index = _index
+    return index
+
+
+price_table.add_refresh_listener(_on_price_table_refresh)
+
+
+def _nan_to_none(values: np.ndarray) -> list:
+    return [None if np.isnan(v) else v for v in values.tolist()]
+
+
+def lookup_in_table(table: PriceTable, pairs: list[tuple]) -> list[Optional[dict]]:
+    """Resolve ``pairs`` against the snapshot; USD prices, None when unknown."""
+    rows = get_index(table).rows
+    found = np.array([rows.get(pair, -1) for pair in pairs], dtype=np.int64)
+    hits = np.flatnonzero(found >= 0)
+    idx = found[hits]
+
+    columns = {
+        "price_id": table.price_id[idx].tolist(),
+        "standard_model_id": table.model_id[idx].tolist(),
+        "input_price": table.input_usd[idx].tolist(),
+        "output_price": table.output_usd[idx].tolist(),
+        "cache_hit_input_price": _nan_to_none(table.cache_input_usd[idx]),
+        "cache_hit_output_price": _nan_to_none(table.cache_output_usd[idx]),
+    }
+    results: list[Optional[dict]] = [None] * len(pairs)
+    for n, pos in enumerate(hits.tolist()):
+        results[pos] = {name: values[n] for name, values in columns.items()}
+    return results
+
+
+def lookup_in_database(session: Session, pairs: list[tuple]) -> list[Optional[dict]]:
+    """Same as :func:`lookup_in_table`, straight from the database."""
+    unique = list(dict.fromkeys(pair for pair in pairs if pair[1] is not None))
+    resolved = {}
+    for start in range(0, len(unique), _DB_CHUNK):
+        chunk = unique[start : start + _DB_CHUNK]
+        for row in session.exec(
+            select(
+                ModelPrice.provider_id,
+                ModelPrice.provider_model_name,
+                ModelPrice.id,
+                ModelPrice.standard_model_id,
+                ModelPrice.input_price_usd,
+                ModelPrice.output_price_usd,
+                ModelPrice.cache_hit_input_price_usd,
+                ModelPrice.cache_hit_output_price_usd,
+            )
+            .join(Provider, ModelPrice.provider_id == Provider.id)
+            .where(
+                tuple_(ModelPrice.provider_id, ModelPrice.provider_model_name).in_(chunk),
+                ModelPrice.status == PriceStatus.active,
+                ModelPrice.input_price_usd.is_not(None),
+                or_(
+                    Provider.status == ProviderStatus.approved,
+                    Provider.is_official == True,
+                ),
+            )
+            .order_by(ModelPrice.id)
+        ):
+            resolved[(row[0], row[1])] = {
+                "price_id": row[2],
+                "standard_model_id": row[3],
+                **dict(zip(PRICE_FIELDS, row[4:])),
+            }
+    return [resolved.get(pair) for pair in pairs]
@@ -0,0 +1,160 @@
+"""In-memory columnar snapshot of every comparable price.
+
+The snapshot holds NumPy arrays for the active prices of public providers
+(the same rows ``/api/prices/compare`` shows) so estimators and rankers can
+work on the whole catalog without touching the database. It is rebuilt when
+the catalog data version changes; code that derives its own structures from
+the snapshot registers a refresh listener.
+"""
+
+import logging
+import threading
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+import numpy as np
+from sqlmodel import Session, or_, select
+from app.database import engine
+from app.models import ModelPrice, PriceStatus, Provider, ProviderStatus, StandardModel
+from app.services import catalog
+from app.services.pricing import load_rate_map
+
+logger = logging.getLogger("llm_price_hub.price_table")
+
+
+@dataclass(frozen=True)
+class PriceTable:
+    version: int
+    price_id: np.ndarray
+    model_id: np.ndarray
+    provider_id: np.ndarray
+    # USD per 1M tokens; NaN where a price is not set
+    input_usd: np.ndarray
+    output_usd: np.ndarray
+    cache_input_usd: np.ndarray
+    cache_output_usd: np.ndarray
+    uptime: np.ndarray
+    score: np.ndarray
+    provider_model_name: list
+    provider_names: dict = field(default_factory=dict)
+    # Provider id -> (openai_base_url, gemini_base_url, claude_base_url)
+    provider_endpoints: dict = field(default_factory=dict)
+    model_names: dict = field(default_factory=dict)
+    # Currency code -> units per USD, as of this snapshot
+    rate_map: dict = field(default_factory=dict)
+
+    def __len__(self):
+        return len(self.price_id)
+
+
+_lock = threading.Lock()
+_table: Optional[PriceTable] = None
+_listeners: list[Callable[[PriceTable], None]] = []
+
+
+def add_refresh_listener(fn: Callable[[PriceTable], None]):
+    """Call ``fn(table)`` after every rebuild (and now, if a table exists)."""
+    _listeners.append(fn)
+    if _table is not None:
+        fn(_table)
+
+
+def _float_column(values) -> np.ndarray:
+    return np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+
+
+def build_price_table(session: Session, version: int) -> PriceTable:
+    rows = session.exec(
+        select(
+            ModelPrice.id,
+            ModelPrice.standard_model_id,
+            ModelPrice.provider_id,
+            ModelPrice.input_price_usd,
+            ModelPrice.output_price_usd,
+            ModelPrice.cache_hit_input_price_usd,
+            ModelPrice.cache_hit_output_price_usd,
+            Provider.uptime_rate,
+            Provider.avg_score,
+            ModelPrice.provider_model_name,
+        )
+        .join(Provider, ModelPrice.provider_id == Provider.id)
+        .where(
+            ModelPrice.status == PriceStatus.active,
+            ModelPrice.input_price_usd.is_not(None),
+            or_(
+                Provider.status == ProviderStatus.approved, Provider.is_official == True
+            ),
+        )
+        .order_by(ModelPrice.id)
+    ).all()
+    columns = list(zip(*rows)) if rows else [()] * 10
+
+    provider_names, provider_endpoints = {}, {}
+    for provider_id, name, *endpoints in session.exec(
+        select(
+            Provider.id,
+            Provider.name,
+            Provider.openai_base_url,
+            Provider.gemini_base_url,
+            Provider.claude_base_url,
+        ).where(
+            or_(
+                Provider.status == ProviderStatus.approved,
+                Provider.is_official == True,
+            )
+        )
+    ):
+        provider_names[provider_id] = name
+        provider_endpoints[provider_id] = tuple(endpoints)
+    model_names = dict(session.exec(select(StandardModel.id, StandardModel.name)).all())
+
+    return PriceTable(
+        version=version,
+        price_id=np.array(columns[0], dtype=np.int64),
+        model_id=np.array(columns[1], dtype=np.int64),
+        provider_id=np.array(columns[2], dtype=np.int64),
+        input_usd=_float_column(columns[3]),
+        output_usd=_float_column(columns[4]),
+        cache_input_usd=_float_column(columns[5]),
+        cache_output_usd=_float_column(columns[6]),
+        uptime=_float_column(columns[7]),
+        score=_float_column(columns[8]),
+        provider_model_name=list(columns[9]),
+        provider_names=provider_names,
+        provider_endpoints=provider_endpoints,
+        model_names=model_names,
+        rate_map=load_rate_map(session),
+    )
+
+
+def refresh(force: bool = False) -> bool:
+    """Rebuild the snapshot if the catalog changed; True when rebuilt."""
+    global _table
+    with _lock:
+        # Read the version first so a write landing mid-build triggers
+        # another rebuild on the next refresh
+        version = catalog.current_version()
+        if not force and _table is not None and _table.version == version:
+            return False
+        with Session(engine) as session:
+            table = build_price_table(session, version)
+        _table = table
+
+    for listener in list(_listeners):
+        try:
+            listener(table)
+        except Exception:
+            logger.exception("Price table refresh listener failed")
+    logger.info("Rebuilt price table v%d with %d prices", version, len(table))
+    return True
+
+
+def peek_price_table() -> Optional[PriceTable]:
+    """Current snapshot, or None if it has not been built yet."""
+    return _table
+
+
+def get_price_table() -> PriceTable:
+    """Current snapshot, built on first use."""
+    if _table is None:
+        refresh()
+    return _table
@@ -0,0 +1,203 @@
+"""Price alerts for user watchlists.
+
+Each run reads only the catalog change-log entries since the previous run.
+The cursor is kept in a system setting and advanced with a compare-and-set,
+so with several workers each range is evaluated once. Changed prices are
+matched against an in-memory index of thresholds per (model, metric),
+sorted in USD. A price alerts every watch whose threshold is above it,
+found with one bisect. Alerts are sent as one email per user per run.
+"""
+
+import logging
+from bisect import bisect_right
+from dataclasses import dataclass
+from datetime import datetime
+from sqlalchemy import func, update
+from sqlmodel import Session, select
+from app.database import engine
+from app.models import PriceWatch, Provider, StandardModel, SystemSetting, User
+from app.services import changes
+from app.services.email import send_email
+from app.services.pricing import load_rate_map
+
+logger = logging.getLogger("llm_price_hub.price_watch")
+
+CURSOR_SETTING_KEY = "price_watch_cursor"
+MAX_CHANGES_PER_RUN = 5000
+METRICS = ("input", "output")
+
+
+@dataclass(frozen=True)
+class ThresholdIndex:
+    signature: tuple
+    # (model id, metric) -> (USD thresholds ascending, parallel watch ids)
+    by_model: dict
+
+    def matching(self, model_id: int, metric: str, price_usd: float) -> list[int]:
+        """Watches whose threshold is strictly above ``price_usd``."""
+        entry = self.by_model.get((model_id, metric))
+        if entry is None:
+            return []
+        thresholds, watch_ids = entry
+        return watch_ids[bisect_right(thresholds, price_usd) :]
+
+
+def build_index(watches, rate_map: dict, signature: tuple = ()) -> ThresholdIndex:
+    grouped: dict = {}
+    for watch_id, model_id, metric, threshold, currency in watches:
+        rate = rate_map.get(currency)
+        if not rate:
+            continue
+        grouped.setdefault((model_id, metric), []).append((threshold / rate, watch_id))
+    by_model = {}
+    for key, entries in grouped.items():
+        entries.sort()
+        by_model[key] = ([t for t, _ in entries], [w for _, w in entries])
+    return ThresholdIndex(signature=signature, by_model=by_model)
+
+
+_index: ThresholdIndex = build_index([], {})
+
+
+def get_index(session: Session, rate_map: dict) -> ThresholdIndex:
+    """The threshold index, rebuilt only when watches or rates changed."""
+    global _index
+    active = PriceWatch.is_active == True
+    count, max_id, max_updated = session.exec(
+        select(
+            func.count(PriceWatch.id),
+            func.max(PriceWatch.id),
+            func.max(PriceWatch.updated_at),
+        ).where(active)
+    ).one()
+    signature = (count, max_id, max_updated, tuple(sorted(rate_map.items())))
+    if _index.signature != signature:
+        watches = session.exec(
+            select(
+                PriceWatch.id,
+                PriceWatch.standard_model_id,
+                PriceWatch.metric,
+                PriceWatch.threshold,
+                PriceWatch.currency,
+            ).where(active)
+        ).all()
+        _index = build_index(watches, rate_map, signature)
+    return _index
+
+
+def _claim_changes(session: Session) -> list:
+    """Change-log rows since the stored cursor, claimed for this run."""
+    setting = session.get(SystemSetting, CURSOR_SETTING_KEY)
+    if setting is None:
+        # First run: start from now rather than alerting on old changes
+        session.add(
+            SystemSetting(key=CURSOR_SETTING_KEY, value=str(changes.latest_cursor(session)))
+        )
+        session.commit()
+        return []
+
+    rows = changes.settled_changes(session, int(setting.value), MAX_CHANGES_PER_RUN)
+    if not rows:
+        return []
+    claimed = session.exec(
+        update(SystemSetting)
+        .where(
+            SystemSetting.key == CURSOR_SETTING_KEY,
+            SystemSetting.value == setting.value,
+        )
+        .values(value=str(rows[-1][0]), updated_at=datetime.utcnow())
+    ).rowcount
+    if claimed != 1:
+        session.rollback()
+        return []
+    session.commit()
+    return rows
+
+
+def _names(session: Session, column_id, column_name, ids) -> dict:
+    return dict(session.exec(select(column_id, column_name).where(column_id.in_(ids))).all())
+
+
+def _send_alerts(session: Session, alerts: dict) -> int:
+    """One digest email per user; returns the number sent."""
+    items = [item for user_items in alerts.values() for item in user_items]
+    model_names = _names(
+        session, StandardModel.id, StandardModel.name, {w.standard_model_id for w, _, _ in items}
+    )
+    provider_names = _names(
+        session, Provider.id, Provider.name, {p["provider_id"] for _, p, _ in items}
+    )
+    emails = _names(session, User.id, User.email, list(alerts))
+    site_name = session.get(SystemSetting, "site_name")
+    site_name = site_name.value if site_name else "LLM Price Hub"
+
+    sent = 0
+    for user_id, user_items in alerts.items():
+        if user_id not in emails:
+            continue
+        lines = [
+            f"- {model_names.get(w.standard_model_id)} at "
+            f"{provider_names.get(p['provider_id'])}: {w.metric} price "
+            f"{value:.4f} {w.currency} per 1M tokens (threshold {w.threshold:g})"
+            for w, p, value in user_items
+        ]
+        body = (
+            "Hi,\n\nPrices on your watchlist dropped below your thresholds:\n\n"
+            + "\n".join(lines)
+        )
+        if send_email(emails[user_id], f"{site_name} price alert", body, session):
+            sent += 1
+    return sent
+
+
+def evaluate_watches() -> int:
+    """Alert on prices changed since the last run; returns emails sent."""
+    with Session(engine) as session:
+        rows = _claim_changes(session)
+        keys = list(dict.fromkeys(key for _, entity, key, _ in rows if entity == "price"))
+        if not keys:
+            return 0
+        prices = changes.load_entities(session, "price", keys)
+        rate_map = load_rate_map(session)
+        index = get_index(session, rate_map)
+
+        # Cheapest matching price per watch
+        best: dict[int, tuple] = {}
+        for price in prices.values():
+            for metric in METRICS:
+                price_usd = price[f"{metric}_price_usd"]
+                if price_usd is None:
+                    continue
+                model_id = price["standard_model_id"]
+                for watch_id in index.matching(model_id, metric, price_usd):
+                    if watch_id not in best or price_usd < best[watch_id][0]:
+                        best[watch_id] = (price_usd, price)
+        if not best:
+            return 0
+
+        now = datetime.utcnow()
+        alerts: dict[int, list] = {}
+        for watch in session.exec(
+            select(PriceWatch).where(
+                PriceWatch.id.in_(list(best)), PriceWatch.is_active == True
+            )
+        ):
+            price_usd, price = best[watch.id]
+            value = price_usd * rate_map[watch.currency]
+            if watch.last_price_id == price["id"] and watch.last_price is not None:
+                if value >= watch.last_price * (1 - 1e-9):
+                    continue
+            watch.last_price_id = price["id"]
+            watch.last_price = value
+            watch.last_notified_at = now
+            session.add(watch)
+            alerts.setdefault(watch.user_id, []).append((watch, price, value))
+        session.commit()
+        if not alerts:
+            return 0
+
+        sent = _send_alerts(session, alerts)
+    logger.info(
+        "Price watch run: %d alerts, %d emails", sum(map(len, alerts.values())), sent
+    )
+    return sent
@@ -0,0 +1,108 @@
+import logging
+from typing import Iterable, Optional
+from sqlalchemy import bindparam, null, update
+from sqlmodel import Session, select
+from app.database import engine
+from app.models import CurrencyRate, ModelPrice
+from app.services.catalog import bump_version, record_price_changes_for_currencies
+
+logger = logging.getLogger("llm_price_hub.pricing")
+
+# Native price column -> its USD-normalized copy
+USD_COLUMNS = {
+    "input_price": "input_price_usd",
+    "output_price": "output_price_usd",
+    "cache_hit_input_price": "cache_hit_input_price_usd",
+    "cache_hit_output_price": "cache_hit_output_price_usd",
+}
+
+_table = ModelPrice.__table__
+
+_refresh_stmt = (
+    update(_table)
+    .where(_table.c.currency == bindparam("code"))
+    .values(
+        **{
+            usd: _table.c[native] / bindparam("rate")
+            for native, usd in USD_COLUMNS.items()
+        }
+    )
+)
+
+
+def load_rate_map(session: Session) -> dict[str, float]:
+    """Currency code -> units per USD, with USD always present."""
+    rates = session.exec(select(CurrencyRate)).all()
+    rate_map = {r.code: r.rate_to_usd for r in rates}
+    rate_map["USD"] = 1.0
+    return rate_map
+
+
+def convert(
+    amount: Optional[float], src: str, target: str, rate_map: dict[str, float]
+) -> Optional[float]:
+    if amount is None:
+        return None
+    if src not in rate_map or target not in rate_map:
+        return None
+    usd = amount / rate_map[src]
+    return usd * rate_map[target]
+
+
+def from_usd(amount: Optional[float], target: str, rate_map: dict[str, float]):
+    if amount is None or target not in rate_map:
+        return None
+    return amount * rate_map[target]
+
+
+def apply_usd_prices(price: ModelPrice, rate_map: dict[str, float]):
+    """Fill the USD columns of a price from its native-currency fields."""
+    for native, usd in USD_COLUMNS.items():
+        setattr(price, usd, convert(getattr(price, native), price.currency, "USD", rate_map))
+
+
+def refresh_usd_prices(
+    session: Session, codes: Optional[Iterable[str]] = None, only_missing: bool = False
+) -> int:
+    """Recompute USD columns in bulk for prices quoted in ``codes``.
+
+    One UPDATE per currency runs in the caller's transaction, so a rate change
+    and the prices derived from it commit together. With ``codes`` omitted
+    every currency in use is refreshed; prices in a currency without a known
+    rate get NULL USD values. Returns the number of price rows updated.
+    """
+    rate_map = load_rate_map(session)
+    if codes is None:
+        codes = session.exec(select(ModelPrice.currency).distinct()).all()
+    codes = sorted(set(codes))
+    if not codes:
+        return 0
+
+    stmt = _refresh_stmt
+    if only_missing:
+        stmt = stmt.where(_table.c.input_price_usd.is_(None))
+
+    updated = 0
+    known = [{"code": c, "rate": rate_map[c]} for c in codes if rate_map.get(c)]
+    if known:
+        updated += session.connection().execute(stmt, known).rowcount
+
+    unknown = [c for c in codes if not rate_map.get(c)]
+    if unknown and not only_missing:
+        updated += session.exec(
+            update(ModelPrice)
+            .where(ModelPrice.currency.in_(unknown))
+            .values(**{usd: null() for usd in USD_COLUMNS.values()})
+        ).rowcount
+    if updated:
+        record_price_changes_for_currencies(session, codes)
+    logger.info("Refreshed USD prices of %d rows in %d currencies", updated, len(codes))
+    return updated
+
+
+def backfill_usd_prices():
+    """Fill USD columns left NULL by rows written before they existed."""
+    with Session(engine) as session:
+        if refresh_usd_prices(session, only_missing=True):
+            bump_version(session)
+        session.commit()
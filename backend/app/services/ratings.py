@@ -0,0 +1,152 @@
+import logging
+from collections import Counter
+from typing import Iterable, Optional
+from sqlalchemy import Float, case, cast, func, update
+from sqlmodel import Session, select
+from app.models import Provider, Review
+from app.services.cache import TTLCache
+from app.services.catalog import bump_version, record_changes
+
+logger = logging.getLogger("llm_price_hub.ratings")
+
+RATING_VALUES = (1, 2, 3, 4, 5)
+
+# Per-provider summaries served by the public reviews API
+summary_cache = TTLCache(ttl=30, maxsize=4096)
+
+
+def _histogram_column(rating: int):
+    return getattr(Provider, f"rating_hist_{rating}")
+
+
+def _avg_score_expr():
+    return case(
+        (
+            Provider.rating_count > 0,
+            cast(Provider.rating_sum, Float) / Provider.rating_count,
+        ),
+        else_=0.0,
+    )
+
+
+def apply_rating_delta(
+    session: Session,
+    provider_id: int,
+    added: Iterable[int] = (),
+    removed: Iterable[int] = (),
+):
+    """Adjust a provider's review aggregates in SQL without loading reviews.
+
+    Runs inside the caller's transaction so the aggregate changes commit
+    together with the review rows. ``avg_score`` is refreshed in a second
+    statement because MySQL evaluates SET clauses left to right while other
+    databases use the pre-update values.
+    """
+    delta = Counter(added)
+    delta.subtract(Counter(removed))
+    delta = {rating: n for rating, n in delta.items() if n}
+    if not delta:
+        return
+
+    values = {
+        "rating_sum": Provider.rating_sum + sum(r * n for r, n in delta.items()),
+        "rating_count": Provider.rating_count + sum(delta.values()),
+    }
+    for rating, n in delta.items():
+        column = _histogram_column(rating)
+        values[column.key] = column + n
+
+    session.exec(update(Provider).where(Provider.id == provider_id).values(**values))
+    session.exec(
+        update(Provider)
+        .where(Provider.id == provider_id)
+        .values(avg_score=_avg_score_expr())
+    )
+    record_changes(session, "provider", [provider_id])
+    bump_version(session)
+
+
+def record_review_added(session: Session, provider_id: int, rating: int):
+    apply_rating_delta(session, provider_id, added=[rating])
+
+
+def record_reviews_removed(session: Session, provider_id: int, ratings: list[int]):
+    apply_rating_delta(session, provider_id, removed=ratings)
+
+
+def invalidate_rating_summary(provider_id: Optional[int] = None):
+    """Drop cached summaries; call after the review write has committed."""
+    if provider_id is None:
+        summary_cache.invalidate()
+    else:
+        summary_cache.invalidate(provider_id)
+
+
+def get_rating_summary(session: Session, provider_id: int) -> Optional[dict]:
+    """Histogram, average and count read from the provider's aggregates."""
+    summary = summary_cache.get(provider_id)
+    if summary is not None:
+        return summary
+
+    row = session.exec(
+        select(
+            Provider.rating_count,
+            Provider.avg_score,
+            *(_histogram_column(r) for r in RATING_VALUES),
+        ).where(Provider.id == provider_id)
+    ).first()
+    if row is None:
+        return None
+
+    count, average, *histogram = row
+    summary = {
+        "provider_id": provider_id,
+        "count": count,
+        "average": round(average, 3) if count else None,
+        "histogram": {str(r): n for r, n in zip(RATING_VALUES, histogram)},
+    }
+    summary_cache.set(provider_id, summary)
+    return summary
+
+
+def rebuild_provider_ratings(session: Session) -> int:
+    """Recompute every provider's aggregates from one GROUP BY over reviews.
+
+    Only providers whose stored aggregates drifted are written. Returns the
+    number of providers corrected; the caller commits.
+    """
+    expected: dict[int, dict[int, int]] = {}
+    for provider_id, rating, n in session.exec(
+        select(Review.provider_id, Review.rating, func.count(Review.id)).group_by(
+            Review.provider_id, Review.rating
+        )
+    ):
+        expected.setdefault(provider_id, {})[rating] = n
+
+    hist_columns = [_histogram_column(r) for r in RATING_VALUES]
+    fixes = []
+    for provider_id, rating_sum, rating_count, *histogram in session.exec(
+        select(Provider.id, Provider.rating_sum, Provider.rating_count, *hist_columns)
+    ):
+        counts = expected.get(provider_id, {})
+        want_hist = [counts.get(r, 0) for r in RATING_VALUES]
+        want_count = sum(want_hist)
+        want_sum = sum(r * n for r, n in counts.items())
+        if [rating_sum, rating_count, *histogram] == [want_sum, want_count, *want_hist]:
+            continue
+        fix = {
+            "id": provider_id,
+            "rating_sum": want_sum,
+            "rating_count": want_count,
+            "avg_score": want_sum / want_count if want_count else 0.0,
+        }
+        fix.update({c.key: n for c, n in zip(hist_columns, want_hist)})
+        fixes.append(fix)
+
+    if fixes:
+        session.exec(update(Provider), params=fixes)
+        record_changes(session, "provider", [fix["id"] for fix in fixes])
+        bump_version(session)
+        logger.info("Corrected rating aggregates for %d providers", len(fixes))
+        invalidate_rating_summary()
+    return len(fixes)
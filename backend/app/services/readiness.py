@@ -0,0 +1,129 @@
+import logging
+import sys
+import threading
+import time
+from typing import Callable, Optional
+
+from sqlalchemy import text
+
+from app.database import engine
+
+logger = logging.getLogger("llm_price_hub.readiness")
+
+# Warmup tasks run once, in registration order, on a background thread after
+# startup so that slow or unreachable dependencies never delay serving.
+_warmups: list[tuple[str, Callable[[], None]]] = []
+# Tasks whose failure is reported but does not fail readiness
+_optional: set[str] = set()
+_lock = threading.Lock()
+_state = {
+    "import_started_at": None,
+    "startup_at": None,
+    "ready_at": None,
+    "warmup": {},
+}
+
+
+def mark_import_started(perf_counter_value: float):
+    _state["import_started_at"] = perf_counter_value
+
+
+def register_warmup(name: str, func: Callable[[], None], required: bool = True):
+    """Register a callable to run during background warmup.
+
+    A failed ``required`` task keeps /readyz failing; an optional one is only
+    listed in the report.
+    """
+    _warmups[:] = [(n, f) for n, f in _warmups if n != name]
+    _warmups.append((name, func))
+    if required:
+        _optional.discard(name)
+    else:
+        _optional.add(name)
+
+
+def _run_warmups():
+    for name, func in _warmups:
+        started = time.perf_counter()
+        with _lock:
+            _state["warmup"][name] = {"status": "running"}
+        try:
+            func()
+            status = "ok"
+        except Exception as e:
+            logger.error("Warmup task %s failed: %s", name, e)
+            status = "failed"
+        with _lock:
+            _state["warmup"][name] = {
+                "status": status,
+                "duration_s": round(time.perf_counter() - started, 4),
+            }
+
+    with _lock:
+        _state["ready_at"] = time.perf_counter()
+    elapsed = import_to_ready_seconds()
+    if elapsed is not None:
+        logger.info("Application ready %.3fs after import", elapsed)
+
+
+def mark_recovered(name: str):
+    """Mark a failed warmup task as ok once it later succeeds elsewhere."""
+    with _lock:
+        info = _state["warmup"].get(name)
+        if info is not None and info["status"] == "failed":
+            info["status"] = "ok"
+            info["recovered"] = True
+
+
+def start_background_warmup():
+    _state["startup_at"] = time.perf_counter()
+    with _lock:
+        for name, _ in _warmups:
+            _state["warmup"][name] = {"status": "pending"}
+    thread = threading.Thread(target=_run_warmups, name="warmup", daemon=True)
+    thread.start()
+    return thread
+
+
+def import_to_ready_seconds() -> Optional[float]:
+    started = _state["import_started_at"]
+    ready = _state["ready_at"]
+    if started is None or ready is None:
+        return None
+    return round(ready - started, 4)
+
+
+def check_database() -> bool:
+    try:
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+        return True
+    except Exception as e:
+        logger.warning("Database health check failed: %s", e)
+        return False
+
+
+def scheduler_state() -> str:
+    # Only inspect the scheduler if startup already imported it
+    module = sys.modules.get("app.services.scheduler")
+    if module is None:
+        return "not_started"
+    return "running" if module.scheduler.running else "stopped"
+
+
+def report() -> dict:
+    """Collect the health report shared by /healthz and /readyz."""
+    with _lock:
+        warmup = {name: dict(info) for name, info in _state["warmup"].items()}
+        warm = _state["ready_at"] is not None
+    failed = [name for name, info in warmup.items() if info["status"] == "failed"]
+
+    return {
+        "database": check_database(),
+        "cache_warm": warm,
+        "warmup": warmup,
+        "failed_warmups": failed,
+        "blocking_warmups": [name for name in failed if name not in _optional],
+        "scheduler": scheduler_state(),
+        "import_to_ready_s": import_to_ready_seconds(),
+    }
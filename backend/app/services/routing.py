@@ -0,0 +1,180 @@
+"""In-memory routing index for LLM gateways.
+
+For each standard model the index keeps its candidate provider endpoints
+pre-sorted by USD input price (then output price), with a parallel list of
+prices so a price ceiling is a single ``bisect``. Lookups never touch the
+database. The index follows the price table: on every rebuild only models
+whose rows or providers changed are recompiled, the rest are reused.
+"""
+
+import logging
+import threading
+from bisect import bisect_right
+from dataclasses import dataclass
+from typing import Optional
+import numpy as np
+from app.services import price_table
+from app.services.price_table import PriceTable
+
+logger = logging.getLogger("llm_price_hub.routing")
+
+API_KINDS = ("openai", "gemini", "claude")
+
+
+@dataclass(frozen=True)
+class ModelRoutes:
+    signature: int
+    provider_ids: frozenset
+    input_prices: list  # ascending, parallel to candidates
+    candidates: list  # response-ready dicts
+
+
+@dataclass(frozen=True)
+class RoutingIndex:
+    version: int
+    models: dict  # model id -> ModelRoutes
+
+    def route(
+        self,
+        model_id: int,
+        max_price_in: Optional[float] = None,
+        max_price_out: Optional[float] = None,
+        min_uptime: Optional[float] = None,
+        api: Optional[str] = None,
+        limit: int = 3,
+    ) -> Optional[list]:
+        """Cheapest candidates within the constraints; None for unknown models."""
+        routes = self.models.get(model_id)
+        if routes is None:
+            return None
+        end = (
+            len(routes.candidates)
+            if max_price_in is None
+            else bisect_right(routes.input_prices, max_price_in)
+        )
+        picked = []
+        for candidate in routes.candidates[:end]:
+            if max_price_out is not None and candidate["output_price_usd"] > max_price_out:
+                continue
+            if min_uptime is not None and candidate["uptime"] < min_uptime:
+                continue
+            if api is not None and not candidate["endpoints"][api]:
+                continue
+            picked.append(candidate)
+            if len(picked) >= limit:
+                break
+        return picked
+
+
+def _compile_model(table: PriceTable, rows: np.ndarray, signature: int) -> ModelRoutes:
+    rows = rows[np.lexsort((table.output_usd[rows], table.input_usd[rows]))]
+    candidates = []
+    for i in rows.tolist():
+        provider_id = int(table.provider_id[i])
+        endpoints = table.provider_endpoints.get(provider_id, (None, None, None))
+        candidates.append(
+            {
+                "provider_id": provider_id,
+                "provider_name": table.provider_names.get(provider_id),
+                "provider_model_name": table.provider_model_name[i],
+                "price_id": int(table.price_id[i]),
+                "input_price_usd": float(table.input_usd[i]),
+                "output_price_usd": float(table.output_usd[i]),
+                "uptime": float(table.uptime[i]),
+                "provider_score": float(table.score[i]),
+                "endpoints": dict(zip(API_KINDS, endpoints)),
+            }
+        )
+    return ModelRoutes(
+        signature=signature,
+        provider_ids=frozenset(table.provider_id[rows].tolist()),
+        input_prices=[c["input_price_usd"] for c in candidates],
+        candidates=candidates,
+    )
+
+
+def provider_info(table: PriceTable) -> dict:
+    """Per-provider fields copied into candidates, for change detection."""
+    return {
+        provider_id: (name, table.provider_endpoints.get(provider_id))
+        for provider_id, name in table.provider_names.items()
+    }
+
+
+def build_index(
+    table: PriceTable,
+    previous: Optional[RoutingIndex] = None,
+    previous_providers: Optional[dict] = None,
+) -> tuple[RoutingIndex, int]:
+    """Index for ``table``, reusing unchanged models from ``previous``.
+
+    A model is reused when its price rows hash the same and none of its
+    providers changed name or endpoints. Returns the index and the number
+    of models recompiled.
+    """
+    providers = provider_info(table)
+    if previous is None or previous_providers is None:
+        previous, changed_providers = None, set()
+    else:
+        changed_providers = {
+            provider_id
+            for provider_id in set(previous_providers) | set(providers)
+            if previous_providers.get(provider_id) != providers.get(provider_id)
+        }
+
+    order = np.argsort(table.model_id, kind="stable")
+    model_ids, starts = np.unique(table.model_id[order], return_index=True)
+    bounds = list(starts[1:]) + [len(order)]
+
+    models, rebuilt = {}, 0
+    for model_id, start, end in zip(model_ids.tolist(), starts.tolist(), bounds):
+        rows = order[start:end]
+        signature = hash(
+            (
+                table.price_id[rows].tobytes(),
+                table.input_usd[rows].tobytes(),
+                table.output_usd[rows].tobytes(),
+                table.uptime[rows].tobytes(),
+                table.score[rows].tobytes(),
+                tuple(table.provider_model_name[i] for i in rows.tolist()),
+            )
+        )
+        old = previous.models.get(model_id) if previous else None
+        if (
+            old is not None
+            and old.signature == signature
+            and not (old.provider_ids & changed_providers)
+        ):
+            models[model_id] = old
+            continue
+        models[model_id] = _compile_model(table, rows, signature)
+        rebuilt += 1
+    return RoutingIndex(version=table.version, models=models), rebuilt
+
+
+_lock = threading.Lock()
+_index: Optional[RoutingIndex] = None
+_providers: Optional[dict] = None
+
+
+def _on_price_table_refresh(table: PriceTable):
+    global _index, _providers
+    with _lock:
+        index, rebuilt = build_index(table, _index, _providers)
+        _index, _providers = index, provider_info(table)
+    logger.info(
+        "Routing index v%d: %d of %d models recompiled",
+        index.version,
+        rebuilt,
+        len(index.models),
+    )
+
+
+def get_index() -> RoutingIndex:
+    table = price_table.get_price_table()
+    if _index is None or _index.version != table.version:
+        _on_price_table_refresh(table)
+    return _index
+
+
+price_table.add_refresh_listener(_on_price_table_refresh)
@@ -2,7 +2,11 @@ from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from sqlmodel import Session, select
 from app.database import engine
 from app.models import CurrencyRate, ModelPrice, PriceStatus, Provider, SystemSetting
-import httpx
+from app.services.catalog import bump_version
+from app.services.price_history import record_price_event
+from app.services import readiness
+from app.services.pricing import refresh_usd_prices
+from app.services.webhooks import deliver_pending, enqueue_price_events, purge_outbox
 from datetime import datetime, timedelta
 import logging
 
@@ -10,13 +14,16 @@ logger = logging.getLogger("scheduler")
 
 scheduler = AsyncIOScheduler()
 
+# Seconds before giving up on the exchange rate API
+RATE_API_TIMEOUT = 10.0
+
 
 def get_db_session():
     return Session(engine)
 
 
-def update_exchange_rates():
-    """Fetch rates from public API and update DB."""
+def update_exchange_rates() -> bool:
+    """Fetch rates from public API and update DB. Returns False if it failed."""
     try:
         url = "https://api.exchangerate-api.com/v4/latest/USD"
         api_key = ""
@@ -37,11 +44,13 @@ def update_exchange_rates():
         if "{KEY}" in url and api_key:
             url = url.replace("{KEY}", api_key)
 
-        with httpx.Client() as client:
+        import httpx
+
+        with httpx.Client(timeout=RATE_API_TIMEOUT) as client:
             resp = client.get(url)
             if resp.status_code != 200:
                 logger.error(f"Exchange rate API returned {resp.status_code}")
-                return
+                return False
 
             data = resp.json()
             # Support standard format (rates or conversion_rates)
@@ -59,6 +68,7 @@ def update_exchange_rates():
                 rates["USD"] = 1.0
 
         with get_db_session() as session:
+            changed = []
             for code, rate in rates.items():
                 if len(code) > 10:
                     continue
@@ -66,16 +76,30 @@ def update_exchange_rates():
                 # Upsert logic
                 existing = session.get(CurrencyRate, code)
                 if existing:
-                    existing.rate_to_usd = rate
-                    existing.updated_at = datetime.utcnow()
-                    session.add(existing)
+                    # Unchanged rows are left alone so the catalog version
+                    # (and every ETag) survives a refresh with no new rates
+                    if existing.rate_to_usd != rate:
+                        changed.append(code)
+                        existing.rate_to_usd = rate
+                        existing.updated_at = datetime.utcnow()
+                        session.add(existing)
                 else:
                     new_rate = CurrencyRate(code=code, rate_to_usd=rate)
                     session.add(new_rate)
+                    changed.append(code)
+            session.flush()
+            # USD-normalized price columns follow the new rates atomically
+            if changed:
+                refresh_usd_prices(session, changed)
+                bump_version(session)
             session.commit()
         logger.info("Updated exchange rates")
     except Exception as e:
         logger.error(f"Failed to update rates: {e}")
+        return False
+    # A later scheduled run makes up for a failed startup sync
+    readiness.mark_recovered("exchange_rates")
+    return True
 
 
 def reschedule_exchange_job():
@@ -119,15 +143,24 @@ def expire_old_prices():
             for price in results:
                 price.status = PriceStatus.expired
                 session.add(price)
+                record_price_event(session, price, "expired")
+            enqueue_price_events(session, results, "expired")
+            if results:
+                bump_version(session)
             session.commit()
             logger.info(f"Expired {len(results)} prices")
     except Exception as e:
         logger.error(f"Failed to expire prices: {e}")
 
 
-def check_one_provider(provider_id: int, url: str):
-    """Check a single provider and update stats. (To be run potentially in parallel or sequential)"""
+def check_one_provider(provider_id: int, url: str) -> bool:
+    """Check a single provider and update stats. (To be run potentially in parallel or sequential)
+
+    Returns True if the stored uptime rate changed.
+    """
     # Simple check
+    import httpx
+
     success = False
     try:
         if not url.startswith("http"):
@@ -142,13 +175,18 @@ def check_one_provider(provider_id: int, url: str):
 
     with get_db_session() as session:
         provider = session.get(Provider, provider_id)
-        if provider:
-            # Moving average calculation
-            current_val = 100.0 if success else 0.0
-            # Alpha = 0.1 for smoothing
-            provider.uptime_rate = (provider.uptime_rate * 0.9) + (current_val * 0.1)
-            session.add(provider)
-            session.commit()
+        if not provider:
+            return False
+        # Moving average calculation
+        current_val = 100.0 if success else 0.0
+        # Alpha = 0.1 for smoothing
+        uptime_rate = (provider.uptime_rate * 0.9) + (current_val * 0.1)
+        if uptime_rate == provider.uptime_rate:
+            return False
+        provider.uptime_rate = uptime_rate
+        session.add(provider)
+        session.commit()
+        return True
 
 
 def check_uptime():
@@ -156,16 +194,188 @@ def check_uptime():
     try:
         with get_db_session() as session:
             providers = session.exec(select(Provider)).all()
+            changed = False
             for p in providers:
                 if p.website:
-                    check_one_provider(p.id, p.website)
+                    changed = check_one_provider(p.id, p.website) or changed
+            # One version bump per sweep rather than per provider
+            if changed:
+                bump_version(session)
+                session.commit()
         logger.info("Checked provider uptime")
     except Exception as e:
         logger.error(f"Failed provider uptime check: {e}")
 
 
-# Schedule Jobs
-# Default schedule; can be rescheduled via admin settings
-scheduler.add_job(update_exchange_rates, "interval", hours=4, id="exchange_rates")
-scheduler.add_job(expire_old_prices, "cron", hour=0)  # Daily
-scheduler.add_job(check_uptime, "interval", minutes=30)
+def repair_provider_ratings():
+    """Rebuild provider rating aggregates to correct any drift."""
+    from app.services.ratings import rebuild_provider_ratings
+
+    try:
+        with get_db_session() as session:
+            corrected = rebuild_provider_ratings(session)
+            session.commit()
+        logger.info(f"Repaired rating aggregates for {corrected} providers")
+    except Exception as e:
+        logger.error(f"Failed to repair provider ratings: {e}")
+
+
+def flush_popularity():
+    """Persist buffered model views collected by the compare endpoint."""
+    from app.services import popularity
+
+    try:
+        flushed = popularity.flush()
+        if flushed:
+            logger.debug(f"Flushed {flushed} model views")
+    except Exception as e:
+        logger.error(f"Failed to flush popularity counters: {e}")
+
+
+def decay_popularity():
+    """Apply time decay to model popularity scores."""
+    from app.services import popularity
+
+    try:
+        popularity.apply_decay()
+    except Exception as e:
+        logger.error(f"Failed to decay popularity scores: {e}")
+
+
+def refresh_price_table():
+    """Rebuild the in-memory price table when the catalog version moved."""
+    from app.services import price_table
+
+    try:
+        price_table.refresh()
+    except Exception as e:
+        logger.error(f"Failed to refresh price table: {e}")
+
+
+def compact_catalog_changes():
+    """Trim the catalog change log behind /api/changes."""
+    from app.services.changes import compact_changes
+
+    try:
+        compact_changes()
+    except Exception as e:
+        logger.error(f"Failed to compact catalog changes: {e}")
+
+
+async def deliver_webhooks():
+    """Send due webhook events from the outbox."""
+    try:
+        await deliver_pending()
+    except Exception as e:
+        logger.error(f"Failed to deliver webhooks: {e}")
+
+
+def purge_webhook_outbox():
+    try:
+        removed = purge_outbox()
+        logger.info(f"Purged {removed} webhook outbox rows")
+    except Exception as e:
+        logger.error(f"Failed to purge webhook outbox: {e}")
+
+
+def evaluate_price_watches():
+    """Email watchlist alerts for prices changed since the last run."""
+    from app.services.price_watch import evaluate_watches
+
+    try:
+        evaluate_watches()
+    except Exception as e:
+        logger.error(f"Failed to evaluate price watches: {e}")
+
+
+async def refresh_static_snapshots():
+    """Rewrite the home page snapshots under static/ after catalog changes."""
+    from app.services.snapshots import refresh_snapshots
+
+    try:
+        await refresh_snapshots()
+    except Exception as e:
+        logger.error(f"Failed to write static snapshots: {e}")
+
+
+def start_scheduler():
+    """Register the default jobs and start the scheduler."""
+    # Default schedule; can be rescheduled via admin settings
+    scheduler.add_job(
+        update_exchange_rates,
+        "interval",
+        hours=4,
+        id="exchange_rates",
+        replace_existing=True,
+    )
+    scheduler.add_job(
+        expire_old_prices, "cron", hour=0, id="expire_prices", replace_existing=True
+    )  # Daily
+    scheduler.add_job(
+        check_uptime, "interval", minutes=30, id="uptime", replace_existing=True
+    )
+    scheduler.add_job(
+        repair_provider_ratings,
+        "cron",
+        hour=3,
+        id="repair_ratings",
+        replace_existing=True,
+    )  # Daily
+    scheduler.add_job(
+        flush_popularity,
+        "interval",
+        seconds=30,
+        id="flush_popularity",
+        replace_existing=True,
+    )
+    scheduler.add_job(
+        decay_popularity, "interval", hours=1, id="decay_popularity", replace_existing=True
+    )
+    scheduler.add_job(
+        compact_catalog_changes,
+        "cron",
+        hour=4,
+        id="compact_catalog_changes",
+        replace_existing=True,
+    )  # Daily
+    scheduler.add_job(
+        deliver_webhooks,
+        "interval",
+        seconds=2,
+        id="deliver_webhooks",
+        max_instances=1,
+        coalesce=True,
+        replace_existing=True,
+    )
+    scheduler.add_job(
+        purge_webhook_outbox,
+        "cron",
+        hour=5,
+        id="purge_webhook_outbox",
+        replace_existing=True,
+    )  # Daily
+    scheduler.add_job(
+        evaluate_price_watches,
+        "interval",
+        minutes=1,
+        id="price_watches",
+        max_instances=1,
+        replace_existing=True,
+    )
+    scheduler.add_job(
+        refresh_price_table,
+        "interval",
+        seconds=5,
+        id="refresh_price_table",
+        replace_existing=True,
+    )
+    scheduler.add_job(
+        refresh_static_snapshots,
+        "interval",
+        seconds=5,
+        id="static_snapshots",
+        max_instances=1,
+        coalesce=True,
+        replace_existing=True,
+    )
+    scheduler.start()
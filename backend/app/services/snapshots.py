@@ -0,0 +1,246 @@
+"""Pre-rendered static snapshots of the public home page data.
+
+The payloads every anonymous visitor of the home page loads (model list,
+providers, currencies and the highlights in each common currency) are
+rendered by calling the route handlers directly and encoding their results
+with the API's serializer, so they match the API byte for byte without
+going through the HTTP stack. They are written under ``static/snapshots``
+as pre-compressed ``<name>.<hash>.json.br`` / ``.json.gz`` files;
+``manifest.json`` maps each payload name to its current
+``<name>.<hash>.json`` URL, and nginx (or the ``/static`` mount) picks the
+compressed variant the client accepts. Hashed files never change, so they
+can be cached forever. Every file is written to a temporary name and
+renamed into place, and workers take a file lock on the directory so only
+one of them writes a given generation.
+
+A generation is the catalog data version plus the popularity epoch (the
+model list and highlights carry and are ordered by popularity, which is
+kept out of the catalog version). Writes are debounced: a new generation is
+written once it has been stable for ``DEBOUNCE_SECONDS``, or at the latest
+``MAX_DELAY_SECONDS`` after the first unwritten change. Rate refreshes bump
+the version too, so they trigger a write as well.
+"""
+
+import asyncio
+import gzip
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Optional
+from sqlmodel import Session
+from app.database import engine
+from app.responses import dumps
+from app.services import catalog, popularity
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - .gz only
+    brotli = None
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - no cross-process lock on Windows
+    fcntl = None
+
+logger = logging.getLogger("llm_price_hub.snapshots")
+
+SNAPSHOT_DIR = os.path.join("static", "snapshots")
+MANIFEST_NAME = "manifest.json"
+LOCK_NAME = ".lock"
+# The home page requests the highlights without a limit, i.e. the default
+HIGHLIGHTS_LIMIT = 8
+DEBOUNCE_SECONDS = float(os.getenv("SNAPSHOT_DEBOUNCE_SECONDS", "10"))
+MAX_DELAY_SECONDS = float(os.getenv("SNAPSHOT_MAX_DELAY_SECONDS", "60"))
+# Leftover temporary files older than this are removed
+STALE_TEMP_SECONDS = 3600
+
+_lock = threading.Lock()
+# (catalog version, popularity epoch) written last / waiting to be written
+_written: Optional[tuple] = None
+_pending: Optional[tuple] = None
+_pending_since = 0.0
+_first_pending = 0.0
+
+
+def _atomic_write(path: str, data: bytes):
+    directory = os.path.dirname(path)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def _write_payload(directory: str, name: str, body: bytes) -> str:
+    """Write the compressed variants of ``body``; returns its ``.json`` file name."""
+    digest = hashlib.sha256(body).hexdigest()[:16]
+    file_name = f"{name}.{digest}.json"
+    variants = [(".gz", lambda: gzip.compress(body, compresslevel=9, mtime=0))]
+    if brotli is not None:
+        variants.append((".br", lambda: brotli.compress(body, quality=11)))
+    for suffix, compress in variants:
+        path = os.path.join(directory, file_name + suffix)
+        # Same name, same content: already written by an earlier run
+        if not os.path.exists(path):
+            _atomic_write(path, compress())
+    return file_name
+
+
+def read_manifest(directory: str = SNAPSHOT_DIR) -> Optional[dict]:
+    try:
+        with open(os.path.join(directory, MANIFEST_NAME), "rb") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _remove_unreferenced(directory: str, keep: set):
+    now = time.time()
+    for entry in os.scandir(directory):
+        if entry.name in (MANIFEST_NAME, LOCK_NAME) or not entry.is_file():
+            continue
+        if entry.name.startswith(".tmp-"):
+            if now - entry.stat().st_mtime > STALE_TEMP_SECONDS:
+                os.unlink(entry.path)
+        elif entry.name.rsplit(".", 1)[0] not in keep:
+            os.unlink(entry.path)
+
+
+async def _render_payloads() -> dict[str, bytes]:
+    """Public payloads as the API would send them, keyed by snapshot name."""
+    from fastapi.encoders import jsonable_encoder
+    from app.routers.config import list_public_providers
+    from app.routers.models import list_standard_models
+    from app.routers.prices import price_highlights
+    from app.routers.settings import get_currencies
+
+    with Session(engine) as session:
+        # Handlers returning plain content are encoded like FastAPI does
+        currencies = await get_currencies(session=session)
+        payloads = {
+            "models": dumps(list_standard_models(session)),
+            "providers": dumps(list_public_providers(session)),
+            "currencies": dumps(jsonable_encoder(currencies)),
+        }
+        for currency in currencies:
+            if currency["is_common"]:
+                highlights = await price_highlights(
+                    limit=HIGHLIGHTS_LIMIT,
+                    target_currency=currency["code"],
+                    session=session,
+                )
+                payloads[f"highlights.{currency['code']}"] = dumps(
+                    jsonable_encoder(highlights)
+                )
+    return payloads
+
+
+@contextmanager
+def _directory_lock(directory: str):
+    """Exclusive lock on ``directory`` shared by all workers."""
+    if fcntl is None:
+        yield
+        return
+    with open(os.path.join(directory, LOCK_NAME), "a") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def _generation(manifest: dict) -> tuple:
+    return manifest.get("catalog_version"), manifest.get("popularity_epoch")
+
+
+def write_snapshot_files(
+    payloads: dict[str, bytes], generation: tuple, directory: str = SNAPSHOT_DIR
+) -> dict:
+    """Write ``payloads`` and a new manifest; returns the manifest."""
+    os.makedirs(directory, exist_ok=True)
+    previous = read_manifest(directory)
+    files = {name: _write_payload(directory, name, body) for name, body in payloads.items()}
+    manifest = {
+        "catalog_version": generation[0],
+        "popularity_epoch": generation[1],
+        "generated_at": datetime.utcnow().isoformat(),
+        "files": files,
+    }
+    _atomic_write(
+        os.path.join(directory, MANIFEST_NAME),
+        json.dumps(manifest, separators=(",", ":")).encode(),
+    )
+    # Clients holding the previous manifest can still fetch its files
+    keep = set(files.values()) | set((previous or {}).get("files", {}).values())
+    _remove_unreferenced(directory, keep)
+    return manifest
+
+
+def _write_locked(generation: tuple, directory: str = SNAPSHOT_DIR) -> dict:
+    os.makedirs(directory, exist_ok=True)
+    with _directory_lock(directory):
+        current = read_manifest(directory)
+        if current is not None and _generation(current) == generation:
+            # Another worker already wrote this generation
+            return current
+        # Handlers only touch the DB synchronously; give them a loop of their own
+        payloads = asyncio.run(_render_payloads())
+        return write_snapshot_files(payloads, generation, directory)
+
+
+async def write_snapshots(generation: tuple) -> dict:
+    # Rendering and brotli at quality 11 block; keep them off the event loop
+    return await asyncio.to_thread(_write_locked, generation)
+
+
+def _due(generation: tuple, now: float) -> bool:
+    """Debounce state machine: is ``generation`` due to be written at ``now``?"""
+    global _written, _pending, _pending_since, _first_pending
+    with _lock:
+        if _written is None:
+            manifest = read_manifest()
+            if manifest is None:
+                # Nothing on disk yet: write right away
+                return True
+            _written = _generation(manifest)
+        if generation == _written:
+            return False
+        if _pending is None:
+            _first_pending = now
+        if generation != _pending:
+            _pending, _pending_since = generation, now
+        return (
+            now - _pending_since >= DEBOUNCE_SECONDS
+            or now - _first_pending >= MAX_DELAY_SECONDS
+        )
+
+
+async def refresh_snapshots() -> bool:
+    """Write new snapshots if the catalog changed and settled; True if written."""
+    global _written, _pending
+    version = await asyncio.to_thread(catalog.current_version)
+    generation = (version, popularity.epoch())
+    if not _due(generation, time.monotonic()):
+        return False
+    started = time.perf_counter()
+    manifest = await write_snapshots(generation)
+    with _lock:
+        _written, _pending = generation, None
+    logger.info(
+        "Wrote %d static snapshots for catalog v%d in %.0f ms",
+        len(manifest["files"]),
+        version,
+        (time.perf_counter() - started) * 1000,
+    )
+    return True
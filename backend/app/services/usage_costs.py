@@ -0,0 +1,283 @@
+"""Cost of usage events against the price table snapshot.
+
+Events arrive as NDJSON objects with ``provider_id``, ``model`` (the
+provider's model name), ``input_tokens``, ``output_tokens``,
+``cached_tokens`` (the part of the input billed at the cache-hit price),
+``ts`` and ``currency``. They are costed in chunks: each chunk is resolved
+to price table rows through the billing lookup index and priced with array
+arithmetic. With ``at_event_time`` the input and output prices come from
+the price history entry in force at each event's timestamp.
+"""
+
+import json
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Callable, Optional
+import numpy as np
+from sqlmodel import Session, select
+from app.models import PriceHistory
+from app.services.price_table import PriceTable
+from app.services.workload import TOKENS_PER_UNIT
+
+try:
+    import orjson
+
+    _loads = orjson.loads
+
+    def _dumps(value) -> str:
+        return orjson.dumps(value).decode()
+
+except ImportError:  # pragma: no cover - optional speedup
+    _loads = json.loads
+    _dumps = json.dumps
+
+MAX_CHUNK_EVENTS = 8192
+
+
+def _epoch(value) -> float:
+    """Seconds since the epoch; naive datetimes are UTC like the database."""
+    if value is None:
+        return np.nan
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+@dataclass
+class UsageChunk:
+    rows: np.ndarray  # price table row per event, -1 when unknown
+    input_tokens: np.ndarray
+    output_tokens: np.ndarray
+    cached_tokens: np.ndarray
+    ts: np.ndarray  # epoch seconds, NaN when not given
+    currencies: list
+    errors: dict = field(default_factory=dict)  # position -> message
+
+    def __len__(self):
+        return len(self.rows)
+
+
+def parse_chunk(
+    lines: list[bytes],
+    index_rows: dict,
+    default_currency: str,
+    rate_map: dict,
+    with_ts: bool,
+) -> UsageChunk:
+    """Decode NDJSON lines; malformed events are recorded in ``errors``."""
+    n = len(lines)
+    rows = np.full(n, -1, dtype=np.int64)
+    tokens = np.zeros((3, n))
+    ts = np.full(n, np.nan)
+    currencies = [default_currency] * n
+    errors = {}
+    for i, line in enumerate(lines):
+        try:
+            event = _loads(line)
+            rows[i] = index_rows.get((event["provider_id"], event["model"]), -1)
+            tokens[0, i] = event.get("input_tokens") or 0
+            tokens[1, i] = event.get("output_tokens") or 0
+            tokens[2, i] = event.get("cached_tokens") or 0
+            # Also rejects NaN, which the stdlib decoder accepts
+            if not (tokens[:, i] >= 0).all():
+                raise ValueError("token counts must be non-negative")
+            currency = event.get("currency") or default_currency
+            if not isinstance(currency, str):
+                raise TypeError("currency must be a string")
+            currencies[i] = currency
+            if with_ts:
+                ts[i] = _epoch(event.get("ts"))
+        except (ValueError, TypeError, KeyError, AttributeError) as exc:
+            rows[i] = -1
+            currencies[i] = default_currency
+            errors[i] = f"Invalid event: {exc!r}"
+            continue
+        if currencies[i] not in rate_map:
+            rows[i] = -1
+            errors[i] = "Currency not supported"
+    return UsageChunk(
+        rows=rows,
+        input_tokens=tokens[0],
+        output_tokens=tokens[1],
+        cached_tokens=np.minimum(tokens[2], tokens[0]),
+        ts=ts,
+        currencies=currencies,
+        errors=errors,
+    )
+
+
+class HistoricalPrices:
+    """USD input/output prices per price id over time, loaded on demand."""
+
+    def __init__(self, session_factory: Callable[[], Session]):
+        self._session_factory = session_factory
+        # price id -> (ts, input_usd, output_usd), ts ascending
+        self._series: dict[int, tuple] = {}
+
+    def _load(self, price_ids: list[int]):
+        loaded = {price_id: ([], [], []) for price_id in price_ids}
+        with self._session_factory() as session:
+            for price_id, ts, price_in, price_out in session.exec(
+                select(
+                    PriceHistory.price_id,
+                    PriceHistory.ts,
+                    PriceHistory.input_price_usd,
+                    PriceHistory.output_price_usd,
+                )
+                .where(
+                    PriceHistory.price_id.in_(price_ids),
+                    PriceHistory.input_price_usd.is_not(None),
+                    PriceHistory.output_price_usd.is_not(None),
+                )
+                .order_by(PriceHistory.price_id, PriceHistory.ts, PriceHistory.id)
+            ):
+                series = loaded[price_id]
+                series[0].append(_epoch(ts))
+                series[1].append(price_in)
+                series[2].append(price_out)
+        for price_id, (ts, price_in, price_out) in loaded.items():
+            self._series[price_id] = (np.array(ts), np.array(price_in), np.array(price_out))
+
+    def apply(
+        self,
+        price_ids: np.ndarray,
+        ts: np.ndarray,
+        price_in: np.ndarray,
+        price_out: np.ndarray,
+    ):
+        """Replace prices in place with those in force at ``ts``.
+
+        Events before a price's first history entry use that entry; prices
+        without history and events without a timestamp keep their values.
+        """
+        dated = np.flatnonzero(~np.isnan(ts))
+        if not len(dated):
+            return
+        order = dated[np.argsort(price_ids[dated], kind="stable")]
+        ids, starts = np.unique(price_ids[order], return_index=True)
+        missing = [i for i in ids.tolist() if i not in self._series]
+        if missing:
+            self._load(missing)
+        for price_id, group in zip(ids.tolist(), np.split(order, starts[1:])):
+            series_ts, series_in, series_out = self._series[price_id]
+            if not len(series_ts):
+                continue
+            at = np.searchsorted(series_ts, ts[group], side="right") - 1
+            at = np.maximum(at, 0)
+            price_in[group] = series_in[at]
+            price_out[group] = series_out[at]
+
+
+def price_chunk(
+    table: PriceTable, chunk: UsageChunk, history: Optional[HistoricalPrices] = None
+) -> np.ndarray:
+    """USD cost of every event in the chunk; NaN where no price matched."""
+    if not len(table):
+        return np.full(len(chunk), np.nan)
+    matched = chunk.rows >= 0
+    rows = np.where(matched, chunk.rows, 0)
+    price_in = table.input_usd[rows]
+    price_out = table.output_usd[rows]
+    if history is not None:
+        dated = np.where(matched, chunk.ts, np.nan)
+        history.apply(table.price_id[rows], dated, price_in, price_out)
+    cache_in = table.cache_input_usd[rows]
+    cache_in = np.where(np.isnan(cache_in), price_in, cache_in)
+
+    cost = (
+        (chunk.input_tokens - chunk.cached_tokens) * price_in
+        + chunk.cached_tokens * cache_in
+        + chunk.output_tokens * price_out
+    ) / TOKENS_PER_UNIT
+    cost[~matched] = np.nan
+    return cost
+
+
+def cost_lines(
+    table: PriceTable,
+    chunk: UsageChunk,
+    cost_usd: np.ndarray,
+    rate: float,
+    seq: int,
+    running: float,
+) -> tuple[list[str], float]:
+    """NDJSON lines for a priced chunk, and the running total after it.
+
+    Each cost is in its event's currency; ``running_total`` is in the
+    currency of ``rate``. Lines are formatted directly, this is the hot loop.
+    """
+    totals = (running + np.nan_to_num(cost_usd * rate).cumsum()).tolist()
+    price_ids = table.price_id[np.maximum(chunk.rows, 0)].tolist() if len(table) else []
+    rate_map = table.rate_map
+    # Currency codes as JSON strings, escaped once per chunk
+    quoted = {code: _dumps(code) for code in set(chunk.currencies)}
+    lines = []
+    for i, cost in enumerate(cost_usd.tolist()):
+        if i in chunk.errors:
+            lines.append(
+                '{"type":"error","seq":%d,"detail":%s}'
+                % (seq + i, _dumps(chunk.errors[i]))
+            )
+        elif cost != cost:  # NaN: no price for this provider/model
+            lines.append(
+                '{"type":"cost","seq":%d,"price_id":null,"cost":null,'
+                '"currency":%s,"running_total":%r}'
+                % (seq + i, quoted[chunk.currencies[i]], totals[i])
+            )
+        else:
+            code = chunk.currencies[i]
+            lines.append(
+                '{"type":"cost","seq":%d,"price_id":%d,"cost":%r,'
+                '"currency":%s,"running_total":%r}'
+                % (seq + i, price_ids[i], cost * rate_map[code], quoted[code], totals[i])
+            )
+    return lines, (totals[-1] if totals else running)
+
+
+class UsageTotals:
+    """Running per-price aggregates over all chunks of a stream."""
+
+    def __init__(self, table: PriceTable):
+        size = len(table)
+        self.table = table
+        self.events = 0
+        self.unmatched = 0
+        self.cost_usd = 0.0
+        self._counts = np.zeros(size, dtype=np.int64)
+        self._sums = np.zeros((4, size))  # cost, input, output, cached
+
+    def add(self, chunk: UsageChunk, cost_usd: np.ndarray):
+        matched = np.flatnonzero(chunk.rows >= 0)
+        rows = chunk.rows[matched]
+        self.events += len(chunk)
+        self.unmatched += len(chunk) - len(matched)
+        self.cost_usd += float(cost_usd[matched].sum())
+        size = len(self._counts)
+        self._counts += np.bincount(rows, minlength=size)
+        for i, values in enumerate(
+            (cost_usd, chunk.input_tokens, chunk.output_tokens, chunk.cached_tokens)
+        ):
+            self._sums[i] += np.bincount(rows, weights=values[matched], minlength=size)
+
+    def by_price(self, rate: float) -> list[dict]:
+        table = self.table
+        used = np.flatnonzero(self._counts)
+        cost, input_tokens, output_tokens, cached_tokens = (s[used] for s in self._sums)
+        return [
+            {
+                "price_id": int(table.price_id[row]),
+                "provider_id": int(table.provider_id[row]),
+                "provider_model_name": table.provider_model_name[row],
+                "standard_model_id": int(table.model_id[row]),
+                "events": int(self._counts[row]),
+                "input_tokens": float(input_tokens[n]),
+                "output_tokens": float(output_tokens[n]),
+                "cached_tokens": float(cached_tokens[n]),
+                "cost": float(cost[n]) * rate,
+            }
+            for n, row in enumerate(used.tolist())
+        ]
@@ -0,0 +1,335 @@
+"""Webhook notifications of price events through a transactional outbox.
+
+Writers call ``enqueue_price_events`` in the transaction that approves,
+updates or expires a price, so an event is queued if and only if the change
+commits. The delivery job claims due outbox rows under a lease (so several
+workers can run it), POSTs them in signed batches per endpoint over one
+pooled ``httpx.AsyncClient``, and reschedules failures with exponential
+backoff. Endpoints that keep failing trip a circuit breaker and are skipped
+until it cools down; the first batch after that decides whether it closes.
+"""
+
+import asyncio
+import hashlib
+import hmac
+import json
+import logging
+import random
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Iterable, Optional
+from sqlalchemy import delete, insert, update
+from sqlmodel import Session, or_, select
+from app.database import engine
+from app.models import ModelPrice, WebhookOutbox, WebhookSubscription
+from app.responses import dumps
+from app.services.changes import PRICE_FIELDS
+
+logger = logging.getLogger("llm_price_hub.webhooks")
+
+BATCH_SIZE = 100  # events per POST
+CLAIM_LIMIT = 2000
+LEASE_SECONDS = 60
+MAX_ATTEMPTS = 10
+BACKOFF_BASE_SECONDS = 5
+BACKOFF_MAX_SECONDS = 3600
+BREAKER_THRESHOLD = 5
+BREAKER_OPEN_SECONDS = 60
+BREAKER_MAX_OPEN_SECONDS = 3600
+CONCURRENCY = 32
+REQUEST_TIMEOUT = 10.0
+SIGNATURE_HEADER = "X-PriceHub-Signature"
+TIMESTAMP_HEADER = "X-PriceHub-Timestamp"
+
+_outbox = WebhookOutbox.__table__
+
+
+def _id_set(raw: Optional[str]) -> Optional[set]:
+    return set(json.loads(raw)) if raw else None
+
+
+def sign(secret: str, timestamp: str, body: bytes) -> str:
+    """``sha256=<hex>`` HMAC of ``"<timestamp>." + body``."""
+    digest = hmac.new(secret.encode(), timestamp.encode() + b"." + body, hashlib.sha256)
+    return "sha256=" + digest.hexdigest()
+
+
+def enqueue_price_events(session: Session, prices: Iterable[ModelPrice], event: str):
+    """Queue ``price.<event>`` for every matching subscription (caller commits)."""
+    prices = list(prices)
+    if not prices:
+        return
+    subscriptions = [
+        (sub.id, _id_set(sub.model_ids), _id_set(sub.provider_ids))
+        for sub in session.exec(
+            select(WebhookSubscription).where(WebhookSubscription.is_active == True)
+        )
+    ]
+    if not subscriptions:
+        return
+
+    now = datetime.utcnow()
+    rows = []
+    for price in prices:
+        # Datetimes in ISO 8601, like the API responses
+        payload = dumps(
+            {
+                "event": f"price.{event}",
+                "occurred_at": now,
+                "price": {name: getattr(price, name) for name in PRICE_FIELDS},
+            }
+        ).decode()
+        for subscription_id, model_ids, provider_ids in subscriptions:
+            if model_ids is not None and price.standard_model_id not in model_ids:
+                continue
+            if provider_ids is not None and price.provider_id not in provider_ids:
+                continue
+            rows.append(
+                {
+                    "subscription_id": subscription_id,
+                    "event": f"price.{event}",
+                    "payload": payload,
+                    "status": "pending",
+                    "attempts": 0,
+                    "next_attempt_at": now,
+                    "created_at": now,
+                }
+            )
+    if rows:
+        session.connection().execute(insert(_outbox), rows)
+
+
+@dataclass
+class EndpointWork:
+    subscription_id: int
+    url: str
+    secret: str
+    ids: list = field(default_factory=list)
+    attempts: list = field(default_factory=list)
+    payloads: list = field(default_factory=list)
+
+
+@dataclass
+class EndpointResult:
+    subscription_id: int
+    delivered: list = field(default_factory=list)
+    failed: list = field(default_factory=list)  # (id, attempts) tried and failed
+    untried: list = field(default_factory=list)
+    error: Optional[str] = None
+
+
+def claim_due(limit: int = CLAIM_LIMIT) -> list[EndpointWork]:
+    """Lease due outbox rows of endpoints whose circuit is closed."""
+    now = datetime.utcnow()
+    owner = uuid.uuid4().hex
+    with Session(engine) as session:
+        ids = session.exec(
+            select(WebhookOutbox.id)
+            .join(WebhookSubscription, WebhookOutbox.subscription_id == WebhookSubscription.id)
+            .where(
+                WebhookOutbox.status == "pending",
+                WebhookOutbox.next_attempt_at <= now,
+                or_(WebhookOutbox.lease_until.is_(None), WebhookOutbox.lease_until < now),
+                WebhookSubscription.is_active == True,
+                or_(
+                    WebhookSubscription.circuit_open_until.is_(None),
+                    WebhookSubscription.circuit_open_until <= now,
+                ),
+            )
+            .order_by(WebhookOutbox.id)
+            .limit(limit)
+        ).all()
+        if not ids:
+            return []
+        # Conditional on the lease still being free, so concurrent workers
+        # never both take a row
+        session.exec(
+            update(WebhookOutbox)
+            .where(
+                WebhookOutbox.id.in_(ids),
+                or_(WebhookOutbox.lease_until.is_(None), WebhookOutbox.lease_until < now),
+            )
+            .values(lease_owner=owner, lease_until=now + timedelta(seconds=LEASE_SECONDS))
+        )
+        session.commit()
+
+        work: dict[int, EndpointWork] = {}
+        rows = session.exec(
+            select(
+                WebhookOutbox.id,
+                WebhookOutbox.subscription_id,
+                WebhookOutbox.attempts,
+                WebhookOutbox.payload,
+                WebhookSubscription.url,
+                WebhookSubscription.secret,
+            )
+            .join(WebhookSubscription, WebhookOutbox.subscription_id == WebhookSubscription.id)
+            .where(WebhookOutbox.lease_owner == owner)
+            .order_by(WebhookOutbox.id)
+        )
+        for outbox_id, subscription_id, attempts, payload, url, secret in rows:
+            item = work.get(subscription_id)
+            if item is None:
+                item = work[subscription_id] = EndpointWork(subscription_id, url, secret)
+            item.ids.append(outbox_id)
+            item.attempts.append(attempts)
+            item.payloads.append(payload)
+    return list(work.values())
+
+
+def _batch_body(ids: list, payloads: list) -> bytes:
+    events = ",".join(
+        '{"delivery_id":%d,%s' % (outbox_id, payload[1:])
+        for outbox_id, payload in zip(ids, payloads)
+    )
+    return ('{"events":[' + events + "]}").encode()
+
+
+async def deliver_endpoint(client, work: EndpointWork) -> EndpointResult:
+    """POST the endpoint's events in batches; stop at the first failure."""
+    result = EndpointResult(work.subscription_id)
+    for start in range(0, len(work.ids), BATCH_SIZE):
+        ids = work.ids[start : start + BATCH_SIZE]
+        attempts = work.attempts[start : start + BATCH_SIZE]
+        if result.error is not None:
+            result.untried.extend(ids)
+            continue
+        body = _batch_body(ids, work.payloads[start : start + BATCH_SIZE])
+        timestamp = str(int(time.time()))
+        try:
+            response = await client.post(
+                work.url,
+                content=body,
+                headers={
+                    "Content-Type": "application/json",
+                    TIMESTAMP_HEADER: timestamp,
+                    SIGNATURE_HEADER: sign(work.secret, timestamp, body),
+                },
+            )
+            if response.status_code < 300:
+                result.delivered.extend(ids)
+                continue
+            result.error = f"HTTP {response.status_code}"
+        except Exception as e:
+            result.error = f"{type(e).__name__}: {e}"[:255]
+        result.failed.extend(zip(ids, attempts))
+    return result
+
+
+def backoff_seconds(attempts: int) -> float:
+    """Delay before retry number ``attempts``, with +-20% jitter."""
+    delay = min(BACKOFF_BASE_SECONDS * 2 ** (attempts - 1), BACKOFF_MAX_SECONDS)
+    return delay * random.uniform(0.8, 1.2)
+
+
+def record_results(results: list[EndpointResult]):
+    now = datetime.utcnow()
+    released = {"lease_owner": None, "lease_until": None}
+    with Session(engine) as session:
+        for result in results:
+            if result.delivered:
+                session.exec(
+                    update(WebhookOutbox)
+                    .where(WebhookOutbox.id.in_(result.delivered))
+                    .values(status="delivered", delivered_at=now, **released)
+                )
+            if result.untried:
+                session.exec(
+                    update(WebhookOutbox)
+                    .where(WebhookOutbox.id.in_(result.untried))
+                    .values(**released)
+                )
+            for outbox_id, attempts in result.failed:
+                attempts += 1
+                session.exec(
+                    update(WebhookOutbox)
+                    .where(WebhookOutbox.id == outbox_id)
+                    .values(
+                        attempts=attempts,
+                        status="dead" if attempts >= MAX_ATTEMPTS else "pending",
+                        next_attempt_at=now + timedelta(seconds=backoff_seconds(attempts)),
+                        **released,
+                    )
+                )
+
+            subscription = session.get(WebhookSubscription, result.subscription_id)
+            if subscription is None:
+                continue
+            if result.error is None:
+                subscription.consecutive_failures = 0
+                subscription.circuit_open_until = None
+                subscription.last_success_at = now
+            else:
+                subscription.consecutive_failures += 1
+                subscription.last_error = result.error
+                over = subscription.consecutive_failures - BREAKER_THRESHOLD
+                if over >= 0:
+                    open_for = min(BREAKER_OPEN_SECONDS * 2**over, BREAKER_MAX_OPEN_SECONDS)
+                    subscription.circuit_open_until = now + timedelta(seconds=open_for)
+                    logger.warning(
+                        "Webhook %d circuit open for %ds after %d failures: %s",
+                        subscription.id,
+                        open_for,
+                        subscription.consecutive_failures,
+                        result.error,
+                    )
+            session.add(subscription)
+        session.commit()
+
+
+_client = None
+
+
+def get_client():
+    """Shared client; connections to each endpoint are pooled and reused."""
+    global _client
+    if _client is None:
+        import httpx
+
+        _client = httpx.AsyncClient(
+            timeout=REQUEST_TIMEOUT,
+            limits=httpx.Limits(
+                max_connections=CONCURRENCY * 2, max_keepalive_connections=CONCURRENCY
+            ),
+        )
+    return _client
+
+
+async def deliver_pending(client=None, max_rounds: int = 50) -> int:
+    """Deliver due events until the outbox is drained; returns events sent."""
+    client = client or get_client()
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+
+    async def run(work: EndpointWork) -> EndpointResult:
+        async with semaphore:
+            return await deliver_endpoint(client, work)
+
+    sent = 0
+    for _ in range(max_rounds):
+        work = await asyncio.to_thread(claim_due)
+        if not work:
+            break
+        results = await asyncio.gather(*(run(item) for item in work))
+        await asyncio.to_thread(record_results, results)
+        sent += sum(len(r.delivered) for r in results)
+        if sum(len(item.ids) for item in work) < CLAIM_LIMIT or all(
+            r.error for r in results
+        ):
+            break
+    return sent
+
+
+def purge_outbox(days: int = 7) -> int:
+    """Delete delivered and dead outbox rows older than ``days``."""
+    cutoff = datetime.utcnow() - timedelta(days=days)
+    with Session(engine) as session:
+        removed = session.exec(
+            delete(WebhookOutbox).where(
+                WebhookOutbox.status.in_(("delivered", "dead")),
+                WebhookOutbox.created_at < cutoff,
+            )
+        ).rowcount
+        session.commit()
+    return removed
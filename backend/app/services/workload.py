@@ -0,0 +1,153 @@
+"""Vectorized workload cost estimation over the price table snapshot.
+
+All prices are USD per 1M tokens. Costs are computed for every row of the
+snapshot at once, so ranking the full catalog is a handful of array
+operations regardless of how many prices it holds.
+"""
+
+from dataclasses import dataclass
+from typing import Optional
+import numpy as np
+from app.services.price_table import PriceTable
+
+TOKENS_PER_UNIT = 1_000_000
+
+
+@dataclass(frozen=True)
+class Workload:
+    input_tokens: float
+    output_tokens: float
+    cache_hit_ratio: float = 0.0
+    output_cache_hit_ratio: float = 0.0
+
+
+def row_costs(table: PriceTable, workload: Workload) -> dict[str, np.ndarray]:
+    """USD cost of the whole workload at every price row, split by component.
+
+    Cache-hit tokens fall back to the regular price where a row has no
+    cache-hit price.
+    """
+    hit_in = workload.cache_hit_ratio
+    hit_out = workload.output_cache_hit_ratio
+    cache_in = np.where(np.isnan(table.cache_input_usd), table.input_usd, table.cache_input_usd)
+    cache_out = np.where(
+        np.isnan(table.cache_output_usd), table.output_usd, table.cache_output_usd
+    )
+
+    input_cost = workload.input_tokens * (1 - hit_in) / TOKENS_PER_UNIT * table.input_usd
+    cached_cost = workload.input_tokens * hit_in / TOKENS_PER_UNIT * cache_in
+    output_cost = (
+        workload.output_tokens
+        * ((1 - hit_out) * table.output_usd + hit_out * cache_out)
+        / TOKENS_PER_UNIT
+    )
+    return {
+        "input": input_cost,
+        "cached_input": cached_cost,
+        "output": output_cost,
+        "total": input_cost + cached_cost + output_cost,
+    }
+
+
+def rank_penalty(
+    table: PriceTable, uptime_weight: float, score_weight: float
+) -> np.ndarray:
+    """Multiplier >= 1 applied to cost when ranking.
+
+    A weight of 1 doubles the cost of a provider with 0% uptime (or a 0 star
+    average); perfect providers are never penalized. Unrated providers count
+    as 0 stars.
+    """
+    uptime = np.clip(np.nan_to_num(table.uptime) / 100, 0, 1)
+    score = np.clip(np.nan_to_num(table.score) / 5, 0, 1)
+    return (1 + uptime_weight * (1 - uptime)) * (1 + score_weight * (1 - score))
+
+
+def top_k(keys: np.ndarray, candidates: np.ndarray, k: int) -> np.ndarray:
+    """Indices from ``candidates`` with the ``k`` smallest ``keys``, in order."""
+    if len(candidates) > k:
+        part = np.argpartition(keys[candidates], k - 1)[:k]
+        candidates = candidates[part]
+    return candidates[np.argsort(keys[candidates], kind="stable")]
+
+
+def rank_combinations(
+    table: PriceTable,
+    workload: Workload,
+    uptime_weight: float = 0.0,
+    score_weight: float = 0.0,
+    min_uptime: Optional[float] = None,
+    model_ids: Optional[list[int]] = None,
+    limit: int = 20,
+):
+    """Rank every (provider, model) price row by the workload's total cost.
+
+    Returns ``(indices, costs, rank_keys)``; indices point into ``table``.
+    """
+    costs = row_costs(table, workload)
+    keys = costs["total"] * rank_penalty(table, uptime_weight, score_weight)
+
+    mask = ~np.isnan(keys)
+    if min_uptime is not None:
+        mask &= table.uptime >= min_uptime
+    if model_ids:
+        mask &= np.isin(table.model_id, model_ids)
+    return top_k(keys, np.flatnonzero(mask), limit), costs, keys
+
+
+def rank_providers_for_mix(
+    table: PriceTable,
+    workload: Workload,
+    mix: dict[int, float],
+    uptime_weight: float = 0.0,
+    score_weight: float = 0.0,
+    min_uptime: Optional[float] = None,
+    limit: int = 20,
+):
+    """Rank providers that serve every model of a mix, by total mix cost.
+
+    ``mix`` maps model id to its share of the workload (shares are
+    normalized). Each provider is costed with its cheapest price for every
+    model. Returns a list of ``(provider_id, total_usd, rank_key, rows)``
+    where ``rows`` are table indices in mix order.
+    """
+    model_ids = np.array(sorted(mix), dtype=np.int64)
+    shares = np.array([mix[m] for m in model_ids], dtype=np.float64)
+    shares /= shares.sum()
+
+    costs = row_costs(table, workload)["total"]
+    mask = np.isin(table.model_id, model_ids) & ~np.isnan(costs)
+    if min_uptime is not None:
+        mask &= table.uptime >= min_uptime
+    rows = np.flatnonzero(mask)
+    if not len(rows):
+        return []
+
+    model_idx = np.searchsorted(model_ids, table.model_id[rows])
+    share_cost = costs[rows] * shares[model_idx]
+    providers, provider_idx = np.unique(table.provider_id[rows], return_inverse=True)
+
+    # Cheapest row per (provider, model): sort by cost, keep first of each pair
+    order = np.lexsort((share_cost, model_idx, provider_idx))
+    pair = provider_idx[order] * len(model_ids) + model_idx[order]
+    _, first = np.unique(pair, return_index=True)
+    best = order[first]
+
+    matrix = np.full((len(providers), len(model_ids)), np.nan)
+    matrix[provider_idx[best], model_idx[best]] = share_cost[best]
+    best_rows = np.full((len(providers), len(model_ids)), -1, dtype=np.int64)
+    best_rows[provider_idx[best], model_idx[best]] = rows[best]
+
+    complete = np.flatnonzero(~np.isnan(matrix).any(axis=1))
+    if not len(complete):
+        return []
+    totals = matrix.sum(axis=1)
+    # Penalty is per provider; take it from any of its rows
+    penalty = rank_penalty(table, uptime_weight, score_weight)[best_rows[:, 0]]
+    keys = np.full(len(providers), np.inf)
+    keys[complete] = totals[complete] * penalty[complete]
+
+    return [
+        (int(providers[p]), float(totals[p]), float(keys[p]), best_rows[p].tolist())
+        for p in top_k(keys, complete, limit)
+    ]
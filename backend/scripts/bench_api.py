@@ -0,0 +1,287 @@
+"""End-to-end benchmark for the API hot paths.
+
+Boots the FastAPI app in-process (no network, no uvicorn) against a freshly
+seeded database and drives each endpoint with a fixed number of concurrent
+clients. Results are written as JSON so two runs can be compared.
+
+Usage (from ``backend/``)::
+
+    python -m scripts.bench_api --concurrency 16 --requests 500 --output before.json
+    python -m scripts.bench_api --output after.json --baseline before.json --threshold 0.15
+    python -m scripts.bench_api --compare before.json after.json
+
+``DATABASE_URL`` is honoured; by default a temporary SQLite file is used.
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import random
+import sys
+import time
+from datetime import datetime
+
+from scripts.bench_seed import (
+    BENCH_PASSWORD,
+    seed_catalog,
+    use_temporary_database,
+)
+
+SCENARIOS = (
+    "compare",
+    "highlights",
+    "models",
+    "currencies",
+    "auth_token",
+    "submit_batch",
+    "admin_pending",
+)
+
+
+def _percentile(sorted_values: list[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values) - 1, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def _build_requests(ctx: dict, rng: random.Random):
+    """Return a factory per scenario producing ``(method, url, kwargs)``."""
+    model_ids = ctx["model_ids"]
+    provider_ids = ctx["provider_ids"]
+    user_headers = {"Authorization": f"Bearer {ctx['user_token']}"}
+    admin_headers = {"Authorization": f"Bearer {ctx['admin_token']}"}
+
+    def compare():
+        return "GET", f"/api/prices/compare/{rng.choice(model_ids)}", {}
+
+    def highlights():
+        return "GET", "/api/prices/highlights", {"params": {"limit": 8}}
+
+    def models():
+        return "GET", "/api/models", {}
+
+    def currencies():
+        return "GET", "/api/settings/currencies", {}
+
+    def auth_token():
+        return (
+            "POST",
+            "/api/auth/token",
+            {"data": {"username": ctx["user_email"], "password": BENCH_PASSWORD}},
+        )
+
+    def submit_batch():
+        body = {
+            "provider_id": rng.choice(provider_ids),
+            "prices": [
+                {
+                    "standard_model_id": rng.choice(model_ids),
+                    "price_in": round(rng.uniform(0.1, 10.0), 4),
+                    "price_out": round(rng.uniform(0.5, 40.0), 4),
+                    "currency": "USD",
+                }
+                for _ in range(5)
+            ],
+        }
+        return "POST", "/api/prices/submit-batch", {"json": body, "headers": user_headers}
+
+    def admin_pending():
+        return "GET", "/api/admin/pending", {"headers": admin_headers}
+
+    return {
+        "compare": compare,
+        "highlights": highlights,
+        "models": models,
+        "currencies": currencies,
+        "auth_token": auth_token,
+        "submit_batch": submit_batch,
+        "admin_pending": admin_pending,
+    }
+
+
+async def _run_scenario(client, factory, total: int, concurrency: int, warmup: int) -> dict:
+    for _ in range(warmup):
+        method, url, kwargs = factory()
+        await client.request(method, url, **kwargs)
+
+    latencies: list[float] = []
+    errors = 0
+    remaining = total
+
+    async def worker():
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            method, url, kwargs = factory()
+            started = time.perf_counter()
+            resp = await client.request(method, url, **kwargs)
+            latencies.append((time.perf_counter() - started) * 1000)
+            if resp.status_code >= 400:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "concurrency": concurrency,
+        "elapsed_s": round(elapsed, 4),
+        "throughput_rps": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        "mean_ms": round(sum(latencies) / len(latencies), 3) if latencies else 0.0,
+        "p50_ms": round(_percentile(latencies, 50), 3),
+        "p95_ms": round(_percentile(latencies, 95), 3),
+        "p99_ms": round(_percentile(latencies, 99), 3),
+        "max_ms": round(latencies[-1], 3) if latencies else 0.0,
+    }
+
+
+async def run_benchmark(args) -> dict:
+    database_url = use_temporary_database()
+
+    import httpx
+    from sqlmodel import Session
+
+    from app.auth import create_access_token
+    from app.database import engine, init_db
+    from app.main import app
+
+    init_db()
+    with Session(engine) as session:
+        ctx = seed_catalog(
+            session,
+            providers=args.providers,
+            models=args.models,
+            prices_per_model=args.prices_per_model,
+        )
+    ctx["user_token"] = create_access_token({"sub": ctx["user_email"], "role": "user"})
+    ctx["admin_token"] = create_access_token(
+        {"sub": ctx["admin_email"], "role": "super_admin"}
+    )
+
+    rng = random.Random(args.seed)
+    factories = _build_requests(ctx, rng)
+    selected = args.scenarios or list(SCENARIOS)
+
+    results = {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for name in selected:
+            # Password hashing is deliberately slow; keep that scenario short.
+            total = args.requests if name != "auth_token" else max(1, args.requests // 10)
+            results[name] = await _run_scenario(
+                client, factories[name], total, args.concurrency, args.warmup
+            )
+            r = results[name]
+            print(
+                f"{name:<14} {r['throughput_rps']:>10.1f} rps  "
+                f"p50 {r['p50_ms']:>8.2f}  p95 {r['p95_ms']:>8.2f}  "
+                f"p99 {r['p99_ms']:>8.2f} ms  errors {r['errors']}"
+            )
+
+    return {
+        "meta": {
+            "timestamp": datetime.utcnow().isoformat(),
+            "python": platform.python_version(),
+            "database": database_url.split(":", 1)[0],
+            "concurrency": args.concurrency,
+            "requests": args.requests,
+            "catalog": {
+                "providers": args.providers,
+                "models": args.models,
+                "prices_per_model": args.prices_per_model,
+            },
+        },
+        "results": results,
+    }
+
+
+def compare_results(baseline: dict, current: dict, threshold: float) -> list[str]:
+    """Return human readable regressions of ``current`` against ``baseline``."""
+    regressions = []
+    for name, cur in current["results"].items():
+        base = baseline["results"].get(name)
+        if not base:
+            continue
+        for key in ("p50_ms", "p95_ms", "p99_ms"):
+            if base[key] and cur[key] > base[key] * (1 + threshold):
+                regressions.append(
+                    f"{name}: {key} {base[key]:.2f} -> {cur[key]:.2f} "
+                    f"(+{(cur[key] / base[key] - 1) * 100:.1f}%)"
+                )
+        if base["throughput_rps"] and cur["throughput_rps"] < base["throughput_rps"] * (
+            1 - threshold
+        ):
+            regressions.append(
+                f"{name}: throughput {base['throughput_rps']:.1f} -> "
+                f"{cur['throughput_rps']:.1f} rps"
+            )
+    return regressions
+
+
+def _print_diff(baseline: dict, current: dict):
+    print(f"{'scenario':<14} {'rps':>21} {'p95 ms':>21}")
+    for name, cur in current["results"].items():
+        base = baseline["results"].get(name)
+        if not base:
+            continue
+        print(
+            f"{name:<14} {base['throughput_rps']:>9.1f} -> {cur['throughput_rps']:<9.1f} "
+            f"{base['p95_ms']:>9.2f} -> {cur['p95_ms']:<9.2f}"
+        )
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=300, help="requests per scenario")
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--providers", type=int, default=40)
+    parser.add_argument("--models", type=int, default=120)
+    parser.add_argument("--prices-per-model", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--scenarios", nargs="*", choices=SCENARIOS)
+    parser.add_argument("--output", help="write results JSON to this file")
+    parser.add_argument("--baseline", help="previous results JSON to check against")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.10,
+        help="allowed relative regression before failing (default 0.10)",
+    )
+    parser.add_argument(
+        "--compare",
+        nargs=2,
+        metavar=("BASELINE", "CURRENT"),
+        help="compare two saved result files without running",
+    )
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        with open(args.compare[0]) as f:
+            baseline = json.load(f)
+        with open(args.compare[1]) as f:
+            current = json.load(f)
+    else:
+        current = asyncio.run(run_benchmark(args))
+        if args.output:
+            with open(args.output, "w") as f:
+                json.dump(current, f, indent=2)
+        if not args.baseline:
+            return 0
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    _print_diff(baseline, current)
+    regressions = compare_results(baseline, current, args.threshold)
+    for line in regressions:
+        print(f"REGRESSION {line}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,124 @@
+"""Payload size and decode time of MessagePack vs JSON responses.
+
+Seeds a temporary catalog, fetches the public read endpoints through the
+ASGI app once as JSON and once with ``Accept: application/msgpack``, checks
+both decode to the same value, then reports body sizes (raw and gzipped)
+and the median client-side decode time of each encoding.
+
+Usage (from ``backend/``)::
+
+    python -m scripts.bench_msgpack --repeat 200
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+import zlib
+
+from scripts.bench_seed import seed_catalog, use_temporary_database
+
+
+def _endpoints(model_ids: list) -> list:
+    return [
+        ("compare", f"/api/prices/compare/{model_ids[0]}"),
+        ("compare_columnar", f"/api/prices/compare/{model_ids[0]}?format=columnar"),
+        ("compare_50", "/api/prices/compare?model_ids=" + ",".join(map(str, model_ids[:50]))),
+        ("compare_all", "/api/prices/compare?model_ids=all"),
+        ("models", "/api/models"),
+        ("providers", "/api/config/providers"),
+        ("rates", "/api/config/rates"),
+        ("highlights", "/api/prices/highlights"),
+    ]
+
+
+async def _fetch(app, endpoints: list) -> list:
+    import httpx
+
+    transport = httpx.ASGITransport(app=app)
+    bodies = []
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for name, url in endpoints:
+            as_json = await client.get(url, headers={"Accept": "application/json"})
+            as_msgpack = await client.get(url, headers={"Accept": "application/msgpack"})
+            as_json.raise_for_status()
+            as_msgpack.raise_for_status()
+            if as_msgpack.headers["content-type"] != "application/msgpack":
+                raise RuntimeError(f"{name}: msgpack was not negotiated")
+            bodies.append((name, as_json.content, as_msgpack.content))
+    return bodies
+
+
+def _median_us(decode, body: bytes, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter_ns()
+        decode(body)
+        timings.append(time.perf_counter_ns() - started)
+    return statistics.median(timings) / 1000
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--providers", type=int, default=40)
+    parser.add_argument("--models", type=int, default=120)
+    parser.add_argument("--prices-per-model", type=int, default=8)
+    parser.add_argument("--repeat", type=int, default=200, help="Decodes per body")
+    args = parser.parse_args(argv)
+
+    use_temporary_database()
+    import msgpack
+    from sqlmodel import Session
+
+    from app.database import engine, init_db
+
+    try:
+        import orjson
+    except ImportError:
+        orjson = None
+
+    init_db()
+    with Session(engine) as session:
+        ctx = seed_catalog(
+            session,
+            providers=args.providers,
+            models=args.models,
+            prices_per_model=args.prices_per_model,
+            pending=0,
+        )
+
+    from app.main import app
+
+    bodies = asyncio.run(_fetch(app, _endpoints(ctx["model_ids"])))
+
+    decoders = [("json", json.loads)]
+    if orjson is not None:
+        decoders.append(("orjson", orjson.loads))
+    header = f"{'endpoint':<17} {'json B':>9} {'msgpack B':>10} {'json gz':>8} {'mp gz':>8}"
+    for name, _ in decoders:
+        header += f" {name + ' us':>10}"
+    print(header + f" {'msgpack us':>11}")
+
+    mismatched = []
+    for name, json_body, msgpack_body in bodies:
+        if json.loads(json_body) != msgpack.unpackb(msgpack_body):
+            mismatched.append(name)
+        line = (
+            f"{name:<17} {len(json_body):>9} {len(msgpack_body):>10} "
+            f"{len(zlib.compress(json_body, 6)):>8} {len(zlib.compress(msgpack_body, 6)):>8}"
+        )
+        for _, decode in decoders:
+            line += f" {_median_us(decode, json_body, args.repeat):>10.1f}"
+        line += f" {_median_us(msgpack.unpackb, msgpack_body, args.repeat):>11.1f}"
+        print(line)
+
+    if mismatched:
+        print(f"FAIL encodings differ for: {', '.join(mismatched)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,132 @@
+"""Latency benchmark for the routing recommendation lookup.
+
+Seeds a temporary catalog, builds the price table and routing index, then
+times ``RoutingIndex.route`` in-process with random models and constraints.
+Also reports end-to-end latency of ``GET /api/route/{id}`` through the ASGI
+app for reference. Fails when the in-process p99 exceeds the budget.
+
+Usage (from ``backend/``)::
+
+    python -m scripts.bench_routing --lookups 100000 --budget-us 1000
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import time
+
+from scripts.bench_seed import seed_catalog, use_temporary_database
+
+
+def _percentile(sorted_values: list, pct: float) -> float:
+    index = max(0, min(len(sorted_values) - 1, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def _queries(model_ids: list, rng: random.Random, count: int) -> list:
+    queries = []
+    for _ in range(count):
+        queries.append(
+            (
+                rng.choice(model_ids),
+                rng.choice([None, rng.uniform(0.5, 20)]),
+                rng.choice([None, rng.uniform(1, 40)]),
+                rng.choice([None, 90.0, 99.0]),
+                rng.choice([None, "openai", "claude"]),
+            )
+        )
+    return queries
+
+
+async def _http_latencies(app, queries: list) -> list:
+    import httpx
+
+    transport = httpx.ASGITransport(app=app)
+    latencies = []
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for model_id, price_in, price_out, uptime, api in queries:
+            params = {
+                k: v
+                for k, v in (
+                    ("max_price_in", price_in),
+                    ("max_price_out", price_out),
+                    ("min_uptime", uptime),
+                    ("api", api),
+                )
+                if v is not None
+            }
+            started = time.perf_counter_ns()
+            response = await client.get(f"/api/route/{model_id}", params=params)
+            latencies.append(time.perf_counter_ns() - started)
+            response.raise_for_status()
+    return latencies
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--providers", type=int, default=40)
+    parser.add_argument("--models", type=int, default=120)
+    parser.add_argument("--prices-per-model", type=int, default=8)
+    parser.add_argument("--lookups", type=int, default=100_000)
+    parser.add_argument("--http-requests", type=int, default=500)
+    parser.add_argument("--budget-us", type=float, default=1000.0, help="p99 budget")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args(argv)
+
+    use_temporary_database()
+    from sqlmodel import Session
+
+    from app.database import engine, init_db
+    from app.services import price_table, routing
+
+    init_db()
+    with Session(engine) as session:
+        ctx = seed_catalog(
+            session,
+            providers=args.providers,
+            models=args.models,
+            prices_per_model=args.prices_per_model,
+            pending=0,
+        )
+
+    started = time.perf_counter()
+    price_table.refresh(force=True)
+    index = routing.get_index()
+    print(
+        f"index: {len(index.models)} models built in "
+        f"{(time.perf_counter() - started) * 1000:.1f} ms (with price table)"
+    )
+
+    rng = random.Random(args.seed)
+    queries = _queries(ctx["model_ids"], rng, args.lookups)
+    for query in queries[:1000]:
+        index.route(*query)
+
+    clock = time.perf_counter_ns
+    latencies = []
+    for query in queries:
+        started = clock()
+        index.route(*query)
+        latencies.append(clock() - started)
+    latencies.sort()
+    p50, p99 = _percentile(latencies, 50) / 1000, _percentile(latencies, 99) / 1000
+    print(f"lookup  p50 {p50:8.2f} us  p99 {p99:8.2f} us  max {latencies[-1] / 1000:8.2f} us")
+
+    if args.http_requests:
+        from app.main import app
+
+        http = sorted(asyncio.run(_http_latencies(app, queries[: args.http_requests])))
+        print(
+            f"http    p50 {_percentile(http, 50) / 1000:8.2f} us  "
+            f"p99 {_percentile(http, 99) / 1000:8.2f} us"
+        )
+
+    if p99 > args.budget_us:
+        print(f"FAIL lookup p99 {p99:.2f} us exceeds budget {args.budget_us:.0f} us")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,161 @@
+"""Deterministic catalog seeding shared by the benchmark scripts.
+
+The seed mirrors the shape of a production catalog: a handful of currencies,
+approved and official providers, standard models with several active prices
+each, and a queue of pending submissions for the admin views.
+"""
+
+import os
+import random
+import tempfile
+from datetime import datetime, timedelta
+
+BENCH_PASSWORD = "bench-password"
+BENCH_USER_EMAIL = "bench-user@example.com"
+BENCH_ADMIN_EMAIL = "bench-admin@example.com"
+
+RATES = {
+    "USD": 1.0,
+    "CNY": 7.2,
+    "EUR": 0.92,
+    "GBP": 0.79,
+    "JPY": 151.0,
+}
+
+
+def use_temporary_database() -> str:
+    """Point the app at a throwaway SQLite file unless DATABASE_URL is set.
+
+    Must be called before anything under ``app`` is imported, because the
+    engine is created at import time.
+    """
+    if "DATABASE_URL" not in os.environ:
+        path = os.path.join(tempfile.mkdtemp(prefix="llm-price-hub-bench-"), "bench.db")
+        os.environ["DATABASE_URL"] = f"sqlite:///{path}"
+    return os.environ["DATABASE_URL"]
+
+
+def seed_catalog(
+    session,
+    providers: int = 40,
+    models: int = 120,
+    prices_per_model: int = 8,
+    pending: int = 200,
+    seed: int = 42,
+) -> dict:
+    """Populate an empty database and return the ids the benchmarks need."""
+    from app.auth import get_password_hash
+    from app.models import (
+        CurrencyRate,
+        ModelPrice,
+        PriceStatus,
+        Provider,
+        ProviderStatus,
+        StandardModel,
+        User,
+    )
+    from app.services.pricing import refresh_usd_prices
+
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+
+    for code, rate in RATES.items():
+        session.add(CurrencyRate(code=code, rate_to_usd=rate))
+
+    password_hash = get_password_hash(BENCH_PASSWORD)
+    admin = User(
+        email=BENCH_ADMIN_EMAIL,
+        password_hash=password_hash,
+        role="super_admin",
+        email_verified=True,
+    )
+    user = User(
+        email=BENCH_USER_EMAIL,
+        password_hash=password_hash,
+        role="user",
+        email_verified=True,
+    )
+    session.add(admin)
+    session.add(user)
+    session.commit()
+    session.refresh(admin)
+    session.refresh(user)
+
+    provider_rows = []
+    for i in range(providers):
+        provider = Provider(
+            name=f"Provider {i:03d}",
+            website=f"https://provider-{i}.example.com",
+            is_official=i < 3,
+            status=ProviderStatus.approved,
+            openai_base_url=f"https://provider-{i}.example.com/v1",
+            uptime_rate=rng.uniform(90.0, 100.0),
+            avg_score=rng.uniform(3.0, 5.0),
+        )
+        session.add(provider)
+        provider_rows.append(provider)
+    session.commit()
+
+    vendors = ["openai", "anthropic", "google", "deepseek", "qwen", "meta"]
+    model_rows = []
+    for i in range(models):
+        model = StandardModel(
+            name=f"model-{i:04d}",
+            vendor=vendors[i % len(vendors)],
+            official_currency="USD",
+            official_input_price=round(rng.uniform(0.1, 15.0), 4),
+            official_output_price=round(rng.uniform(0.5, 60.0), 4),
+            is_featured=i < 8,
+            rank_hint=i if i < 8 else None,
+            popularity_score=rng.randint(0, 1000),
+        )
+        session.add(model)
+        model_rows.append(model)
+    session.commit()
+
+    provider_ids = [p.id for p in provider_rows]
+    model_ids = [m.id for m in model_rows]
+    currencies = list(RATES)
+
+    for model_id in model_ids:
+        for provider_id in rng.sample(provider_ids, min(prices_per_model, len(provider_ids))):
+            currency = rng.choice(currencies)
+            base_in = rng.uniform(0.1, 15.0) * RATES[currency]
+            session.add(
+                ModelPrice(
+                    provider_id=provider_id,
+                    standard_model_id=model_id,
+                    submitter_id=user.id,
+                    provider_model_name=f"m{model_id}-p{provider_id}",
+                    currency=currency,
+                    input_price=round(base_in, 6),
+                    output_price=round(base_in * rng.uniform(2.0, 5.0), 6),
+                    cache_hit_input_price=round(base_in * 0.1, 6),
+                    status=PriceStatus.active,
+                    verified_at=now - timedelta(hours=rng.randint(0, 72)),
+                )
+            )
+    for i in range(pending):
+        session.add(
+            ModelPrice(
+                provider_id=rng.choice(provider_ids),
+                standard_model_id=rng.choice(model_ids),
+                submitter_id=user.id,
+                currency="USD",
+                input_price=round(rng.uniform(0.1, 15.0), 6),
+                output_price=round(rng.uniform(0.5, 60.0), 6),
+                proof_type="text",
+                proof_content="seeded pending submission",
+                status=PriceStatus.pending,
+            )
+        )
+    session.flush()
+    refresh_usd_prices(session)
+    session.commit()
+
+    return {
+        "admin_email": admin.email,
+        "user_email": user.email,
+        "provider_ids": provider_ids,
+        "model_ids": model_ids,
+    }
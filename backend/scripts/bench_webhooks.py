@@ -0,0 +1,182 @@
+"""Throughput benchmark for webhook delivery against a local receiver.
+
+Starts an ASGI receiver on a free localhost port (uvicorn, in a thread) that
+verifies every signature, queues events into the outbox for a number of
+subscriptions and drains it with the real delivery code. ``--fail-rate``
+makes the receiver answer 503 to a share of requests to exercise retries.
+
+Usage (from ``backend/``)::
+
+    python -m scripts.bench_webhooks --endpoints 20 --events 50000
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import socket
+import sys
+import threading
+import time
+from collections import Counter
+
+from scripts.bench_seed import seed_catalog, use_temporary_database
+
+
+class Receiver:
+    """Minimal ASGI app recording delivered events per endpoint."""
+
+    def __init__(self, secrets_by_path: dict, fail_rate: float, seed: int):
+        self.secrets_by_path = secrets_by_path
+        self.fail_rate = fail_rate
+        self.rng = random.Random(seed)
+        self.events = Counter()
+        self.requests = 0
+        self.rejected = 0
+        self.bad_signatures = 0
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return
+        from app.services.webhooks import SIGNATURE_HEADER, TIMESTAMP_HEADER, sign
+
+        body = b""
+        while True:
+            message = await receive()
+            body += message.get("body", b"")
+            if not message.get("more_body"):
+                break
+        headers = {k.decode().lower(): v.decode() for k, v in scope["headers"]}
+        self.requests += 1
+
+        status = 200
+        secret = self.secrets_by_path.get(scope["path"])
+        expected = sign(secret or "", headers.get(TIMESTAMP_HEADER.lower(), ""), body)
+        if secret is None or headers.get(SIGNATURE_HEADER.lower()) != expected:
+            self.bad_signatures += 1
+            status = 401
+        elif self.rng.random() < self.fail_rate:
+            self.rejected += 1
+            status = 503
+        else:
+            for event in json.loads(body)["events"]:
+                self.events[event["delivery_id"]] += 1
+
+        await send({"type": "http.response.start", "status": status, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _start_receiver(app, port: int):
+    import uvicorn
+
+    server = uvicorn.Server(
+        uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning")
+    )
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+    return server, thread
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--endpoints", type=int, default=20)
+    parser.add_argument("--events", type=int, default=20000, help="events to queue in total")
+    parser.add_argument("--fail-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args(argv)
+
+    use_temporary_database()
+    from sqlalchemy import func
+    from sqlmodel import Session, select
+
+    from app.database import engine, init_db
+    from app.models import ModelPrice, PriceStatus, User, WebhookOutbox, WebhookSubscription
+    from app.services import webhooks
+
+    # Retries should not wait out production backoff during a benchmark
+    webhooks.BACKOFF_BASE_SECONDS = 0.01
+    webhooks.BACKOFF_MAX_SECONDS = 0.05
+
+    init_db()
+    port = _free_port()
+    secrets_by_path = {}
+    with Session(engine) as session:
+        seed_catalog(session, pending=0)
+        owner_id = session.exec(select(User.id)).first()
+        for i in range(args.endpoints):
+            path = f"/hook/{i}"
+            secrets_by_path[path] = f"bench-secret-{i:04d}-padding"
+            session.add(
+                WebhookSubscription(
+                    owner_id=owner_id,
+                    url=f"http://127.0.0.1:{port}{path}",
+                    secret=secrets_by_path[path],
+                )
+            )
+        session.commit()
+
+        prices = session.exec(
+            select(ModelPrice).where(ModelPrice.status == PriceStatus.active)
+        ).all()
+        prices = prices[: max(1, args.events // args.endpoints)]
+        rounds = max(1, args.events // (len(prices) * args.endpoints))
+        started = time.perf_counter()
+        for _ in range(rounds):
+            webhooks.enqueue_price_events(session, prices, "updated")
+        session.commit()
+        queued = session.exec(select(func.count(WebhookOutbox.id))).one()
+        print(f"queued {queued} events in {time.perf_counter() - started:.2f} s")
+
+    receiver = Receiver(secrets_by_path, args.fail_rate, args.seed)
+    server, thread = _start_receiver(receiver, port)
+
+    async def drain() -> float:
+        started = time.perf_counter()
+        with Session(engine) as session:
+            while True:
+                await webhooks.deliver_pending(max_rounds=1000)
+                pending = session.exec(
+                    select(func.count(WebhookOutbox.id)).where(
+                        WebhookOutbox.status == "pending"
+                    )
+                ).one()
+                session.commit()
+                if not pending:
+                    break
+                # Remaining rows are backing off or behind an open breaker
+                session.exec(
+                    WebhookSubscription.__table__.update().values(circuit_open_until=None)
+                )
+                session.commit()
+                await asyncio.sleep(0.05)
+        elapsed = time.perf_counter() - started
+        await webhooks.get_client().aclose()
+        return elapsed
+
+    elapsed = asyncio.run(drain())
+    server.should_exit = True
+    thread.join(timeout=5)
+
+    delivered = sum(1 for n in receiver.events.values() if n)
+    duplicates = sum(n - 1 for n in receiver.events.values() if n > 1)
+    print(
+        f"delivered {delivered} events in {elapsed:.2f} s "
+        f"({delivered / elapsed:,.0f} events/s, {receiver.requests} requests)"
+    )
+    print(
+        f"rejected {receiver.rejected}  bad signatures {receiver.bad_signatures}  "
+        f"duplicates {duplicates}"
+    )
+    return 0 if delivered == queued and not receiver.bad_signatures else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,130 @@
+"""Startup profile and import-time budget for the backend package.
+
+Runs ``python -X importtime -c "import app.main"`` in a fresh interpreter,
+prints the slowest modules and the cost grouped by top-level package, then
+times a few clean imports. With ``--check`` it exits non-zero when the median
+import time exceeds the budget or when a module that should be loaded lazily
+was pulled in by ``import app.main``.
+
+Usage (from ``backend/``)::
+
+    python -m scripts.profile_startup
+    python -m scripts.profile_startup --check --budget-ms 1200
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Heavy dependencies that must only be imported by the code paths using them.
+LAZY_MODULES = (
+    "jose",
+    "passlib",
+    "pyotp",
+    "httpx",
+    "smtplib",
+    "apscheduler",
+    "app.services.scheduler",
+    "app.services.currency_flags",
+    "numpy",
+    "app.services.price_table",
+)
+
+DEFAULT_BUDGET_MS = float(os.getenv("STARTUP_IMPORT_BUDGET_MS", "1500"))
+
+_TIMED_IMPORT = (
+    "import sys, time\n"
+    "t = time.perf_counter()\n"
+    "import app.main\n"
+    "print((time.perf_counter() - t) * 1000)\n"
+    "print(','.join(m for m in {lazy!r} if m in sys.modules))\n"
+)
+
+
+def _run(args: list[str]) -> subprocess.CompletedProcess:
+    env = dict(os.environ)
+    env.setdefault("DATABASE_URL", "sqlite://")
+    return subprocess.run(
+        [sys.executable, *args],
+        cwd=BACKEND_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def import_profile() -> list[tuple[str, int, int]]:
+    """Return ``(module, self_us, cumulative_us)`` rows from -X importtime."""
+    proc = _run(["-X", "importtime", "-c", "import app.main"])
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((name.strip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def timed_imports(runs: int) -> tuple[list[float], list[str]]:
+    timings = []
+    loaded: set[str] = set()
+    for _ in range(runs):
+        proc = _run(["-c", _TIMED_IMPORT.format(lazy=LAZY_MODULES)])
+        lines = proc.stdout.strip().splitlines()
+        timings.append(float(lines[0]))
+        if len(lines) > 1 and lines[1]:
+            loaded.update(lines[1].split(","))
+    return timings, sorted(loaded)
+
+
+def print_profile(rows, top: int):
+    print(f"Slowest {top} modules by cumulative time:")
+    for name, self_us, cumulative_us in sorted(rows, key=lambda r: -r[2])[:top]:
+        print(f"  {cumulative_us / 1000:>9.1f} ms  (self {self_us / 1000:>7.1f})  {name}")
+
+    by_package = defaultdict(int)
+    for name, self_us, _ in rows:
+        by_package[name.split(".")[0]] += self_us
+    print(f"\nSelf time grouped by top-level package (top {top}):")
+    for package, self_us in sorted(by_package.items(), key=lambda kv: -kv[1])[:top]:
+        print(f"  {self_us / 1000:>9.1f} ms  {package}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--top", type=int, default=25)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="fail if the budget is exceeded or a lazy module is imported eagerly",
+    )
+    args = parser.parse_args(argv)
+
+    if not args.check:
+        print_profile(import_profile(), args.top)
+        print()
+
+    timings, eager = timed_imports(args.runs)
+    median = statistics.median(timings)
+    print(
+        f"import app.main: median {median:.1f} ms over {len(timings)} runs "
+        f"(min {min(timings):.1f}, max {max(timings):.1f}, budget {args.budget_ms:.0f})"
+    )
+    if eager:
+        print(f"Eagerly imported modules that should be lazy: {', '.join(eager)}")
+
+    if args.check and (median > args.budget_ms or eager):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
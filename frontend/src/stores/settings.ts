@@ -2,6 +2,7 @@ import { defineStore } from 'pinia'
 import { ref, computed } from 'vue'
 import api from '@/api'
 import logger from '@/utils/logger'
+import { fromSnapshot } from '@/utils/snapshots'
 import { useAuthStore } from './auth'
 
 export const useSettingsStore = defineStore('settings', () => {
@@ -16,8 +17,10 @@ export const useSettingsStore = defineStore('settings', () => {
 
     async function fetchCurrencies() {
         try {
-            const res = await api.get('/settings/currencies')
-            currencies.value = res.data
+            currencies.value = await fromSnapshot(
+                'currencies',
+                async () => (await api.get('/settings/currencies')).data
+            )
         } catch (e) {
             logger.error('Failed to fetch currencies', e)
         }
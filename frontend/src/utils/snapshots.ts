@@ -0,0 +1,46 @@
+import axios from 'axios'
+import logger from '@/utils/logger'
+
+// Pre-rendered copies of public API responses, written by the backend
+// (app/services/snapshots.py) and served as static files by nginx.
+const SNAPSHOT_BASE = 'static/snapshots/'
+// Re-read the manifest after this long so open tabs pick up new snapshots
+const MANIFEST_TTL_MS = 60_000
+
+interface SnapshotManifest {
+  catalog_version: number
+  generated_at: string
+  files: Record<string, string>
+}
+
+let manifestPromise: Promise<SnapshotManifest | null> | null = null
+let manifestLoadedAt = 0
+
+function loadManifest(): Promise<SnapshotManifest | null> {
+  if (!manifestPromise || Date.now() - manifestLoadedAt > MANIFEST_TTL_MS) {
+    manifestLoadedAt = Date.now()
+    manifestPromise = axios
+      .get<SnapshotManifest>(`${SNAPSHOT_BASE}manifest.json`, { timeout: 5000 })
+      .then((res) => (res.data && res.data.files ? res.data : null))
+      .catch(() => null)
+  }
+  return manifestPromise
+}
+
+/**
+ * Load the snapshot `name`; calls `fallback` (the live API) when there is no
+ * snapshot for it or it cannot be fetched.
+ */
+export async function fromSnapshot<T>(name: string, fallback: () => Promise<T>): Promise<T> {
+  const manifest = await loadManifest()
+  const file = manifest?.files[name]
+  if (file) {
+    try {
+      const res = await axios.get<T>(SNAPSHOT_BASE + file, { timeout: 5000 })
+      return res.data
+    } catch (e) {
+      logger.warn(`Snapshot ${name} unavailable, using the API`, e)
+    }
+  }
+  return fallback()
+}